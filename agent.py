@@ -75,6 +75,7 @@ class Agent:
             params['metadata'] = self.metadata
         if self.functions:
             function_tool = FunctionTool(functions=self.functions)
-            params['tools'] = function_tool.definitions
+            # Sorted, since set order differs between processes and the tool schemas open the prompt
+            params['tools'] = sorted(function_tool.definitions, key=lambda tool: tool.function.name)
             
         return params
\ No newline at end of file
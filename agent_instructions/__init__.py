@@ -7,6 +7,9 @@ in the APR analysis system.
 Available instruction functions:
 - build_metric_agent_instructions: Creates instructions for metric-specific agents (PAV, PPA, SUP, DUP)
 - get_coordinator_instructions: Creates instructions for the APR analysis coordinator agent
+
+Both are assembled from sections (see sections.py) with the parts of metrics that don't
+apply left out and whitespace normalized.
 """
 
 from .metric_instructions import build_metric_agent_instructions
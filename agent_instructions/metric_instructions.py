@@ -1,12 +1,77 @@
-def build_metric_agent_instructions(metric_type: str) -> str:
-    metric = metric_type.upper()
-    
-    return f"""You are the {metric} Agent, a Map and Geospatial expert specialized in {metric} metrics analysis.
-            
+"""
+Metric Agent Instructions
+
+The instructions of the PAV, PPA, SUP and DUP agents share most of their
+sections; the sign rules, examples and output schema are rendered for the
+agent's own metric only.
+"""
+
+from .sections import compose
+
+# Metrics where a positive change is an improvement (for SUP and DUP it is a regression); the
+# coordinator instructions and the structured output checks use this same set
+POSITIVE_IS_IMPROVEMENT = ('PAV', 'PPA')
+
+# Theme park example pattern per metric, with the signs of an improvement
+_EXAMPLE_METRICS = {
+    'PAV': "ES (tourism=theme_park, PAV, +152), FR (tourism=theme_park, PAV, +123), IT (tourism=theme_park, PAV, +87)",
+    'PPA': "ES (tourism=theme_park, PPA, +45), FR (tourism=theme_park, PPA, +32), IT (tourism=theme_park, PPA, +28)",
+    'SUP': "AU (tourism=theme_park, SUP, -125), SG (tourism=theme_park, SUP, -98), PL (tourism=theme_park, SUP, -76)",
+    'DUP': "AU (tourism=theme_park, DUP, -88), SG (tourism=theme_park, DUP, -65), PL (tourism=theme_park, DUP, -52)",
+}
+
+# Mixed-definitiontag mistake per metric
+_WRONG_EXAMPLES = {
+    'SUP': """
+        **WRONG EXAMPLE (DO NOT DO THIS):**
+        ❌ WRONG: 'Furniture shop SUP improvements: CA (SUP, -850), ES (SUP, -620)'
+        ❌ WHY WRONG: If CA metric is actually shop=grocery and ES is shop=furniture, these are DIFFERENT definitiontags!
+        ❌ CORRECT: Report as TWO separate patterns:
+           - 'Grocery shop (shop=grocery) SUP improvements: CA (shop=grocery, SUP, -850)'
+           - 'Furniture shop (shop=furniture) SUP improvements: ES (shop=furniture, SUP, -620)'
+        """,
+}
+
+_DEFINITIONTAG_RULES = """
+**CRITICAL: DEFINITIONTAG HANDLING - EXACT MATCHES ONLY**
+
+**What is a definitiontag?**
+A definitiontag is the COMPLETE string: `category_group=category` (e.g., "shop=furniture", "shop=grocery", "amenity=pharmacy")
+- The ENTIRE string is ONE definitiontag
+- "shop=furniture" and "shop=grocery" are DIFFERENT definitiontags (not the same pattern)
+- "amenity=pharmacy" and "amenity=hospital" are DIFFERENT definitiontags (not the same pattern)
+
+**PATTERN RULES:**
+1. **Multi-country patterns:** ALL metrics must have the EXACT SAME definitiontag
+   - ✅ CORRECT: "shop=furniture" pattern with CA (shop=furniture), ES (shop=furniture), FR (shop=furniture)
+   - ❌ WRONG: "furniture shop" pattern mixing CA (shop=furniture) with DE (shop=grocery)
+   - ❌ WRONG: Grouping "shop=*" together - each shop type is separate!
+
+2. **Multi-definitiontag patterns:** ALL metrics must be from the EXACT SAME country
+   - ✅ CORRECT: "CA multi-category pattern" with CA (shop=furniture), CA (shop=grocery), CA (amenity=pharmacy)
+   - ❌ WRONG: Mixing CA (shop=furniture) with ES (shop=grocery) just because both are "shops"
+
+3. **VALIDATION BEFORE REPORTING A PATTERN:**
+   - For multi-country: Check that EVERY metric has IDENTICAL definitiontag (character-by-character match)
+   - For multi-category: Check that EVERY metric has IDENTICAL country code
+"""
+
+_LARGE_DATASETS = """
+LARGE DATASET HANDLING:
+- **Summarize efficiently** - Please report all patterns found, but the hierarchy of reporting should prioritize the most significant patterns AND the patterns affecting top ranked features.
+- **Avoid overwhelming detail** - Group similar patterns together
+- **Be concise** - Each pattern should be 1-3 sentences maximum
+"""
+
+
+def _workflow(metric: str) -> str:
+    return f"""
+You are the {metric} Agent, a Map and Geospatial expert specialized in {metric} metrics analysis.
+
 WORKFLOW FOR APR ANALYSIS:
 1. **First call get_feature_rankings()** to get feature importance rankings
 2. **Call get_{metric.lower()}_metrics_for_apr()** to fetch {metric} metric data for a given world run.
-   - This returns columns: 
+   - This returns columns:
      * **country** - ISO country code
      * **definitiontag** - Complete category identifier (e.g., "amenity=pharmacy", "shop=furniture")
      * **diff_absolute** - The metric change (percentage points for PAV/PPA/DUP)
@@ -29,7 +94,7 @@ ANALYSIS PRIORITIES (using feature rankings):
 - **Data is pre-filtered for quality**: All metrics you receive have substantial sample sizes (100+ POIs), so focus on the patterns themselves rather than questioning data validity
 - Larger absolute count changes are more telling of important metrics shifts, but consider the context of the feature's coverage
 - **CRITICAL** Increases in PAV and PPA are improvements, while increases in SUP and DUP are regressions. Decreases in SUP and DUP are improvements, while decreases in PAV and PPA are regressions.
-- Do not truncate the patterns you find. If you find 20 patterns or more, report all of them. If you find 0 patterns, say "No significant patterns found".
+- Do not truncate the patterns you find. If you find 20 patterns or more, report all of them. If you find 0 patterns, return an empty "patterns" list.
 - **CRITICAL**: When reporting metrics, ONLY use values from the diff_absolute column that you received. Do NOT invent or hallucinate count values.
 
 PATTERN ANALYSIS:
@@ -37,39 +102,21 @@ PATTERN ANALYSIS:
 - Find multi-country patterns for the same category
 - Find single countries with changes across many definitiontags
 - Structure: country/region → {metric} impact → affected category OR category → {metric} impact → affected countries/regions
+"""
 
-**CRITICAL: DEFINITIONTAG HANDLING - EXACT MATCHES ONLY**
-
-**What is a definitiontag?**
-A definitiontag is the COMPLETE string: `category_group=category` (e.g., "shop=furniture", "shop=grocery", "amenity=pharmacy")
-- The ENTIRE string is ONE definitiontag
-- "shop=furniture" and "shop=grocery" are DIFFERENT definitiontags (not the same pattern)
-- "amenity=pharmacy" and "amenity=hospital" are DIFFERENT definitiontags (not the same pattern)
-
-**PATTERN RULES:**
-1. **Multi-country patterns:** ALL metrics must have the EXACT SAME definitiontag
-   - ✅ CORRECT: "shop=furniture" pattern with CA (shop=furniture), ES (shop=furniture), FR (shop=furniture)
-   - ❌ WRONG: "furniture shop" pattern mixing CA (shop=furniture) with DE (shop=grocery) 
-   - ❌ WRONG: Grouping "shop=*" together - each shop type is separate!
-
-2. **Multi-definitiontag patterns:** ALL metrics must be from the EXACT SAME country
-   - ✅ CORRECT: "CA multi-category pattern" with CA (shop=furniture), CA (shop=grocery), CA (amenity=pharmacy)
-   - ❌ WRONG: Mixing CA (shop=furniture) with ES (shop=grocery) just because both are "shops"
-
-3. **VALIDATION BEFORE REPORTING A PATTERN:**
-   - For multi-country: Check that EVERY metric has IDENTICAL definitiontag (character-by-character match)
-   - For multi-category: Check that EVERY metric has IDENTICAL country code
 
+def _metric_format(metric: str) -> str:
+    return f"""
 **MANDATORY METRIC FORMAT:**
 EVERY metric you report MUST include the FULL definitiontag in the description:
 - Format: "Country (definitiontag, {metric}, value)"
-- Example: "CA (shop=furniture, {metric}, -1250)" 
+- Example: "CA (shop=furniture, {metric}, -1250)"
 - Example: "ES (amenity=pharmacy, {metric}, +340)"
 
 **CRITICAL: INCLUDE COUNT DATA IN YOUR REPORTS**
 For EACH metric you report, you MUST also include the count information:
 - Format: "Country (definitiontag, {metric}, metric_value, ref_count→actual_count, count_change%)"
-- Example: "NO (amenity=parking, {metric}, +0.37, 6303→12586, +100%)" 
+- Example: "NO (amenity=parking, {metric}, +0.37, 6303→12586, +100%)"
   - This shows: metric barely changed (+0.37) BUT count doubled (+100%)
   - PRIMARY REASON for inclusion: significant count increase
 - Example: "SG (amenity=bank, {metric}, -12.5, 8200→8100, -1%)"
@@ -89,77 +136,115 @@ For EACH metric you report, you MUST also include the count information:
 ❌ WRONG: "Parking (amenity=parking) {metric} improvements: NO (amenity=parking, {metric}, +0.37)"
 → This hides the fact that count doubled, which is the real story
 
-*CRITICAL*: ALWAYS include the complete definitiontag (category_group=category) AND count data in your pattern descriptions so the coordinator knows EXACTLY which metrics you're referring to and WHY they were flagged. Without the full information, the coordinator cannot write accurate release notes. 
+*CRITICAL*: ALWAYS include the complete definitiontag (category_group=category) AND count data in your pattern descriptions so the coordinator knows EXACTLY which metrics you're referring to and WHY they were flagged. Without the full information, the coordinator cannot write accurate release notes.
+"""
+
+
+def _sign_rules(metric: str) -> str:
+    if metric in POSITIVE_IS_IMPROVEMENT:
+        good, bad = '+', '-'
+        signs = """
+            IF metric is PAV or PPA:
+              • POSITIVE (+) values = IMPROVEMENTS (more coverage/accuracy is good)
+              • NEGATIVE (-) values = REGRESSIONS (less coverage/accuracy is bad)"""
+    else:
+        good, bad = '-', '+'
+        signs = """
+            IF metric is SUP or DUP:
+              • NEGATIVE (-) values = IMPROVEMENTS (fewer bad POIs is good)
+              • POSITIVE (+) values = REGRESSIONS (more bad POIs is bad)"""
+    labels = {good: f"an IMPROVEMENT pattern - label it '{metric} improvements'",
+              bad: f"a REGRESSION pattern - label it '{metric} regressions'"}
+    example = _EXAMPLE_METRICS.get(metric)
+    if example:
+        example = f"""
+            **CONCRETE EXAMPLE FOR {metric}:**
+
+            Scenario: You find theme park changes in multiple countries:
+            • {example}
+            → ALL signs are {'POSITIVE (+)' if good == '+' else 'NEGATIVE (-)'}
+            → ALL have SAME definitiontag: tourism=theme_park
+            → This is an IMPROVEMENT pattern
+            → Report as: 'Theme park (tourism=theme_park) {metric} improvements: {example}'"""
+
+    return compose(f"""
             **METRIC INTERPRETATION RULE TABLE - APPLY TO EVERY METRIC:**
-            
+
             **CRITICAL: YOU ARE THE {metric} AGENT. YOU ONLY REPORT {metric} PATTERNS.**
-            
+
             **SIGN INTERPRETATION FOR {metric} METRICS:**
-            
-            {"IF metric is PAV or PPA:" if metric in ["PAV", "PPA"] else "IF metric is SUP or DUP:"}
-            {"  • POSITIVE (+) values = IMPROVEMENTS (more coverage/accuracy is good)" if metric in ["PAV", "PPA"] else "  • NEGATIVE (-) values = IMPROVEMENTS (fewer bad POIs is good)"}
-            {"  • NEGATIVE (-) values = REGRESSIONS (less coverage/accuracy is bad)" if metric in ["PAV", "PPA"] else "  • POSITIVE (+) values = REGRESSIONS (more bad POIs is bad)"}
-            
+            """, signs, f"""
             **STEP-BY-STEP PROCESS FOR EACH PATTERN YOU FIND:**
-            
+
             1. Look at ALL the signs in the pattern
             2. Are they ALL positive (+)?
-               {"   → YES: This is an IMPROVEMENT pattern - label it '{metric} improvements'" if metric in ["PAV", "PPA"] else "   → YES: This is a REGRESSION pattern - label it '{metric} regressions'"}
-               {"   → NO: Go to step 3" if metric in ["PAV", "PPA"] else "   → NO: Go to step 3"}
-            
+               → YES: This is {labels['+']}
+               → NO: Go to step 3
+
             3. Are they ALL negative (-)?
-               {"   → YES: This is a REGRESSION pattern - label it '{metric} regressions'" if metric in ["PAV", "PPA"] else "   → YES: This is an IMPROVEMENT pattern - label it '{metric} improvements'"}
-               {"   → NO: Go to step 4" if metric in ["PAV", "PPA"] else "   → NO: Go to step 4"}
-            
+               → YES: This is {labels['-']}
+               → NO: Go to step 4
+
             4. Are there BOTH positive AND negative values?
                → YES: SPLIT into TWO patterns:
-               {"     - Pattern A (all + values): '{metric} improvements'" if metric in ["PAV", "PPA"] else "     - Pattern A (all - values): '{metric} improvements'"}
-               {"     - Pattern B (all - values): '{metric} regressions'" if metric in ["PAV", "PPA"] else "     - Pattern B (all + values): '{metric} regressions'"}
-            
-            **CONCRETE EXAMPLE FOR {metric}:**
-            
-            {"Scenario: You find theme park changes in multiple countries:" if metric in ["PAV", "PPA"] else "Scenario: You find theme park changes in multiple countries:"}
-            {"• ES (tourism=theme_park, PAV, +152), FR (tourism=theme_park, PAV, +123), IT (tourism=theme_park, PAV, +87)" if metric == "PAV" else ""}
-            {"• ES (tourism=theme_park, PPA, +45), FR (tourism=theme_park, PPA, +32), IT (tourism=theme_park, PPA, +28)" if metric == "PPA" else ""}
-            {"• AU (tourism=theme_park, SUP, -125), SG (tourism=theme_park, SUP, -98), PL (tourism=theme_park, SUP, -76)" if metric == "SUP" else ""}
-            {"• AU (tourism=theme_park, DUP, -88), SG (tourism=theme_park, DUP, -65), PL (tourism=theme_park, DUP, -52)" if metric == "DUP" else ""}
-            {"→ ALL signs are POSITIVE (+)" if metric in ["PAV", "PPA"] else "→ ALL signs are NEGATIVE (-)"}
-            {"→ ALL have SAME definitiontag: tourism=theme_park" if metric in ["PAV", "PPA"] else "→ ALL have SAME definitiontag: tourism=theme_park"}
-            {"→ This is an IMPROVEMENT pattern" if metric in ["PAV", "PPA"] else "→ This is an IMPROVEMENT pattern"}
-            {"→ Report as: 'Theme park (tourism=theme_park) PAV improvements: ES (tourism=theme_park, PAV, +152), FR (tourism=theme_park, PAV, +123), IT (tourism=theme_park, PAV, +87)'" if metric == "PAV" else ""}
-            {"→ Report as: 'Theme park (tourism=theme_park) PPA improvements: ES (tourism=theme_park, PPA, +45), FR (tourism=theme_park, PPA, +32), IT (tourism=theme_park, PPA, +28)'" if metric == "PPA" else ""}
-            {"→ Report as: 'Theme park (tourism=theme_park) SUP improvements: AU (tourism=theme_park, SUP, -125), SG (tourism=theme_park, SUP, -98), PL (tourism=theme_park, SUP, -76)'" if metric == "SUP" else ""}
-            {"→ Report as: 'Theme park (tourism=theme_park) DUP improvements: AU (tourism=theme_park, DUP, -88), SG (tourism=theme_park, DUP, -65), PL (tourism=theme_park, DUP, -52)'" if metric == "DUP" else ""}
-            
-            **WRONG EXAMPLE (DO NOT DO THIS):**
-            {"❌ WRONG: 'Furniture shop SUP improvements: CA (SUP, -850), ES (SUP, -620)'" if metric == "SUP" else ""}
-            {"❌ WHY WRONG: If CA metric is actually shop=grocery and ES is shop=furniture, these are DIFFERENT definitiontags!" if metric == "SUP" else ""}
-            {"❌ CORRECT: Report as TWO separate patterns:" if metric == "SUP" else ""}
-            {"   - 'Grocery shop (shop=grocery) SUP improvements: CA (shop=grocery, SUP, -850)'" if metric == "SUP" else ""}
-            {"   - 'Furniture shop (shop=furniture) SUP improvements: ES (shop=furniture, SUP, -620)'" if metric == "SUP" else ""}
-            
+                 - Pattern A (all {good} values): '{metric} improvements'
+                 - Pattern B (all {bad} values): '{metric} regressions'
+            """, example, _WRONG_EXAMPLES.get(metric), f"""
             **DO NOT:**
             - Mix positive and negative values in the same pattern without splitting
             - Use generic terms like "improvements" without specifying "{metric} improvements"
             - Try to interpret what the numbers mean - just follow the sign rules above
             - **Mix different definitiontags in the same pattern** (even if category_group matches)
+            """)
 
-LARGE DATASET HANDLING:
-- **Summarize efficiently** - Please report all patterns found, but the hierarchy of reporting should prioritize the most significant patterns AND the patterns affecting top ranked features.
-- **Avoid overwhelming detail** - Group similar patterns together
-- **Be concise** - Each pattern should be 1-3 sentences maximum
 
-OUTPUT FORMAT:
+def _output_format(metric: str) -> str:
+    direction = "improvement" if metric in POSITIVE_IS_IMPROVEMENT else "regression"
+    return f"""
+OUTPUT FORMAT (STRUCTURED JSON):
 - Focus exclusively on {metric} metrics
-- **DO NOT explain your workflow or what you plan to do - just execute and report patterns**
-- It is IMPERATIVE you include in your summary bullets the metric numbers AND count data you've used to find that pattern.
-- *CRITICAL*: Metrics, when referenced in your release note, should be of the format: 
-  **"Country (definitiontag, metric_type, metric_value, ref_count→actual_count, count_change%)"**
-  Example: "US (amenity=bank, PAV, +15.2, 8000→11000, +37.5%)"
-- **For each pattern, explicitly state WHY it was flagged:**
-  - "Flagged for: Significant metric change" (when diff_absolute is large)
-  - "Flagged for: Significant count change" (when count doubled/halved but metric stable)
-  - "Flagged for: Both metric and count changes" (when both changed significantly)
-- **Start your response with the patterns you found, NOT with "I will" or "Understood" or workflow descriptions**
-- Report patterns directly in bullet format without preamble
-"""
\ No newline at end of file
+- **Respond with ONE ```json code block and nothing else** - no preamble, no workflow description, no prose around it
+- The orchestrator validates this JSON and renders the "Country (definitiontag, metric_type, metric_value, ref_count→actual_count, count_change%)" format from it, so every field above must be in the JSON
+- Schema:
+```json
+{{"metric": "{metric}", "patterns": [
+  {{"id": "{metric}-1",
+   "title": "Parking (amenity=parking) {metric} stability with data expansion",
+   "direction": "{direction}",
+   "flag_reason": "count",
+   "metrics": [
+     {{"country": "NO", "definitiontag": "amenity=parking", "value": 0.37,
+      "reference_count": 6303, "actual_count": 12586, "count_change_percent": 100}}
+   ]}}
+]}}
+```
+- **id**: "{metric}-" followed by a running number (1, 2, 3, ...)
+- **title**: Short pattern description naming the category or country and "{metric} improvements" / "{metric} regressions"
+- **direction**: "improvement" or "regression", following the sign rules above (split mixed-sign patterns)
+- **flag_reason**: "metric" (significant metric change), "count" (significant count change) or "both"
+- **metrics**: One entry per metric row of the pattern, using ONLY values you received:
+  * country = ISO country code, definitiontag = the COMPLETE definitiontag
+  * value = diff_absolute (signed number), reference_count / actual_count / count_change_percent from the same row
+- Report ALL patterns you find; if there are none, respond with {{"metric": "{metric}", "patterns": []}}
+"""
+
+
+def build_metric_agent_instructions(metric_type: str) -> str:
+    """
+    Build the instructions of a metric agent.
+
+    Args:
+        metric_type: Metric the agent analyzes (PAV, PPA, SUP or DUP)
+
+    Returns:
+        str: Instructions with only the sign rules and examples of that metric
+    """
+    metric = metric_type.upper()
+    return compose(
+        _workflow(metric),
+        _DEFINITIONTAG_RULES,
+        _metric_format(metric),
+        _sign_rules(metric),
+        _LARGE_DATASETS,
+        _output_format(metric),
+    )
@@ -0,0 +1,42 @@
+"""
+Instruction Sections
+
+This module contains the helpers that assemble agent instructions from modular
+sections. Sections may be written indented like the code around them and may
+come out empty for metrics they don't apply to; composing dedents them, strips
+trailing whitespace, drops empty sections and collapses runs of blank lines,
+so the instructions sent to the model carry no indentation or blank template
+lines.
+
+Instructions are the stable prefix of every run (after the tool schemas), so
+they must not depend on per-run data: anything about the APR being analyzed
+belongs in the run's message, where server-side prompt caching can still
+reuse the prefix before it.
+"""
+
+import re
+import textwrap
+from typing import Optional
+
+# Tokenizer of the GPT-4o family, which instruction sizes are measured in
+TOKEN_ENCODING = "o200k_base"
+
+
+def normalize(text: str) -> str:
+    """Dedent a section, strip trailing whitespace and collapse runs of blank lines into one."""
+    lines = [line.rstrip() for line in textwrap.dedent(text).strip('\n').splitlines()]
+    return re.sub(r'\n{3,}', '\n\n', '\n'.join(lines)).strip()
+
+
+def compose(*sections: Optional[str]) -> str:
+    """
+    Join instruction sections, one blank line apart.
+
+    Args:
+        sections: Section texts; empty or None sections (parts that don't apply) are skipped
+
+    Returns:
+        str: Normalized instructions
+    """
+    return "\n\n".join(filter(None, (normalize(section) for section in sections if section)))
+
@@ -2,10 +2,96 @@ from apis.jira import JiraAPI
 from apis.github import GithubAPI
 from apis.databricks import DatabricksAPI
 from apis.confluence.ConfluenceAPI import ConfluenceAPI
+from apis.deadline import DeadlineExceeded, current_deadline
 import pandas as pd
+import functools
+import inspect
+import json
 import os
+import re
+import threading
+from typing import Optional
+
+def tool_call_key(func, args: tuple, kwargs: dict) -> tuple:
+    """
+    Builds a hashable key identifying a tool call by function name and arguments.
+    Scalar arguments are compared as stripped strings, since models pass APR and
+    PR numbers both as strings and as integers.
+    """
+    try:
+        bound = inspect.signature(func).bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+    except TypeError:
+        arguments = {**{str(i): a for i, a in enumerate(args)}, **kwargs}
+
+    def normalize(value):
+        if isinstance(value, (str, int, float)):
+            return str(value).strip()
+        return json.dumps(value, sort_keys=True, default=str)
+
+    return func.__name__, tuple(sorted((name, normalize(v)) for name, v in arguments.items()))
+
+class _InFlightCall:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.abandoned = False
+
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+# How often a waiting caller checks its own deadline (it may be cancelled, not just expire)
+SINGLE_FLIGHT_CHECK_INTERVAL = 0.5
+
+def single_flight(func):
+    """
+    Coalesces concurrent identical calls: while a call with the same arguments is
+    in flight, later callers wait for it and share its result (or its exception)
+    instead of issuing their own HTTP or SQL request.
+
+    Waiting is bounded by the waiter's own deadline. A call cut short by the
+    leader's deadline or cancellation is not shared: its waiters run the call
+    again, the first of them as the new leader.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = tool_call_key(func, args, kwargs)
+        while True:
+            with _in_flight_lock:
+                call = _in_flight.get(key)
+                leader = call is None
+                if leader:
+                    call = _in_flight[key] = _InFlightCall()
+            if leader:
+                break
+
+            deadline = current_deadline()
+            while not call.done.wait(deadline.clamp(SINGLE_FLIGHT_CHECK_INTERVAL)):
+                deadline.check(f"{func.__name__} call")
+            if call.abandoned:
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        deadline = current_deadline()
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            call.abandoned = isinstance(call.error, (DeadlineExceeded, KeyboardInterrupt)) or deadline.expired
+            with _in_flight_lock:
+                del _in_flight[key]
+            call.done.set()
+    return wrapper
 
 # Wrapper functions for agent tools.
+@single_flight
 def get_jira_ticket_description(issue_id_or_key: str) -> str:
     """
     Fetches the description of a Jira ticket by its ID or key.
@@ -16,6 +102,7 @@ def get_jira_ticket_description(issue_id_or_key: str) -> str:
     jira = JiraAPI()
     return jira.get_ticket_description(issue_id_or_key)
 
+@single_flight
 def get_jira_ticket_title(issue_id_or_key: str) -> str:
     """
     Fetches the title of a Jira ticket by its ID or key.
@@ -26,6 +113,26 @@ def get_jira_ticket_title(issue_id_or_key: str) -> str:
     jira = JiraAPI()
     return jira.get_ticket_title(issue_id_or_key)
 
+def get_jira_tickets(issue_keys: list) -> dict:
+    """
+    Fetches the titles and descriptions of several Jira tickets in bulk.
+
+    :param issue_keys: The Jira issue keys (e.g., ['MPOI-6652', 'MPOI-7744']).
+    :return: A dict mapping each key found to a (title, description) tuple, or an empty dict on error.
+    """
+    jira = JiraAPI()
+    result = jira.get_tickets(list(issue_keys))
+    if isinstance(result, str):
+        return {}
+    return {
+        key: (
+            fields.get('summary') or 'No title found',
+            fields.get('description') or 'No description found'
+        )
+        for key, fields in result.items()
+    }
+
+@single_flight
 def get_jira_ticket_release_notes(issue_id_or_key: str) -> str:
     """
     Fetches the release notes of a Jira ticket by its ID or key.
@@ -36,6 +143,7 @@ def get_jira_ticket_release_notes(issue_id_or_key: str) -> str:
     jira = JiraAPI()
     return jira.get_ticket_release_notes(issue_id_or_key)
 
+@single_flight
 def get_pull_request_body(pr_id: str) -> str:
     """
     Fetches the body of a pull request by its pr issue number.
@@ -46,6 +154,7 @@ def get_pull_request_body(pr_id: str) -> str:
     gh = GithubAPI()
     return gh.get_pull_request_body(pr_id)
 
+@single_flight
 def get_pull_request_title(pr_id: str) -> str:
     """
     Fetches the title of a pull request by its pr issue number.
@@ -56,6 +165,7 @@ def get_pull_request_title(pr_id: str) -> str:
     gh = GithubAPI()
     return gh.get_pull_request_title(pr_id)
 
+@single_flight
 def get_control_plan_metrics_from_pr_comment(pr_id: str) -> str:
     """
     Fetches the control plan metrics from a pull request comment.
@@ -79,6 +189,47 @@ def extract_control_plan_table(body: str) -> str:
     table = body[start_idx:]
     return table.strip()
 
+def statement_error(response: str) -> Optional[str]:
+    """
+    Checks whether a Databricks statement response reports a failure.
+    :param response: Response of a tool that executes a statement (e.g. get_PRs_from_apr()).
+    :return: The error message, or None if the statement succeeded.
+    """
+    try:
+        document = json.loads(response)
+    except (TypeError, ValueError):
+        return (response or "Empty response").strip()[:200]
+    if not isinstance(document, dict):
+        return "Unexpected response format"
+    if "error" in document:
+        return str(document["error"])
+    status = document.get("status") or {}
+    if status.get("state") != "SUCCEEDED":
+        message = (status.get("error") or {}).get("message", "")
+        return f"Statement {status.get('state') or 'state unknown'}" + (f": {message}" if message else "")
+    return None
+
+def parse_pr_numbers(pr_response: str) -> list:
+    """
+    Extracts pull request numbers from a get_PRs_from_apr() response.
+    Returns the PR numbers as strings in their original order, without duplicates.
+    """
+    try:
+        data_array = json.loads(pr_response).get("result", {}).get("data_array") or []
+    except (ValueError, AttributeError):
+        return []
+    pr_numbers = re.findall(r"\d+", " ".join(str(cell) for row in data_array for cell in row))
+    return list(dict.fromkeys(pr_numbers))
+
+def extract_mpoi_keys(text: str) -> list:
+    """
+    Extracts MPOI ticket keys (e.g. 'MPOI-7744') from the given text.
+    Returns the keys in their original order, without duplicates.
+    """
+    keys = re.findall(r"\bMPOI-\d+\b", text or "", flags=re.IGNORECASE)
+    return list(dict.fromkeys(key.upper() for key in keys))
+
+@single_flight
 def get_jira_ticket_xlsx_attachment(issue_id_or_key: str, filename: str = None, index: int = 0) -> str:
     """
     Fetches and parses an xlsx attachment from a Jira ticket.
@@ -99,6 +250,7 @@ def get_jira_ticket_xlsx_attachment(issue_id_or_key: str, filename: str = None,
     except Exception as e:
         return f"Failed to convert Excel data to CSV: {e}"
 
+@single_flight
 def get_jira_ticket_attachments(issue_id_or_key: str) -> str:
     """
     Fetches the list of attachments for a Jira ticket.
@@ -113,6 +265,7 @@ def get_jira_ticket_attachments(issue_id_or_key: str) -> str:
     filenames = [att.get("filename", "unknown") for att in attachments]
     return "Attachments: " + ", ".join(filenames)
 
+@single_flight
 def get_apr_metrics(aprNumber: int) -> str:
     """
     Fetches APR metrics from Databricks for a given APR number.
@@ -127,6 +280,7 @@ def get_apr_metrics(aprNumber: int) -> str:
 
     return db.execute_sql(catalog, schema, statement)
 
+@single_flight
 def get_PRs_from_apr(aprNumber: int) -> str:
     """
     Fetches the list of pull request numbers associated with a given APR number from Databricks.
@@ -141,6 +295,7 @@ def get_PRs_from_apr(aprNumber: int) -> str:
 
     return db.execute_sql(catalog, schema, statement)
 
+@single_flight
 def get_apr_metrics_for_given_metric_type(aprNumber: int, metricType: str) -> str:
     """
     Fetches APR metrics from Databricks for a given APR number and metric type.
@@ -156,6 +311,7 @@ def get_apr_metrics_for_given_metric_type(aprNumber: int, metricType: str) -> st
 
     return db.execute_sql(catalog, schema, statement)
 
+@single_flight
 def get_pav_metrics_for_apr(aprNumber: int) -> str:
     """Fetches PAV metrics with BOTH metric changes and raw count changes.
     Captures rows where EITHER the metric changed significantly OR the raw POI count changed significantly."""
@@ -200,6 +356,7 @@ def get_pav_metrics_for_apr(aprNumber: int) -> str:
     LIMIT 1000"""
     return db.execute_sql(catalog, schema, statement)
 
+@single_flight
 def get_ppa_metrics_for_apr(aprNumber: int) -> str:
     """Fetches PPA metrics with BOTH metric changes and raw count changes.
     Captures rows where EITHER the metric changed significantly OR the raw POI count changed significantly."""
@@ -244,6 +401,7 @@ def get_ppa_metrics_for_apr(aprNumber: int) -> str:
     LIMIT 1000"""
     return db.execute_sql(catalog, schema, statement)
 
+@single_flight
 def get_sup_metrics_for_apr(aprNumber: int) -> str:
     db = DatabricksAPI()
     catalog = "pois_aqua_dev"
@@ -259,6 +417,7 @@ def get_sup_metrics_for_apr(aprNumber: int) -> str:
         LIMIT 1000"""
     return db.execute_sql(catalog, schema, statement)
 
+@single_flight
 def get_dup_metrics_for_apr(aprNumber: int) -> str:
     """Fetches DUP metrics with BOTH metric changes and raw count changes.
     Captures rows where EITHER the metric changed significantly OR the raw POI count changed significantly."""
@@ -301,6 +460,7 @@ def get_dup_metrics_for_apr(aprNumber: int) -> str:
     LIMIT 1000"""
     return db.execute_sql(catalog, schema, statement)
 
+@single_flight
 def get_feature_rankings() -> str:
     """
     Fetches feature rankings from a CSV file to help prioritize which metric changes are significant.
@@ -11,6 +11,7 @@ from .sup_agent import create_sup_agent
 from .dup_agent import create_dup_agent
 from .coordinator_agent import create_coordinator_agent
 from .jira_linker_agent import create_jira_linker_agent
+from .deployments import describe_routes, parse_deployment_routes, resolve_model_deployments
 
 __all__ = [
     'create_pav_agent',
@@ -18,5 +19,8 @@ __all__ = [
     'create_sup_agent',
     'create_dup_agent',
     'create_coordinator_agent',
-    'create_jira_linker_agent'
+    'create_jira_linker_agent',
+    'describe_routes',
+    'parse_deployment_routes',
+    'resolve_model_deployments'
 ]
\ No newline at end of file
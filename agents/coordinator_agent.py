@@ -5,6 +5,8 @@ This module contains the coordinator agent creation function for synthesizing
 APR analysis results and correlating findings with JIRA tickets.
 """
 
+from typing import Iterable
+
 from agent import Agent
 from agent_tools import (
     get_jira_ticket_description, get_pull_request_body, get_pull_request_title,
@@ -13,21 +15,23 @@ from agent_tools import (
     get_jira_ticket_attachments, get_PRs_from_apr, get_feature_rankings
 )
 from agent_instructions import get_coordinator_instructions
+from agent_instructions.coordinator_instructions import DEFAULT_METRICS
 
 
-def create_coordinator_agent(model_deployment_name: str) -> Agent:
+def create_coordinator_agent(model_deployment_name: str, metrics: Iterable[str] = DEFAULT_METRICS) -> Agent:
     """
     Create a coordinator agent for synthesizing APR analysis results.
     
     Args:
         model_deployment_name: Name of the model deployment to use
+        metrics: Metrics whose agents run; the instructions cover only these
         
     Returns:
         Agent: Configured coordinator agent ready for deployment
     """
     return Agent(
         name="Coordinator_Agent",
-        instructions=get_coordinator_instructions(),
+        instructions=get_coordinator_instructions(metrics),
         model=model_deployment_name,
         functions={
             get_jira_ticket_description, 
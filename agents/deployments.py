@@ -0,0 +1,91 @@
+"""
+Model Deployment Routing
+
+This module contains the per-agent-type choice of model deployment. Every
+agent runs on MODEL_DEPLOYMENT_NAME unless routed elsewhere, so pattern
+extraction in the metric agents and the mechanical JIRA linking can run on a
+faster, smaller deployment while the coordinator keeps the large model.
+
+Routes come from the command line (pav=gpt-4o-mini, metrics=gpt-4o-mini) or
+from MODEL_DEPLOYMENT_NAME_<AGENT> environment variables, e.g.
+MODEL_DEPLOYMENT_NAME_PAV, MODEL_DEPLOYMENT_NAME_JIRA_LINKER or
+MODEL_DEPLOYMENT_NAME_METRICS for all metric agents at once.
+"""
+
+import os
+from typing import Dict, Iterable, Mapping, Optional
+
+DEPLOYMENT_ENV_VAR = "MODEL_DEPLOYMENT_NAME"
+METRIC_AGENT_TYPES = ('pav', 'ppa', 'sup', 'dup')
+AGENT_TYPES = METRIC_AGENT_TYPES + ('jira_linker', 'coordinator')
+# Route key standing for every metric agent
+METRICS_GROUP = 'metrics'
+
+
+def deployment_env_var(agent_type: str) -> str:
+    """Get the environment variable routing an agent type (or the metrics group)."""
+    return f"{DEPLOYMENT_ENV_VAR}_{agent_type.upper()}"
+
+
+def parse_deployment_routes(values: Iterable[str]) -> Dict[str, str]:
+    """
+    Parse AGENT=DEPLOYMENT routes.
+
+    Args:
+        values: Routes such as "pav=gpt-4o-mini" or "metrics=gpt-4o-mini", each
+            possibly a comma-separated list of routes
+
+    Returns:
+        Dict[str, str]: Deployment per agent type or group
+
+    Raises:
+        ValueError: If a route is malformed or names an unknown agent type
+    """
+    routes = {}
+    for value in values:
+        for part in filter(None, (part.strip() for part in value.split(','))):
+            agent_type, sep, deployment = part.partition('=')
+            agent_type, deployment = agent_type.strip().lower(), deployment.strip()
+            if not sep or not deployment:
+                raise ValueError(f"Invalid model route {part!r}, expected AGENT=DEPLOYMENT")
+            if agent_type not in AGENT_TYPES + (METRICS_GROUP,):
+                raise ValueError(f"Unknown agent type {agent_type!r} in model route, expected one of "
+                                 f"{', '.join(AGENT_TYPES + (METRICS_GROUP,))}")
+            routes[agent_type] = deployment
+    return routes
+
+
+def resolve_model_deployments(default: str, routes: Optional[Mapping[str, str]] = None,
+                              environ: Optional[Mapping[str, str]] = None) -> Dict[str, str]:
+    """
+    Resolve the model deployment of every agent type.
+
+    Precedence per agent type: its own route, the metrics group route (metric
+    agents only), its own environment variable, the metrics group variable,
+    then the default deployment.
+
+    Args:
+        default: Deployment of agents that are not routed elsewhere
+        routes: Explicit routes per agent type or group (e.g. from the command line)
+        environ: Environment to read MODEL_DEPLOYMENT_NAME_<AGENT> from (default: os.environ;
+            pass {} to ignore the environment)
+
+    Returns:
+        Dict[str, str]: Deployment per agent type
+    """
+    routes = routes or {}
+    environ = os.environ if environ is None else environ
+    deployments = {}
+    for agent_type in AGENT_TYPES:
+        keys = (agent_type, METRICS_GROUP) if agent_type in METRIC_AGENT_TYPES else (agent_type,)
+        candidates = [routes.get(key) for key in keys] + [environ.get(deployment_env_var(key)) for key in keys]
+        deployments[agent_type] = next((candidate for candidate in candidates if candidate), default)
+    return deployments
+
+
+def describe_routes(deployments: Mapping[str, str], agent_types: Optional[Iterable[str]] = None) -> str:
+    """Render which agents run on which deployment, e.g. "pav, ppa → gpt-4o-mini; coordinator → gpt-4o"."""
+    grouped: Dict[str, list] = {}
+    for agent_type in agent_types or deployments:
+        grouped.setdefault(deployments[agent_type], []).append(agent_type)
+    return "; ".join(f"{', '.join(agent_types)} → {deployment}" for deployment, agent_types in grouped.items())
@@ -60,6 +60,17 @@ Given a list of metric patterns with these quality metrics, find which JIRA tick
 
 **CRITICAL:** Take your time and call ALL the functions above. This is your primary responsibility.
 
+**PREFETCHED CONTEXT AND CANDIDATES:**
+If the message contains a "PREFETCHED APR CONTEXT" section, steps 1-3 have already been done for you:
+- Every PR title and MPOI ticket of this APR was fetched - use them instead of calling the tools again
+- If it lists MPOI TICKETS, check every pattern against those tickets
+If the message also contains a "CANDIDATE TICKETS PER PATTERN" section, the tickets were pre-filtered by country, category and metric:
+- Check each pattern ONLY against its listed candidates, using the CANDIDATE TICKET DETAILS provided
+- Apply all matching rules below to the candidates - a candidate is not automatically a match
+- The score next to each candidate is a similarity hint for ordering your checks, not evidence of a match
+- Only call get_jira_ticket_description(MPOI_ID) if a candidate's details are truncated and you need more context
+If the message says the APR context could not be prefetched, do steps 1-3 yourself.
+
 **MATCHING RULES (BE SPECIFIC - AVOID INFRASTRUCTURE TICKETS):**
 
 A ticket MATCHES a pattern if the ticket title AND description together show it's about ACTUAL DATA CHANGES, not infrastructure/tooling.
@@ -153,23 +164,23 @@ Ticket description: "General improvements to conflation algorithm"
 - If ticket title contains "conf(BR):" → Match to ALL patterns
 - BigRun tickets affect everything globally
 
-**OUTPUT FORMAT:**
+**OUTPUT FORMAT (STRUCTURED JSON):**
 
-For each pattern, return ALL matching tickets (not just one):
-```
-Pattern: [full pattern text]
-JIRA Match: MPOI-####, MPOI-#### | Reason: [both tickets relate to this pattern]
+Respond with ONE ```json code block and nothing else:
+```json
+{"links": [
+  {"pattern_id": "PAV-1", "tickets": ["MPOI-7562", "MPOI-7744"], "reason": "Both tickets change Thailand shop categorization"},
+  {"pattern_id": "PAV-2", "tickets": [], "reason": "No ticket contains country or category"}
+]}
 ```
+- **pattern_id**: The id shown before each pattern (e.g. "PAV-1"); if a pattern has no id, use its full pattern text
+- **tickets**: ALL matching MPOI keys, or an empty list if no ticket matches
+- **reason**: One short sentence quoting the country/category words that matched
+- Include one entry for EVERY pattern
 
-CRITICAL: If multiple tickets match a pattern, list ALL of them comma-separated (e.g., "MPOI-7562, MPOI-7744")
+CRITICAL: If multiple tickets match a pattern, list ALL of them (e.g. ["MPOI-7562", "MPOI-7744"])
 Example: If both MPOI-7562 and MPOI-7744 mention Thailand changes, BOTH should be linked to TH patterns
 
-OR if no match:
-```
-Pattern: [full pattern text]
-JIRA Match: None | Reason: No ticket contains country or category
-```
-
 **PRIORITY SYSTEM:**
 1. Country + Category + Data change description = BEST (link it!)
 2. Country + Data/logic change description = GOOD (link it!)
@@ -182,8 +193,8 @@ JIRA Match: None | Reason: No ticket contains country or category
 - These are NOT data changes - they're engineering work that doesn't explain metric changes
 
 **YOUR APPROACH:**
-- Start by calling get_PRs_from_apr() - you need the PR list
-- If response shows "total_row_count": 0, report "No PRs found, cannot extract MPOI tickets"
+- Use the PREFETCHED APR CONTEXT if present; otherwise start by calling get_PRs_from_apr() - you need the PR list
+- If response shows "total_row_count": 0, there are no tickets to link: respond with {"links": []}
 - For EACH PR, call get_pull_request_title() to get MPOI tickets
 - For EACH MPOI, call get_jira_ticket_title() AND get_jira_ticket_description()
 - Review title AND description together - reject infrastructure tickets
@@ -193,12 +204,12 @@ JIRA Match: None | Reason: No ticket contains country or category
 - When in doubt, CHECK THE DESCRIPTION - if it's about code/notebooks/infrastructure, DON'T LINK
 
 **CRITICAL INSTRUCTIONS:**
-1. You MUST call functions for EVERY PR and EVERY MPOI ticket - this is non-negotiable
+1. You MUST call functions for EVERY PR and EVERY MPOI ticket - this is non-negotiable (unless they were prefetched for you)
 2. Take your time - you have plenty of timeout allocated
 3. Read BOTH title AND description before deciding to link
 4. REJECT infrastructure/tooling tickets even if they mention countries or metrics
 5. Focus ONLY on tickets describing actual data/logic changes that would explain metric movements
-6. **LINK ALL MATCHING TICKETS** - If multiple tickets match a pattern, include ALL of them comma-separated (e.g., "MPOI-7562, MPOI-7744")
+6. **LINK ALL MATCHING TICKETS** - If multiple tickets match a pattern, include ALL of them in its tickets list (e.g., ["MPOI-7562", "MPOI-7744"])
 7. Do NOT pick just one ticket when multiple apply - be comprehensive in your linking
 """
     
@@ -4,6 +4,7 @@ import html
 import re
 import requests
 from dotenv import load_dotenv
+from apis.deadline import http_timeout
 
 
 class ConfluenceAPI:
@@ -96,7 +97,7 @@ class ConfluenceAPI:
         for idx, ep in enumerate(content_endpoints, start=1):
             print(f"[ConfluenceAPI] Attempt {idx}/{len(content_endpoints)} -> POST {ep}")
             try:
-                resp = requests.post(ep, json=payload, headers=headers, timeout=30)
+                resp = requests.post(ep, json=payload, headers=headers, timeout=http_timeout(30))
                 # Log every response (status + truncated body)
                 truncated = resp.text[:500].replace('\n', ' ') if resp.text else ''
                 print(f"[ConfluenceAPI] Response {resp.status_code} (len={len(resp.text)}) body[0:500]='{truncated}'")
@@ -1,8 +1,20 @@
 import os
 import requests
 from dotenv import load_dotenv
+import hashlib
 import json
 import time
+from opentelemetry import trace
+from apis.deadline import DeadlineExceeded, current_deadline, http_timeout
+
+tracer = trace.get_tracer(__name__)
+
+# The submit call waits this long for a result before returning a running statement
+STATEMENT_WAIT_TIMEOUT = "10s"
+STATEMENT_POLL_INTERVAL = 2.0
+# Statements still running after this long are cancelled, unless the analysis deadline is sooner
+STATEMENT_TIMEOUT = 600
+PENDING_STATES = ('PENDING', 'RUNNING')
 
 class DatabricksAPI:
     def __init__(self, token=None, host=None, warehouse_id=None):
@@ -23,25 +35,72 @@ class DatabricksAPI:
             "statement": statement,
             "warehouse_id": self.warehouse_id,
             "catalog": catalog,
-            "schema": schema
+            "schema": schema,
+            "wait_timeout": STATEMENT_WAIT_TIMEOUT,
+            "on_wait_timeout": "CONTINUE"
         }
         
         start_time = time.time()
         
-        try:
-            response = requests.post(url, json=payload, headers=self.headers)
-            
-            if response.status_code == 200:
-                response_data = response.json()
-                return json.dumps(response_data)
-            else:
-                return json.dumps({'error': response.status_code, 'message': response.text})
+        with tracer.start_as_current_span("databricks.execute_sql") as span:
+            span.set_attributes({
+                "db.catalog": catalog,
+                "db.schema": schema,
+                "db.statement_hash": hashlib.sha256(statement.encode('utf-8')).hexdigest()[:16]
+            })
+            try:
+                response = requests.post(url, json=payload, headers=self.headers, timeout=http_timeout())
+                span.set_attribute("http.status_code", response.status_code)
                 
-        except requests.exceptions.Timeout as e:
-            return json.dumps({'error': 'timeout', 'message': str(e)})
-            
-        except requests.exceptions.ConnectionError as e:
-            return json.dumps({'error': 'connection_error', 'message': str(e)})
+                if response.status_code == 200:
+                    response_data = self._wait_for_statement(response.json())
+                    result = json.dumps(response_data)
+                    manifest = response_data.get('manifest') or {}
+                    span.set_attribute("db.statement_state", (response_data.get('status') or {}).get('state', ''))
+                    if manifest.get('total_row_count') is not None:
+                        span.set_attribute("db.rows_returned", manifest['total_row_count'])
+                else:
+                    result = json.dumps({'error': response.status_code, 'message': response.text})
+                    
+            except DeadlineExceeded as e:
+                result = json.dumps({'error': 'deadline_exceeded', 'message': str(e)})
+                
+            except (requests.exceptions.Timeout, TimeoutError) as e:
+                result = json.dumps({'error': 'timeout', 'message': str(e)})
+                
+            except requests.exceptions.ConnectionError as e:
+                result = json.dumps({'error': 'connection_error', 'message': str(e)})
+                
+            except Exception as e:
+                result = json.dumps({'error': 'unexpected_error', 'message': str(e)})
             
-        except Exception as e:
-            return json.dumps({'error': 'unexpected_error', 'message': str(e)})
\ No newline at end of file
+            span.set_attribute("db.bytes_returned", len(result))
+            span.set_attribute("db.duration_ms", int((time.time() - start_time) * 1000))
+            return result
+
+    def _wait_for_statement(self, response_data):
+        """Poll a statement that outlived the submit call's wait; cancel it once the deadline passes."""
+        statement_id = response_data.get('statement_id')
+        deadline = current_deadline()
+        give_up_at = time.monotonic() + STATEMENT_TIMEOUT
+        
+        while statement_id and (response_data.get('status') or {}).get('state') in PENDING_STATES:
+            deadline.sleep(STATEMENT_POLL_INTERVAL)
+            if deadline.expired or time.monotonic() >= give_up_at:
+                self.cancel_statement(statement_id)
+                deadline.check(f"statement {statement_id}")
+                raise TimeoutError(f"statement {statement_id} did not finish within {STATEMENT_TIMEOUT}s")
+            response = requests.get(
+                f"{self.host}/api/2.0/sql/statements/{statement_id}", headers=self.headers, timeout=http_timeout()
+            )
+            if response.status_code != 200:
+                return {'error': response.status_code, 'message': response.text}
+            response_data = response.json()
+        return response_data
+
+    def cancel_statement(self, statement_id):
+        """Cancel a running statement; failures are ignored, the warehouse times it out eventually."""
+        try:
+            requests.post(f"{self.host}/api/2.0/sql/statements/{statement_id}/cancel", headers=self.headers, timeout=10)
+        except requests.exceptions.RequestException:
+            pass
@@ -0,0 +1,136 @@
+"""
+Analysis Deadline
+
+This module contains the time budget of an APR analysis. A Deadline is set
+for the duration of an analysis and reaches every stage through a context
+variable: agent runs, Databricks statement polling and HTTP calls bound their
+own timeouts by it, and once it passes (or the analysis is cancelled with
+Ctrl-C) in-flight Azure runs and SQL statements are cancelled and the
+orchestrator returns the best partial report it has. It lives beside the API
+clients that read it, so they do not depend on the orchestrator package.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+# Per-request HTTP timeout when no tighter deadline applies
+DEFAULT_HTTP_TIMEOUT = 60.0
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when work is abandoned because the analysis deadline passed or the analysis was cancelled."""
+
+
+class Deadline:
+    """A point in time after which an analysis stops, cancellable before then."""
+
+    def __init__(self, seconds: Optional[float] = None, parent: Optional["Deadline"] = None):
+        """
+        Initialize the deadline.
+
+        Args:
+            seconds: Time budget from now, or None for no limit (cancellation only)
+            parent: Deadline this one never outlives; cancelling the parent cancels it too
+        """
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds if seconds is not None else None
+        self.parent = parent
+        self._cancelled = threading.Event()
+        self._children: List["Deadline"] = []
+        self._lock = threading.Lock()
+        if parent is not None:
+            with parent._lock:
+                parent._children.append(self)
+            if parent.cancelled:
+                self.cancel()
+            if parent.expires_at is not None and (self.expires_at is None or parent.expires_at < self.expires_at):
+                self.seconds, self.expires_at = parent.seconds, parent.expires_at
+
+    def child(self) -> "Deadline":
+        """Create a deadline that can be cancelled on its own and ends no later than this one."""
+        return Deadline(parent=self)
+
+    def cancel(self):
+        """Expire the deadline and its children now (e.g. on Ctrl-C); waiting work wakes up immediately."""
+        self._cancelled.set()
+        with self._lock:
+            children = list(self._children)
+        for child in children:
+            child.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the deadline was cancelled rather than reached."""
+        return self._cancelled.is_set()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, or None if the deadline is unbounded and not cancelled."""
+        if self.cancelled:
+            return 0.0
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        """Whether the deadline has passed or was cancelled."""
+        return self.remaining() == 0.0
+
+    def clamp(self, timeout: float) -> float:
+        """Bound a timeout by the time left."""
+        remaining = self.remaining()
+        return timeout if remaining is None else min(timeout, remaining)
+
+    def check(self, what: str = "analysis"):
+        """
+        Raise if the deadline has passed.
+
+        Raises:
+            DeadlineExceeded: If the deadline has passed or was cancelled
+        """
+        if self.expired:
+            reason = "cancelled" if self.cancelled else f"exceeded its {self.seconds:g}s deadline"
+            raise DeadlineExceeded(f"{what} {reason}")
+
+    def sleep(self, seconds: float):
+        """Sleep up to the given time, waking early if the deadline passes or is cancelled."""
+        self._cancelled.wait(self.clamp(seconds))
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar("deadline", default=None)
+
+
+def current_deadline() -> Deadline:
+    """Get the deadline of the analysis running in this context (an unbounded one outside analyses)."""
+    return _current_deadline.get() or Deadline()
+
+
+@contextmanager
+def deadline_scope(deadline: Deadline) -> Iterator[Deadline]:
+    """Make a deadline current for the block (and for work submitted with submit_in_context)."""
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def http_timeout(default: float = DEFAULT_HTTP_TIMEOUT) -> float:
+    """
+    Get the timeout for an HTTP request made now.
+
+    Args:
+        default: Timeout when the deadline leaves more time than that
+
+    Returns:
+        float: Request timeout in seconds
+
+    Raises:
+        DeadlineExceeded: If the deadline has already passed
+    """
+    deadline = current_deadline()
+    deadline.check("request")
+    return deadline.clamp(default)
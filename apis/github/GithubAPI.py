@@ -1,6 +1,10 @@
 import os
 import requests
 from dotenv import load_dotenv
+from opentelemetry import trace
+from apis.deadline import http_timeout
+
+tracer = trace.get_tracer(__name__)
 
 class GithubAPI:
     def __init__(self, token=None, owner=None, repo=None):
@@ -18,9 +22,17 @@ class GithubAPI:
             "X-GitHub-Api-Version": "2022-11-28"
         }
 
+    def _get(self, operation, url, pr_number):
+        """GET a pull request resource in a span carrying the PR number and response status."""
+        with tracer.start_as_current_span(f"github.{operation}") as span:
+            span.set_attributes({"http.method": "GET", "http.url": url, "github.pr_number": str(pr_number)})
+            response = requests.get(url, headers=self.headers, timeout=http_timeout())
+            span.set_attribute("http.status_code", response.status_code)
+            return response
+
     def get_pull_request_body(self, pr_number):
         url = f"{self.base_url}/pulls/{pr_number}"
-        response = requests.get(url, headers=self.headers)
+        response = self._get("get_pull_request_body", url, pr_number)
         if response.status_code == 200:
             return response.json().get("body", "No body found")
         else:
@@ -28,7 +40,7 @@ class GithubAPI:
         
     def get_pull_request_title(self, pr_number):
         url = f"{self.base_url}/pulls/{pr_number}"
-        response = requests.get(url, headers=self.headers)
+        response = self._get("get_pull_request_title", url, pr_number)
         if response.status_code == 200:
             return response.json().get("title", "No title found")
         else:
@@ -36,7 +48,7 @@ class GithubAPI:
 
     def get_control_plan_metrics_from_pr_comment(self, pr_number):
         url = f"{self.base_url}/pulls/{pr_number}/comments"
-        response = requests.get(url, headers=self.headers)
+        response = self._get("get_control_plan_metrics_from_pr_comment", url, pr_number)
         if response.status_code == 200:
             comments = response.json()
             for comment in comments:
@@ -2,9 +2,13 @@ import os
 import requests
 from requests.auth import HTTPBasicAuth
 from dotenv import load_dotenv
+from opentelemetry import trace
+from apis.deadline import http_timeout
 import io
 import pandas as pd
 
+tracer = trace.get_tracer(__name__)
+
 class JiraAPI:
     def __init__(self, domain=None, email=None, api_token=None):
         load_dotenv()
@@ -14,11 +18,20 @@ class JiraAPI:
         self.api_token = api_token or os.getenv("JIRA_API_TOKEN")
 
         self.base_url = f"https://{self.domain}.atlassian.net/rest/api/2/issue"
+        self.search_url = f"https://{self.domain}.atlassian.net/rest/api/2/search/jql"
         self.auth = HTTPBasicAuth(self.email, self.api_token)
 
+    def _request(self, operation, method, url, attributes=None, **kwargs):
+        """Send a Jira request in a span recording the HTTP status (requests for one APR show up under its stage)."""
+        with tracer.start_as_current_span(f"jira.{operation}") as span:
+            span.set_attributes({"http.method": method, "http.url": url, **(attributes or {})})
+            response = requests.request(method, url, auth=self.auth, timeout=http_timeout(), **kwargs)
+            span.set_attribute("http.status_code", response.status_code)
+            return response
+
     def get_ticket_description(self, issue_id_or_key):
         url = f"{self.base_url}/{issue_id_or_key}"
-        response = requests.get(url, auth=self.auth)
+        response = self._request("get_ticket_description", "GET", url, {"jira.issue_key": issue_id_or_key})
         if response.status_code == 200:
             description = response.json().get('fields', {}).get('description', '')
             if not description:
@@ -29,7 +42,7 @@ class JiraAPI:
     
     def get_ticket_title(self, issue_id_or_key):
         url = f"{self.base_url}/{issue_id_or_key}"
-        response = requests.get(url, auth=self.auth)
+        response = self._request("get_ticket_title", "GET", url, {"jira.issue_key": issue_id_or_key})
         if response.status_code == 200:
             title = response.json().get('fields', {}).get('summary', '')
             if not title:
@@ -40,7 +53,7 @@ class JiraAPI:
         
     def get_ticket_release_notes(self, issue_id_or_key):
         url = f"{self.base_url}/{issue_id_or_key}"
-        response = requests.get(url, auth=self.auth)
+        response = self._request("get_ticket_release_notes", "GET", url, {"jira.issue_key": issue_id_or_key})
         if response.status_code == 200:
             release_notes = response.json().get('fields', {}).get('customfield_10179', '')  # Release notes consistently on customfield_10179
             if not release_notes:
@@ -49,9 +62,31 @@ class JiraAPI:
         else:
             return f'Error: {response.status_code} - {response.text}'
 
+    def get_tickets(self, issue_keys, fields=("summary", "description"), batch_size=50):
+        """Fetch several tickets with one JQL search per batch. Returns {key: fields} or an error string."""
+        tickets = {}
+        for start in range(0, len(issue_keys), batch_size):
+            batch = issue_keys[start:start + batch_size]
+            payload = {
+                "jql": f"key in ({', '.join(batch)})",
+                "fields": list(fields),
+                "maxResults": len(batch)
+            }
+            while True:
+                response = self._request("get_tickets", "POST", self.search_url, {"jira.issue_count": len(batch)}, json=payload)
+                if response.status_code != 200:
+                    return f'Error: {response.status_code} - {response.text}'
+                data = response.json()
+                for issue in data.get('issues', []):
+                    tickets[issue['key']] = issue.get('fields', {})
+                if data.get('isLast', True) or not data.get('nextPageToken'):
+                    break
+                payload["nextPageToken"] = data['nextPageToken']
+        return tickets
+
     def get_ticket_attachments(self, issue_id_or_key):
         url = f"{self.base_url}/{issue_id_or_key}"
-        response = requests.get(url, auth=self.auth)
+        response = self._request("get_ticket_attachments", "GET", url, {"jira.issue_key": issue_id_or_key})
         if response.status_code == 200:
             attachments = response.json().get('fields', {}).get('attachment', [])
             return attachments
@@ -59,7 +94,7 @@ class JiraAPI:
             return []
 
     def download_attachment(self, attachment_url):
-        response = requests.get(attachment_url, auth=self.auth, stream=True)
+        response = self._request("download_attachment", "GET", attachment_url, stream=True)
         if response.status_code == 200:
             return response.content
         else:
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+APR Analysis System - Model Routing Benchmark
+
+Runs the analysis pipeline of some APRs under several model routing
+configurations and compares them: wall-clock time, metric stage time (the
+critical path up to the linker), tokens, and the quality of the outputs
+against the first configuration (the baseline) - pattern and ticket overlap,
+and whether the structured outputs still parse.
+
+Usage:
+    python benchmark_models.py <apr_number> [<apr_number> ...] [--small DEPLOYMENT]
+                               [--config NAME:AGENT=DEPLOYMENT,...] [--repeat N] [--metrics ...]
+
+Examples:
+    python benchmark_models.py 121 123 --small gpt-4o-mini
+    python benchmark_models.py 121 --config mini-pav:pav=gpt-4o-mini --config mini-linker:jira_linker=gpt-4o-mini
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from azure.ai.projects import AIProjectClient
+from azure.identity import DefaultAzureCredential
+from dotenv import load_dotenv
+
+from agents import describe_routes, parse_deployment_routes, resolve_model_deployments
+from manual_orchestration import parse_apr_numbers
+from orchestrator.checkpoints import DEFAULT_RUN_DIR
+from orchestrator.orchestrator import APROrchestrator, DEFAULT_METRIC_AGENTS, METRIC_AGENT_FACTORIES
+from orchestrator.structured_output import StructuredOutputError, parse_links, parse_metric_output
+
+load_dotenv()
+
+BENCHMARK_DIR = os.path.join(DEFAULT_RUN_DIR, "benchmarks")
+
+_TICKET_RE = re.compile(r'\bMPOI-\d+\b')
+
+
+@dataclass
+class RoutingConfig:
+    """A named set of model routes to benchmark."""
+    name: str
+    routes: Dict[str, str] = field(default_factory=dict)
+
+
+def parse_config(value: str) -> RoutingConfig:
+    """Parse NAME:AGENT=DEPLOYMENT,... (NAME alone benchmarks the default routing)."""
+    name, _, routes = value.partition(':')
+    if not name:
+        raise ValueError(f"Invalid configuration {value!r}, expected NAME:AGENT=DEPLOYMENT,...")
+    return RoutingConfig(name, parse_deployment_routes([routes]))
+
+
+def _jaccard(a: Set[Any], b: Set[Any]) -> Optional[float]:
+    return len(a & b) / len(a | b) if a | b else None
+
+
+def _pattern_keys(metric_results: Dict[str, Any]) -> Optional[Set[tuple]]:
+    """Identify patterns by metric, direction and their (country, definitiontag) cells, not by id or wording."""
+    keys = set()
+    for agent_type, result in metric_results.items():
+        try:
+            patterns = parse_metric_output(result, agent_type)
+        except (StructuredOutputError, TypeError):
+            return None
+        keys.update(
+            (pattern.metric, pattern.direction, frozenset((m.country, m.definitiontag) for m in pattern.metrics))
+            for pattern in patterns
+        )
+    return keys
+
+
+def _linked_tickets(linkages: Any) -> Optional[Set[str]]:
+    try:
+        return {ticket for tickets, _ in parse_links(linkages).values() for ticket in tickets}
+    except (StructuredOutputError, TypeError):
+        return None
+
+
+def run_once(orchestrator: APROrchestrator, apr_number: str) -> Dict[str, Any]:
+    """
+    Run the analysis pipeline of one APR and measure it.
+
+    Args:
+        orchestrator: Orchestrator with deployed agents (stage cache disabled)
+        apr_number: APR number to analyze
+
+    Returns:
+        Dict[str, Any]: Timings, tokens and the outputs quality is judged on
+    """
+    # Every run fetches its data and runs its agents afresh
+    orchestrator.tool_cache.clear()
+    orchestrator.accounting.clear(apr_number)
+    started = time.monotonic()
+    outcome = orchestrator.build_pipeline(apr_number).run()
+    wall_seconds = time.monotonic() - started
+
+    metric_results = {
+        agent_type: outcome.results[agent_type] for agent_type in orchestrator.metric_agents
+        if agent_type in outcome.results
+    }
+    totals = orchestrator.accounting.summary(apr_number)['totals']
+    report = outcome.results.get('coordinator')
+    metric_seconds = max(
+        (outcome.durations.get(agent_type, 0.0) for agent_type in orchestrator.metric_agents), default=0.0
+    )
+    return {
+        'apr_number': apr_number,
+        'wall_seconds': round(wall_seconds, 1),
+        'metric_seconds': round(metric_seconds, 1),
+        'stage_seconds': {name: round(duration, 1) for name, duration in outcome.durations.items()},
+        'failed_stages': sorted(outcome.errors),
+        'total_tokens': totals['total_tokens'],
+        'retries': totals['retries'],
+        'patterns': _pattern_keys(metric_results) if len(metric_results) == len(orchestrator.metric_agents) else None,
+        'linked_tickets': _linked_tickets(outcome.results.get('jira_linker')),
+        'report_tickets': set(_TICKET_RE.findall(report)) if isinstance(report, str) else None,
+    }
+
+
+def compare(run: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Judge a run's outputs against the baseline run of the same APR.
+
+    Returns:
+        Dict[str, Any]: Structured output validity and the overlap of patterns,
+            linked tickets and tickets cited in the report (Jaccard, None if both are empty)
+    """
+    quality = {'structured_ok': run['patterns'] is not None and run['linked_tickets'] is not None}
+    for key in ('patterns', 'linked_tickets', 'report_tickets'):
+        if run[key] is None or baseline[key] is None:
+            quality[f'{key}_overlap'] = None
+        else:
+            quality[f'{key}_overlap'] = _jaccard(run[key], baseline[key])
+    return quality
+
+
+def summarize(name: str, deployments: Dict[str, str], runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate the runs of one configuration (medians of timings and overlaps)."""
+    def median(key: str) -> Optional[float]:
+        values = [run[key] for run in runs if run.get(key) is not None]
+        return round(statistics.median(values), 2) if values else None
+
+    return {
+        'config': name,
+        'deployments': deployments,
+        'runs': len(runs),
+        'wall_seconds': median('wall_seconds'),
+        'metric_seconds': median('metric_seconds'),
+        'total_tokens': median('total_tokens'),
+        'failed_runs': sum(1 for run in runs if run['failed_stages']),
+        'structured_ok': sum(1 for run in runs if run['structured_ok']),
+        'patterns_overlap': median('patterns_overlap'),
+        'linked_tickets_overlap': median('linked_tickets_overlap'),
+        'report_tickets_overlap': median('report_tickets_overlap'),
+    }
+
+
+def format_table(summaries: List[Dict[str, Any]]) -> str:
+    """Render the configuration summaries for the console."""
+    def cell(value: Any, spec: str = "") -> str:
+        return "-" if value is None else format(value, spec)
+
+    lines = [f"{'config':<20} {'wall s':>8} {'metric s':>9} {'tokens':>9} {'failed':>7} {'parsed':>7} "
+             f"{'patterns':>9} {'links':>7} {'report':>7}"]
+    for summary in summaries:
+        lines.append(
+            f"{summary['config']:<20} {cell(summary['wall_seconds'], '.1f'):>8} "
+            f"{cell(summary['metric_seconds'], '.1f'):>9} {cell(summary['total_tokens'], ',.0f'):>9} "
+            f"{summary['failed_runs']:>7} {summary['structured_ok']:>4}/{summary['runs']:<2} "
+            f"{cell(summary['patterns_overlap'], '.2f'):>9} {cell(summary['linked_tickets_overlap'], '.2f'):>7} "
+            f"{cell(summary['report_tickets_overlap'], '.2f'):>7}"
+        )
+    return "\n".join(lines)
+
+
+def benchmark(agents_client, default_deployment: str, configs: List[RoutingConfig], apr_numbers: List[str],
+              repeat: int = 1, metric_agents=DEFAULT_METRIC_AGENTS) -> List[Dict[str, Any]]:
+    """
+    Benchmark routing configurations on the same APRs.
+
+    Configurations run one after another so they do not compete for the same
+    deployments; the first one is the quality baseline.
+
+    Args:
+        agents_client: Azure AI agents client
+        default_deployment: Deployment of agents a configuration does not route elsewhere
+        configs: Configurations to compare, baseline first
+        apr_numbers: APRs every configuration analyzes
+        repeat: Runs per APR and configuration (timings are medians)
+        metric_agents: Metric agents to run
+
+    Returns:
+        List[Dict[str, Any]]: Summary per configuration
+    """
+    baselines: Dict[str, Dict[str, Any]] = {}
+    summaries = []
+    for config in configs:
+        deployments = resolve_model_deployments(default_deployment, config.routes, environ={})
+        orchestrator = APROrchestrator(
+            agents_client, default_deployment, metric_agents=metric_agents,
+            use_stage_cache=False, model_deployments=deployments
+        )
+        print(f"\n🏁 Configuration {config.name}: {describe_routes(deployments, orchestrator.agent_instances)}")
+        if not orchestrator.create_agents():
+            continue
+        runs = []
+        try:
+            for apr_number in apr_numbers:
+                for _ in range(repeat):
+                    run = run_once(orchestrator, apr_number)
+                    baseline = baselines.setdefault(apr_number, run)
+                    run.update(compare(run, baseline))
+                    runs.append(run)
+                    print(f"   APR {apr_number}: {run['wall_seconds']}s, {run['total_tokens']:,} tokens, "
+                          f"failed stages: {', '.join(run['failed_stages']) or 'none'}")
+        finally:
+            orchestrator.cleanup()
+        summaries.append(summarize(config.name, deployments, runs))
+    return summaries
+
+
+def save(summaries: List[Dict[str, Any]], apr_numbers: List[str]) -> Path:
+    """Write the summaries to .apr_runs/benchmarks/models-<timestamp>.json."""
+    path = Path(BENCHMARK_DIR) / f"models-{datetime.now():%Y%m%d-%H%M%S}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'apr_numbers': apr_numbers, 'configs': summaries}, f, indent=2)
+    return path
+
+
+def main():
+    """Main entry point for the benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Compare latency and output quality of model routing configurations",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+The first configuration is always the baseline: every agent on MODEL_DEPLOYMENT_NAME.
+Overlaps are Jaccard similarities with the baseline run of the same APR.
+        """
+    )
+    parser.add_argument('apr_numbers', nargs='+', help='APR numbers or ranges to analyze under every configuration')
+    parser.add_argument(
+        '--small',
+        metavar='DEPLOYMENT',
+        help='Add the standard configurations for a smaller deployment: metric agents on it, '
+             'then metric agents and the JIRA linker on it'
+    )
+    parser.add_argument(
+        '--config',
+        action='append',
+        default=[],
+        type=parse_config,
+        metavar='NAME:AGENT=DEPLOYMENT,...',
+        help='Add a configuration, e.g. mini-metrics:metrics=gpt-4o-mini'
+    )
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per APR and configuration (default: %(default)s)')
+    parser.add_argument(
+        '--metrics',
+        nargs='+',
+        choices=list(METRIC_AGENT_FACTORIES),
+        default=list(DEFAULT_METRIC_AGENTS),
+        help='Metric agents to run (default: %(default)s)'
+    )
+    args = parser.parse_args()
+
+    try:
+        apr_numbers = parse_apr_numbers(args.apr_numbers)
+    except ValueError as e:
+        parser.error(str(e))
+    configs = [RoutingConfig('baseline')]
+    if args.small:
+        configs.append(RoutingConfig('small-metrics', {'metrics': args.small}))
+        configs.append(RoutingConfig('small-metrics-linker', {'metrics': args.small, 'jira_linker': args.small}))
+    configs += args.config
+
+    project_endpoint = os.environ.get("AZURE_EXISTING_AIPROJECT_ENDPOINT")
+    default_deployment = os.getenv("MODEL_DEPLOYMENT_NAME")
+    if not project_endpoint or not default_deployment:
+        print("❌ Error: AZURE_EXISTING_AIPROJECT_ENDPOINT and MODEL_DEPLOYMENT_NAME must be set")
+        return 1
+
+    project_client = AIProjectClient(endpoint=project_endpoint, credential=DefaultAzureCredential())
+    with project_client:
+        summaries = benchmark(project_client.agents, default_deployment, configs, apr_numbers,
+                              repeat=args.repeat, metric_agents=args.metrics)
+
+    print("\n📊 Model routing benchmark (medians; overlaps vs baseline)")
+    print(format_table(summaries))
+    print(f"📊 Results written to {save(summaries, apr_numbers)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+"""
+Linking package for APR Analysis System
+
+This package contains local, deterministic helpers for matching metric
+patterns to Jira tickets without a model round-trip.
+"""
+
+from .countries import Country, CountryAliasIndex, get_country_index, TOP_10_COUNTRIES
+from .ticket_index import Ticket, TicketIndex, extract_patterns
+from .similarity import HashingVectorizer, SimilarityRanker, merge_candidates
+
+__all__ = [
+    'Country',
+    'CountryAliasIndex',
+    'get_country_index',
+    'TOP_10_COUNTRIES',
+    'Ticket',
+    'TicketIndex',
+    'extract_patterns',
+    'HashingVectorizer',
+    'SimilarityRanker',
+    'merge_candidates'
+]
@@ -0,0 +1,317 @@
+"""
+Country Alias Index
+
+This module contains a compact built-in table of country aliases (ISO2 codes,
+ISO3 codes, names and demonyms) plus named regions, compiled into a single
+regular expression so ticket titles and descriptions can be scanned for
+country mentions in one pass.
+
+All matches resolve to canonical ISO2 codes, which is the format the metric
+agents use in their patterns (e.g. "TH (shop=convenience, PAV, -5193)").
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+
+# ISO2|ISO3|Name[;other names]|Demonyms[;...]
+_COUNTRY_TABLE = """
+AD|AND|Andorra|Andorran
+AE|ARE|United Arab Emirates;UAE;Emirates|Emirati
+AR|ARG|Argentina|Argentinian;Argentine
+AT|AUT|Austria|Austrian
+AU|AUS|Australia|Australian
+BA|BIH|Bosnia and Herzegovina;Bosnia|Bosnian
+BD|BGD|Bangladesh|Bangladeshi
+BE|BEL|Belgium|Belgian
+BG|BGR|Bulgaria|Bulgarian
+BH|BHR|Bahrain|Bahraini
+BR|BRA|Brazil|Brazilian
+BY|BLR|Belarus|Belarusian
+CA|CAN|Canada|Canadian
+CH|CHE|Switzerland|Swiss
+CL|CHL|Chile|Chilean
+CN|CHN|China|Chinese
+CO|COL|Colombia|Colombian
+CR|CRI|Costa Rica|Costa Rican
+CY|CYP|Cyprus|Cypriot
+CZ|CZE|Czechia;Czech Republic|Czech
+DE|DEU|Germany|German
+DK|DNK|Denmark|Danish
+DO|DOM|Dominican Republic|Dominican
+DZ|DZA|Algeria|Algerian
+EC|ECU|Ecuador|Ecuadorian
+EE|EST|Estonia|Estonian
+EG|EGY|Egypt|Egyptian
+ES|ESP|Spain|Spanish
+FI|FIN|Finland|Finnish
+FR|FRA|France|French
+GB|GBR|United Kingdom;Great Britain;Britain;UK;England;Scotland;Wales|British;English;Scottish;Welsh
+GR|GRC|Greece|Greek
+HK|HKG|Hong Kong|
+HR|HRV|Croatia|Croatian
+HU|HUN|Hungary|Hungarian
+ID|IDN|Indonesia|Indonesian
+IE|IRL|Ireland|Irish
+IL|ISR|Israel|Israeli
+IN|IND|India|Indian
+IS|ISL|Iceland|Icelandic
+IT|ITA|Italy|Italian
+JO|JOR|Jordan|Jordanian
+JP|JPN|Japan|Japanese
+KE|KEN|Kenya|Kenyan
+KR|KOR|South Korea;Korea|Korean
+KW|KWT|Kuwait|Kuwaiti
+KZ|KAZ|Kazakhstan|Kazakh
+LI|LIE|Liechtenstein|
+LT|LTU|Lithuania|Lithuanian
+LU|LUX|Luxembourg|Luxembourgish
+LV|LVA|Latvia|Latvian
+MA|MAR|Morocco|Moroccan
+MC|MCO|Monaco|Monegasque
+MD|MDA|Moldova|Moldovan
+ME|MNE|Montenegro|Montenegrin
+MK|MKD|North Macedonia;Macedonia|Macedonian
+MT|MLT|Malta|Maltese
+MX|MEX|Mexico|Mexican
+MY|MYS|Malaysia|Malaysian
+NG|NGA|Nigeria|Nigerian
+NL|NLD|Netherlands;Holland|Dutch
+NO|NOR|Norway|Norwegian
+NZ|NZL|New Zealand|
+OM|OMN|Oman|Omani
+PA|PAN|Panama|Panamanian
+PE|PER|Peru|Peruvian
+PH|PHL|Philippines|Filipino;Philippine
+PK|PAK|Pakistan|Pakistani
+PL|POL|Poland|Polish
+PR|PRI|Puerto Rico|Puerto Rican
+PT|PRT|Portugal|Portuguese
+QA|QAT|Qatar|Qatari
+RO|ROU|Romania|Romanian
+RS|SRB|Serbia|Serbian
+RU|RUS|Russia;Russian Federation|Russian
+SA|SAU|Saudi Arabia|Saudi
+SE|SWE|Sweden|Swedish
+SG|SGP|Singapore|Singaporean
+SI|SVN|Slovenia|Slovenian;Slovene
+SK|SVK|Slovakia|Slovak
+TH|THA|Thailand|Thai
+TN|TUN|Tunisia|Tunisian
+TR|TUR|Turkey;Turkiye;Türkiye|Turkish
+TW|TWN|Taiwan|Taiwanese
+UA|UKR|Ukraine|Ukrainian
+US|USA|United States;United States of America;America|American
+UY|URY|Uruguay|Uruguayan
+VE|VEN|Venezuela|Venezuelan
+VN|VNM|Vietnam;Viet Nam|Vietnamese
+ZA|ZAF|South Africa|South African
+"""
+
+# Named regions that tickets use instead of listing countries.
+# "Top 10 countries" follows the definition given to the linker and coordinator agents.
+TOP_10_COUNTRIES: FrozenSet[str] = frozenset({'US', 'IN', 'DE', 'GB', 'FR', 'IT', 'ES', 'CA', 'MX', 'BR'})
+
+REGIONS: Dict[str, FrozenSet[str]] = {
+    'top 10 countries': TOP_10_COUNTRIES,
+    'top10 countries': TOP_10_COUNTRIES,
+    'top10': TOP_10_COUNTRIES,
+    'benelux': frozenset({'BE', 'NL', 'LU'}),
+    'dach': frozenset({'DE', 'AT', 'CH'}),
+    'nordics': frozenset({'DK', 'FI', 'IS', 'NO', 'SE'}),
+    'nordic': frozenset({'DK', 'FI', 'IS', 'NO', 'SE'}),
+    'scandinavia': frozenset({'DK', 'NO', 'SE'}),
+    'baltics': frozenset({'EE', 'LT', 'LV'}),
+    'iberia': frozenset({'ES', 'PT'}),
+    'gcc': frozenset({'AE', 'BH', 'KW', 'OM', 'QA', 'SA'}),
+    'gulf states': frozenset({'AE', 'BH', 'KW', 'OM', 'QA', 'SA'}),
+    'latam': frozenset({'AR', 'BR', 'CL', 'CO', 'CR', 'DO', 'EC', 'MX', 'PA', 'PE', 'PR', 'UY', 'VE'}),
+    'latin america': frozenset({'AR', 'BR', 'CL', 'CO', 'CR', 'DO', 'EC', 'MX', 'PA', 'PE', 'PR', 'UY', 'VE'}),
+    'southeast asia': frozenset({'ID', 'MY', 'PH', 'SG', 'TH', 'VN'}),
+}
+
+# Codes that collide with this project's own vocabulary: "conf(BR):" marks BigRun
+# tickets, "PR" is a pull request, "ID" an identifier and "AND" shows up in SQL.
+# They are not matched when scanning text, but still resolve when given explicitly.
+# These countries are recognised in text through their other codes, names and demonyms.
+AMBIGUOUS_CODES: FrozenSet[str] = frozenset({'BR', 'PR', 'ID', 'AND'})
+
+# An all-caps line with at least this many words that are not country codes is
+# shouting, not listing codes
+ALL_CAPS_MIN_WORDS = 3
+_WORD_RE = re.compile(r'[^\W\d_]+')
+
+
+@dataclass(frozen=True)
+class Country:
+    """A single country with all the aliases that resolve to it."""
+    iso2: str
+    iso3: str
+    names: Tuple[str, ...]
+    demonyms: Tuple[str, ...] = ()
+
+    @property
+    def name(self) -> str:
+        """Primary English name of the country."""
+        return self.names[0]
+
+
+def _parse_country_table(table: str) -> List[Country]:
+    countries = []
+    for line in table.strip().splitlines():
+        iso2, iso3, names, demonyms = line.split('|')
+        countries.append(Country(
+            iso2=iso2,
+            iso3=iso3,
+            names=tuple(n for n in names.split(';') if n),
+            demonyms=tuple(d for d in demonyms.split(';') if d)
+        ))
+    return countries
+
+
+COUNTRIES: List[Country] = _parse_country_table(_COUNTRY_TABLE)
+
+
+def _normalize(alias: str) -> str:
+    return ' '.join(alias.lower().split())
+
+
+class CountryAliasIndex:
+    """
+    Resolves country aliases to ISO2 codes and scans free text for country mentions.
+
+    Codes (ISO2/ISO3) are matched case-sensitively in upper case so that words like
+    "in", "it" or "no" are not mistaken for India, Italy or Norway. For the same
+    reason codes are ignored in lines written entirely in capitals ("WE CAN FIX
+    THIS IS MD"), unless the other words there are codes too ("TH VN GR POI"). Names,
+    demonyms and regions are matched case-insensitively. All aliases are compiled
+    into one regular expression, so scanning a text is a single pass regardless of
+    how many aliases exist.
+    """
+
+    def __init__(self, countries: Iterable[Country] = None, regions: Dict[str, FrozenSet[str]] = None):
+        """
+        Initialize the index.
+
+        Args:
+            countries: Countries to index (defaults to the built-in table)
+            regions: Region name to ISO2 set mapping (defaults to the built-in regions)
+        """
+        self.countries: Dict[str, Country] = {c.iso2: c for c in (countries or COUNTRIES)}
+        self.regions: Dict[str, FrozenSet[str]] = {
+            _normalize(name): frozenset(codes) for name, codes in (REGIONS if regions is None else regions).items()
+        }
+
+        self._codes: Dict[str, str] = {}
+        self._words: Dict[str, str] = {}
+        for country in self.countries.values():
+            self._codes[country.iso2] = country.iso2
+            self._codes[country.iso3] = country.iso2
+            for alias in country.names + country.demonyms:
+                self._words[alias.lower()] = country.iso2
+
+        self._pattern = self._compile()
+
+    def _compile(self) -> re.Pattern:
+        def alternation(aliases: Iterable[str]) -> str:
+            # Longest first so "South Korea" wins over "Korea" and "top10 countries" over "top10"
+            ordered = sorted(set(aliases), key=len, reverse=True)
+            return '|'.join(re.escape(a).replace(r'\ ', r'\s+') for a in ordered)
+
+        return re.compile(
+            r'(?<![\w-])(?:'
+            rf'(?P<region>(?i:{alternation(self.regions)}))'
+            rf'|(?P<word>(?i:{alternation(self._words)}))'
+            rf'|(?P<code>{alternation(c for c in self._codes if c not in AMBIGUOUS_CODES)})'
+            r')(?![\w-])'
+        )
+
+    def resolve(self, alias: str) -> Optional[str]:
+        """
+        Resolve a single alias to its ISO2 code.
+
+        Args:
+            alias: ISO2/ISO3 code, country name or demonym (e.g. "THA", "Thai")
+
+        Returns:
+            Optional[str]: ISO2 code, or None if the alias is unknown
+        """
+        alias = alias.strip()
+        if alias.upper() in self._codes:
+            return self._codes[alias.upper()]
+        return self._words.get(_normalize(alias))
+
+    def find_mentions(self, text: str) -> List[Tuple[str, FrozenSet[str]]]:
+        """
+        Find every country or region mention in a text.
+
+        Args:
+            text: Free text to scan
+
+        Returns:
+            List[Tuple[str, FrozenSet[str]]]: (matched text, ISO2 codes it refers to) in order of appearance
+        """
+        return [(matched, codes) for _, matched, codes in self._scan(text)]
+
+    def _all_caps(self, line: str) -> bool:
+        """Whether a line is written in capitals, so upper-case words in it are not codes by intent."""
+        words = _WORD_RE.findall(line)
+        if any(not word.isupper() for word in words):
+            return False
+        return sum(word not in self._codes for word in words) >= ALL_CAPS_MIN_WORDS
+
+    def _scan(self, text: str):
+        text = text or ''
+        all_caps_lines: Dict[int, bool] = {}
+        for match in self._pattern.finditer(text):
+            matched = match.group(0)
+            if match.lastgroup == 'region':
+                yield 'region', matched, self.regions[_normalize(matched)]
+            elif match.lastgroup == 'word':
+                yield 'word', matched, frozenset({self._words[_normalize(matched)]})
+            else:
+                line_start = text.rfind('\n', 0, match.start()) + 1
+                if line_start not in all_caps_lines:
+                    line_end = text.find('\n', match.end())
+                    all_caps_lines[line_start] = self._all_caps(text[line_start:line_end if line_end != -1 else None])
+                if not all_caps_lines[line_start]:
+                    yield 'code', matched, frozenset({self._codes[matched]})
+
+    def find_countries(self, text: str, include_regions: bool = True) -> Set[str]:
+        """
+        Get the set of ISO2 codes mentioned in a text.
+
+        Args:
+            text: Free text to scan
+            include_regions: Expand region mentions such as "top 10 countries" or "Benelux"
+
+        Returns:
+            Set[str]: ISO2 codes mentioned in the text
+        """
+        countries = set()
+        for kind, _, codes in self._scan(text):
+            if include_regions or kind != 'region':
+                countries.update(codes)
+        return countries
+
+    def countries_for_ticket(self, title: str, description: str = "", include_regions: bool = True) -> Set[str]:
+        """
+        Get the set of countries a Jira ticket refers to.
+
+        Args:
+            title: Ticket title
+            description: Ticket description
+            include_regions: Expand region mentions such as "top 10 countries"
+
+        Returns:
+            Set[str]: ISO2 codes the ticket refers to
+        """
+        return self.find_countries(f"{title or ''}\n{description or ''}", include_regions)
+
+
+@lru_cache(maxsize=1)
+def get_country_index() -> CountryAliasIndex:
+    """Get the shared country alias index built from the built-in tables."""
+    return CountryAliasIndex()
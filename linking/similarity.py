@@ -0,0 +1,176 @@
+"""
+Pattern/Ticket Similarity Ranking
+
+This module contains a NumPy hashing-vectorizer TF-IDF scorer for fuzzy
+matching between metric patterns and Jira tickets, e.g. "GR (shop=supermarket,
+PAV, -228)" against a ticket about "Greece retail coverage".
+
+Patterns and tickets are turned into the same country/category/metric tokens
+the ticket index uses (plus word bigrams), hashed into a fixed-width feature
+space and compared with cosine similarity in a single batched matrix product.
+No external model or network access is needed.
+"""
+
+import zlib
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from .ticket_index import TITLE_BOOST, TOKEN_WEIGHTS, TicketIndex, tokenize
+
+
+class HashingVectorizer:
+    """
+    Hashes token lists into fixed-width vectors using the signed hashing trick.
+
+    CRC32 is used instead of Python's hash() so that vectors are stable across
+    processes.
+    """
+
+    def __init__(self, n_features: int = 2 ** 12):
+        """
+        Initialize the vectorizer.
+
+        Args:
+            n_features: Width of the hashed feature space
+        """
+        self.n_features = n_features
+
+    def transform(self, documents: Sequence[Iterable[Tuple[str, float]]]) -> np.ndarray:
+        """
+        Hash weighted token lists into a term-frequency matrix.
+
+        Args:
+            documents: One iterable of (token, weight) pairs per document
+
+        Returns:
+            np.ndarray: Matrix of shape (len(documents), n_features)
+        """
+        matrix = np.zeros((len(documents), self.n_features), dtype=np.float32)
+        for row, tokens in enumerate(documents):
+            for token, weight in tokens:
+                h = zlib.crc32(token.encode('utf-8'))
+                matrix[row, h % self.n_features] += weight if h & 0x80000000 else -weight
+        return matrix
+
+
+def _weighted(tokens: Iterable[str], scale: float = 1.0) -> List[Tuple[str, float]]:
+    return [(t, scale * TOKEN_WEIGHTS.get(t.split(':', 1)[0], 1.0)) for t in tokens]
+
+
+def _bigrams(text: str) -> List[str]:
+    words = tokenize(text)
+    return [f"bi:{a}_{b}" for a, b in zip(words, words[1:])]
+
+
+class SimilarityRanker:
+    """
+    Ranks an APR's tickets against metric patterns by TF-IDF cosine similarity.
+
+    The ticket matrix is built once per APR; scoring any number of patterns is
+    one matrix product.
+    """
+
+    def __init__(self, ticket_index: TicketIndex, n_features: int = 2 ** 12):
+        """
+        Initialize the ranker over the tickets of a ticket index.
+
+        Args:
+            ticket_index: Index holding the APR's tickets and token rules
+            n_features: Width of the hashed feature space
+        """
+        self.ticket_index = ticket_index
+        self.vectorizer = HashingVectorizer(n_features)
+        self.keys = list(ticket_index.tickets)
+
+        documents = [
+            _weighted(t.tokens) + _weighted(t.title_tokens, TITLE_BOOST - 1) + _weighted(_bigrams(f"{t.title}\n{t.description}"))
+            for t in ticket_index.tickets.values()
+        ]
+        counts = self.vectorizer.transform(documents)
+
+        # Smoothed IDF over the hashed features, as in scikit-learn's TfidfTransformer
+        document_frequency = np.count_nonzero(counts, axis=0)
+        self.idf = np.log((1 + len(documents)) / (1 + document_frequency)).astype(np.float32) + 1
+        self.matrix = self._normalize(counts * self.idf)
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return matrix / norms
+
+    def _pattern_tokens(self, pattern: str) -> List[Tuple[str, float]]:
+        tokens = set(self.ticket_index.pattern_tokens(pattern))
+        tokens.update(f"cat:{w}" for w in tokenize(pattern))
+        return _weighted(tokens) + _weighted(_bigrams(pattern))
+
+    def score(self, patterns: Sequence[str]) -> np.ndarray:
+        """
+        Compute cosine similarity between every pattern and every ticket.
+
+        Args:
+            patterns: Pattern texts
+
+        Returns:
+            np.ndarray: Scores of shape (len(patterns), number of tickets)
+        """
+        if not patterns or not self.keys:
+            return np.zeros((len(patterns), len(self.keys)), dtype=np.float32)
+        queries = self._normalize(self.vectorizer.transform([self._pattern_tokens(p) for p in patterns]) * self.idf)
+        return np.clip(queries @ self.matrix.T, 0, 1)
+
+    def top_k(self, patterns: Sequence[str], k: int = 5, min_score: float = 0.05) -> Dict[str, List[Tuple[str, float]]]:
+        """
+        Get the k most similar tickets for every pattern.
+
+        Args:
+            patterns: Pattern texts
+            k: Maximum number of tickets per pattern
+            min_score: Minimum cosine similarity for a ticket to be returned
+
+        Returns:
+            Dict[str, List[Tuple[str, float]]]: Pattern → (ticket key, score) pairs, best first
+        """
+        scores = self.score(patterns)
+        ranked = {}
+        for pattern, row in zip(patterns, scores):
+            best = np.argsort(-row, kind='stable')[:k]
+            ranked[pattern] = [(self.keys[i], round(float(row[i]), 3)) for i in best if row[i] >= min_score]
+        return ranked
+
+
+def merge_candidates(index_candidates: Dict[str, List[Tuple[str, float]]], ranker: SimilarityRanker,
+                     k: int = 3, limit: int = 8, min_score: float = 0.05) -> Dict[str, List[Tuple[str, float]]]:
+    """
+    Merge rule-based index candidates with the similarity top-k, scored by similarity.
+
+    Index candidates are always kept; the most similar tickets that also
+    satisfy the country rule (see TicketIndex.eligible) are added on top of
+    them up to the limit, so every candidate shares a country with its pattern
+    or is a BigRun ticket.
+
+    Args:
+        index_candidates: Pattern → candidates from the ticket index
+        ranker: Similarity ranker over the same tickets
+        k: Number of most similar eligible tickets to consider per pattern
+        limit: Maximum number of candidates per pattern
+        min_score: Minimum cosine similarity for a ticket to be added
+
+    Returns:
+        Dict[str, List[Tuple[str, float]]]: Pattern → (ticket key, similarity) pairs, best first
+    """
+    patterns = list(index_candidates)
+    scores = ranker.score(patterns)
+    column = {key: i for i, key in enumerate(ranker.keys)}
+
+    merged = {}
+    for pattern, row in zip(patterns, scores):
+        chosen = {key: round(float(row[column[key]]), 3) for key, _ in index_candidates[pattern]}
+        eligible = ranker.ticket_index.eligible(pattern)
+        for i in [i for i in np.argsort(-row, kind='stable') if ranker.keys[i] in eligible][:k]:
+            if len(chosen) >= limit or row[i] < min_score:
+                break
+            chosen.setdefault(ranker.keys[i], round(float(row[i]), 3))
+        merged[pattern] = sorted(chosen.items(), key=lambda item: (-item[1], item[0]))
+    return merged
@@ -0,0 +1,326 @@
+"""
+APR Ticket Index
+
+This module contains an in-memory inverted index over the Jira tickets of a
+single APR. It is built once per APR from ticket titles and descriptions and
+returns a short ranked candidate list for each metric pattern, so the linker
+and coordinator prompts only need to carry those candidates instead of every
+ticket.
+
+Index tokens come in three families:
+- country:XX   countries resolved through the country alias index
+- cat:<term>   category terms (words, definitiontag values and synonyms)
+- metric:XXX   metric vocabulary ("coverage" → PAV, "duplicates" → DUP, ...)
+"""
+
+import csv
+import math
+import os
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .countries import CountryAliasIndex, get_country_index
+
+
+# Words in ticket text that indicate which metric a change affects
+METRIC_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    'PAV': ('pav', 'coverage', 'completeness', 'availability', 'available', 'missing', 'added', 'loss'),
+    'PPA': ('ppa', 'accuracy', 'positional', 'positioning', 'position', 'coordinate', 'location', 'geocoding'),
+    'DUP': ('dup', 'duplicate', 'duplication', 'deduplication', 'dedup', 'merged', 'merge', 'conflation'),
+    'SUP': ('sup', 'superfluous', 'superfluousness', 'closed', 'obsolete'),
+}
+
+# Related terms for common categories, on top of the feature names in feature_rankings.csv
+CATEGORY_SYNONYMS: Dict[str, Tuple[str, ...]] = {
+    'supermarket': ('grocery', 'market', 'retail', 'food'),
+    'convenience': ('grocery', 'retail', 'shop'),
+    'grocery': ('supermarket', 'market', 'retail'),
+    'mall': ('retail', 'shopping'),
+    'department_store': ('retail', 'shopping'),
+    'pharmacy': ('chemist', 'drugstore', 'health'),
+    'hospital': ('health', 'healthcare', 'medical'),
+    'clinic': ('health', 'healthcare', 'medical'),
+    'fuel': ('petrol', 'gas', 'station'),
+    'fast_food': ('restaurant', 'food'),
+    'restaurant': ('food', 'dining'),
+    'cafe': ('coffee', 'food'),
+    'hotel': ('accommodation', 'lodging'),
+    'motel': ('accommodation', 'lodging'),
+    'parking': ('car', 'park'),
+    'bank': ('atm', 'financial'),
+    'atm': ('bank', 'cash'),
+    'school': ('education',),
+    'university': ('education', 'college'),
+    'theme_park': ('amusement', 'attraction'),
+    'national_park': ('nature', 'park'),
+}
+
+# Title terms that mark engineering work rather than data changes (never linked)
+INFRASTRUCTURE_TERMS: Tuple[str, ...] = (
+    'notebook', 'evaluation', 'infrastructure', 'structural issues', 'step back',
+    'clean', 'refactor', 'maintenance', 'pipeline', 'code quality'
+)
+
+# Tickets with this marker in the title are BigRun changes that affect every pattern
+BIGRUN_MARKER = 'conf(br):'
+
+TOKEN_WEIGHTS: Dict[str, float] = {'country': 3.0, 'cat': 2.0, 'metric': 1.0}
+
+# Titles name what a ticket is about; descriptions often mention everything in passing
+TITLE_BOOST = 1.5
+
+_STOPWORDS = frozenset(
+    'a an and are as at be by for from has have in into is it its of on or that the this to was were '
+    'will with new fix add update updated change changes issue issues data poi pois mpoi'.split()
+)
+_WORD_RE = re.compile(r'[a-z][a-z0-9]+')
+_DEFINITIONTAG_RE = re.compile(r'\b([a-z_]+)=([a-z0-9_;:]+)')
+_METRIC_RE = re.compile(r'\b(PAV|PPA|DUP|SUP)\b')
+_PATTERN_LINE_RE = re.compile(r'[a-z_]+=[a-z0-9_;:]+\s*,\s*(PAV|PPA|DUP|SUP)\b')
+
+
+def _singular(word: str) -> str:
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split free text into normalized content words.
+
+    Args:
+        text: Free text
+
+    Returns:
+        List[str]: Lower-cased, singularized words without stopwords
+    """
+    words = (_singular(w) for w in _WORD_RE.findall((text or '').lower()))
+    return [w for w in words if w not in _STOPWORDS]
+
+
+@lru_cache(maxsize=1)
+def _feature_names() -> Dict[str, Tuple[str, ...]]:
+    """Map definitiontag → words of its feature name from feature_rankings.csv, if available."""
+    for path in ("feature_rankings.csv", "data/feature_rankings.csv", "../feature_rankings.csv"):
+        if os.path.exists(path):
+            with open(path, newline='', encoding='utf-8') as f:
+                return {
+                    row['definitiontag']: tuple(tokenize(row['featurename']))
+                    for row in csv.DictReader(f)
+                    if row.get('definitiontag') and row.get('featurename')
+                }
+    return {}
+
+
+def category_terms(definitiontag: str) -> Set[str]:
+    """
+    Get the words a ticket might use for the category of a definitiontag.
+
+    Args:
+        definitiontag: Complete category identifier (e.g. "shop=supermarket")
+
+    Returns:
+        Set[str]: Category value words, synonyms and feature name words
+    """
+    _, _, value = definitiontag.partition('=')
+    terms = set(tokenize(value.replace('_', ' ')))
+    terms.update(tokenize(' '.join(CATEGORY_SYNONYMS.get(value, ()))))
+    terms.update(_feature_names().get(definitiontag, ()))
+    return terms
+
+
+def extract_patterns(agent_output: str) -> List[str]:
+    """
+    Extract individual pattern lines from a metric agent's free-text report.
+
+    A pattern line is any line that contains at least one metric in the
+    "Country (definitiontag, METRIC, value...)" format.
+
+    Args:
+        agent_output: Report text from a metric agent
+
+    Returns:
+        List[str]: Pattern lines with bullet markers stripped
+    """
+    patterns = []
+    for line in (agent_output or '').splitlines():
+        if _PATTERN_LINE_RE.search(line):
+            patterns.append(line.strip().lstrip('-*•').strip())
+    return patterns
+
+
+@dataclass
+class Ticket:
+    """A Jira ticket with its indexed representation."""
+    key: str
+    title: str
+    description: str = ""
+    countries: Set[str] = field(default_factory=set)
+    tokens: Set[str] = field(default_factory=set)
+    title_tokens: Set[str] = field(default_factory=set)
+
+    @property
+    def is_bigrun(self) -> bool:
+        """Whether the ticket is a BigRun change that affects every pattern."""
+        return BIGRUN_MARKER in self.title.lower()
+
+    @property
+    def is_infrastructure(self) -> bool:
+        """Whether the ticket title marks it as engineering work rather than a data change."""
+        title = self.title.lower()
+        return any(term in title for term in INFRASTRUCTURE_TERMS)
+
+
+class TicketIndex:
+    """
+    Inverted index from country, category and metric tokens to APR tickets.
+
+    Candidates for a pattern must share at least one country with it (BigRun
+    tickets always qualify). They are ranked by the IDF-weighted sum of the
+    tokens they share with the pattern, with countries weighted above
+    categories and categories above metric vocabulary, and tokens found in
+    the title weighted above those only found in the description.
+    """
+
+    def __init__(self, tickets: Iterable[Ticket] = (), country_index: Optional[CountryAliasIndex] = None):
+        """
+        Initialize the index.
+
+        Args:
+            tickets: Tickets to index
+            country_index: Country alias index (defaults to the shared built-in index)
+        """
+        self.country_index = country_index or get_country_index()
+        self.tickets: Dict[str, Ticket] = {}
+        self.postings: Dict[str, Set[str]] = defaultdict(set)
+        self.bigrun_keys: Set[str] = set()
+        for ticket in tickets:
+            self.add(ticket)
+
+    @classmethod
+    def from_texts(cls, tickets: Dict[str, Tuple[str, str]], **kwargs) -> 'TicketIndex':
+        """
+        Build an index from raw ticket texts.
+
+        Args:
+            tickets: Ticket key → (title, description)
+
+        Returns:
+            TicketIndex: Index over the given tickets
+        """
+        return cls((Ticket(key, title or "", description or "") for key, (title, description) in tickets.items()), **kwargs)
+
+    def ticket_tokens(self, title: str, description: str) -> Set[str]:
+        """Get the index tokens for a ticket's title and description."""
+        text = f"{title}\n{description}"
+        words = set(tokenize(text))
+        tokens = {f"country:{c}" for c in self.country_index.countries_for_ticket(title, description)}
+        tokens.update(f"cat:{w}" for w in words)
+        tokens.update(
+            f"metric:{metric}" for metric, keywords in METRIC_KEYWORDS.items()
+            if words.intersection(_singular(k) for k in keywords)
+        )
+        return tokens
+
+    def pattern_tokens(self, pattern: str) -> Set[str]:
+        """Get the query tokens for a metric pattern."""
+        tokens = {f"country:{c}" for c in self.country_index.find_countries(pattern)}
+        for group, value in _DEFINITIONTAG_RE.findall(pattern):
+            tokens.update(f"cat:{t}" for t in category_terms(f"{group}={value}"))
+        tokens.update(f"metric:{m}" for m in _METRIC_RE.findall(pattern))
+        return tokens
+
+    def add(self, ticket: Ticket):
+        """Add a ticket to the index."""
+        ticket.countries = self.country_index.countries_for_ticket(ticket.title, ticket.description)
+        ticket.tokens = self.ticket_tokens(ticket.title, ticket.description)
+        ticket.title_tokens = self.ticket_tokens(ticket.title, "")
+        self.tickets[ticket.key] = ticket
+        if ticket.is_bigrun:
+            self.bigrun_keys.add(ticket.key)
+        for token in ticket.tokens:
+            self.postings[token].add(ticket.key)
+
+    def _idf(self, token: str) -> float:
+        return math.log(1 + len(self.tickets) / (1 + len(self.postings.get(token, ()))))
+
+    def candidates(self, pattern: str, limit: int = 5, include_infrastructure: bool = False) -> List[Tuple[str, float]]:
+        """
+        Rank the tickets that could explain a pattern.
+
+        Args:
+            pattern: Pattern text, e.g. "GR (shop=supermarket, PAV, -228)"
+            limit: Maximum number of candidates to return
+            include_infrastructure: Keep notebook/refactor/pipeline tickets that the linking rules reject
+
+        Returns:
+            List[Tuple[str, float]]: (ticket key, score) pairs, best first
+        """
+        query = self.pattern_tokens(pattern)
+        scores: Dict[str, float] = defaultdict(float)
+        for token in query:
+            weight = TOKEN_WEIGHTS[token.split(':', 1)[0]] * self._idf(token)
+            for key in self.postings.get(token, ()):
+                scores[key] += weight * (TITLE_BOOST if token in self.tickets[key].title_tokens else 1.0)
+
+        ranked = [(key, round(scores.get(key, 0.0), 3)) for key in self.eligible(pattern, include_infrastructure)]
+        ranked.sort(key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+    def eligible(self, pattern: str, include_infrastructure: bool = False) -> Set[str]:
+        """
+        Get the tickets that satisfy the country rule for a pattern.
+
+        Args:
+            pattern: Pattern text
+            include_infrastructure: Keep notebook/refactor/pipeline tickets that the linking rules reject
+
+        Returns:
+            Set[str]: Keys of the BigRun tickets and the tickets sharing a country with the pattern
+        """
+        eligible = set(self.bigrun_keys)
+        for token in self.pattern_tokens(pattern):
+            if token.startswith('country:'):
+                eligible.update(self.postings.get(token, ()))
+        return {key for key in eligible if include_infrastructure or not self.tickets[key].is_infrastructure}
+
+    def candidates_for_patterns(self, patterns: Iterable[str], limit: int = 5) -> Dict[str, List[Tuple[str, float]]]:
+        """Rank candidate tickets for every pattern."""
+        return {pattern: self.candidates(pattern, limit) for pattern in patterns}
+
+    def format_candidates(self, candidates: Dict[str, List[Tuple[str, float]]], description_chars: int = 300) -> str:
+        """
+        Render candidate lists as a compact prompt block.
+
+        Only tickets that are a candidate for at least one pattern are described.
+
+        Args:
+            candidates: Pattern → ranked (ticket key, score) pairs
+            description_chars: Maximum description length per ticket
+
+        Returns:
+            str: Prompt block with per-pattern candidates followed by the candidate tickets
+        """
+        lines = ["CANDIDATE TICKETS PER PATTERN (pre-filtered locally by country, category and metric, with match scores in brackets):"]
+        used = []
+        for pattern, ranked in candidates.items():
+            keys = ", ".join(f"{key} ({score})" for key, score in ranked) or "None"
+            lines.append(f"- {pattern}\n  Candidates: {keys}")
+            used.extend(key for key, _ in ranked if key not in used)
+
+        lines.append("\nCANDIDATE TICKET DETAILS:")
+        for key in used:
+            ticket = self.tickets[key]
+            description = " ".join(ticket.description.split()) or "No description found"
+            if len(description) > description_chars:
+                description = description[:description_chars].rstrip() + "…"
+            lines.append(f"- {key}: {ticket.title}\n  {description}")
+        if not used:
+            lines.append("- None")
+        return "\n".join(lines)
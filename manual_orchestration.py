@@ -5,22 +5,37 @@ APR Analysis System - Command Line Tool
 Simple CLI tool for analyzing APRs using multi-agent system.
 
 Usage:
-    python manual_orchestration.py <apr_number>
+    python manual_orchestration.py <apr_number> [<apr_number> ...] [--jobs N] [--stream] [--fresh-agents]
+                                   [--metrics ...] [--publish] [--resume] [--no-cache] [--time-budget SECONDS]
+                                   [--hedge [PERCENTILE]] [--model AGENT=DEPLOYMENT ...] [--shard-threshold ROWS]
+                                   [--trace ...]
     
 Examples:
     python manual_orchestration.py 123
     python manual_orchestration.py APR-456
+    python manual_orchestration.py --apr 110 119 121 --jobs 3
+    python manual_orchestration.py 110-115 --jobs 2
+    python manual_orchestration.py 123 --stream
+    python manual_orchestration.py 123 --metrics pav ppa sup dup --publish
+    python manual_orchestration.py 123 --trace json
+    python manual_orchestration.py 123 --model metrics=gpt-4o-mini jira_linker=gpt-4o-mini
 """
 
 import os
 import sys
 import argparse
+from typing import Dict, List, Optional
 from azure.ai.projects import AIProjectClient
 from azure.identity import DefaultAzureCredential
 from dotenv import load_dotenv
 
 # Import new modular components
-from orchestrator.orchestrator import APROrchestrator
+from agents import parse_deployment_routes, resolve_model_deployments
+from orchestrator.hedging import DEFAULT_HEDGE_PERCENTILE
+from orchestrator.orchestrator import APROrchestrator, DEFAULT_METRIC_AGENTS, METRIC_AGENT_FACTORIES
+from orchestrator.sharding import SHARD_ROW_THRESHOLD
+from orchestrator.streaming import print_stream_event
+from orchestrator.telemetry import DEFAULT_TRACE_FILE, TRACE_EXPORTERS, configure_tracing
 from agent_tools import (
     get_jira_ticket_description, get_pull_request_body,
     get_control_plan_metrics_from_pr_comment, get_jira_ticket_title, 
@@ -42,17 +57,57 @@ def format_apr_number(apr_input: str) -> str:
     return apr_input
 
 
-def analyze_apr(apr_number: str) -> int:
+def parse_apr_numbers(values: List[str]) -> List[str]:
     """
-    Analyze a single APR and return exit code.
+    Expand APR arguments into a de-duplicated list of APR numbers.
+    
+    Accepts single numbers (123, APR-123), comma-separated lists (110,119)
+    and inclusive ranges (110-115, APR-110-115).
+    """
+    apr_numbers = []
+    for value in values:
+        for part in filter(None, value.split(',')):
+            part = format_apr_number(part.strip())
+            if '-' in part:
+                start, end = part.split('-', 1)
+                if not (start.isdigit() and end.isdigit()) or int(start) > int(end):
+                    raise ValueError(f"Invalid APR range: {part}")
+                numbers = [str(n) for n in range(int(start), int(end) + 1)]
+            else:
+                numbers = [part]
+            apr_numbers.extend(n for n in numbers if n not in apr_numbers)
+    return apr_numbers
+
+
+def analyze_aprs(apr_numbers: List[str], jobs: int = 1, stream: bool = False, fresh_agents: bool = False,
+                 metric_agents=DEFAULT_METRIC_AGENTS, publish: bool = False, resume: bool = False,
+                 use_cache: bool = True, time_budget: Optional[float] = None,
+                 hedge_percentile: Optional[float] = None, model_routes: Optional[Dict[str, str]] = None,
+                 shard_threshold: Optional[int] = SHARD_ROW_THRESHOLD) -> int:
+    """
+    Analyze one or more APRs and return exit code.
+    
+    All APRs share one project client, one deployed agent set and one tool cache.
     
     Args:
-        apr_number: APR number to analyze
+        apr_numbers: APR numbers to analyze
+        jobs: Maximum number of APRs analyzed concurrently
+        stream: Stream agent output and tool calls to the console as they happen
+        fresh_agents: Create new agents and delete them afterwards instead of reusing deployed ones
+        metric_agents: Metric agents to run concurrently
+        publish: Publish the final report to Confluence
+        resume: Skip stages completed by an earlier run of this APR
+        use_cache: Serve agent stage outputs cached by earlier runs on unchanged inputs
+        time_budget: Seconds each APR analysis may take before a partial report is returned
+        hedge_percentile: Latency percentile after which a straggling metric run is hedged with a duplicate
+        model_routes: Model deployment per agent type or "metrics", over the MODEL_DEPLOYMENT_NAME_<AGENT>
+            environment variables
+        shard_threshold: Metric results with more rows than this are analyzed in parallel shards (None disables)
         
     Returns:
-        int: 0 for success, 1 for error
+        int: 0 if every APR was analyzed successfully, 1 otherwise (including partial reports)
     """
-    print(f"🎯 Analyzing APR {apr_number}")
+    print(f"🎯 Analyzing APR {', '.join(apr_numbers)}")
     print("=" * 50)
     
     # Initialize Azure AI Project client
@@ -85,17 +140,36 @@ def analyze_apr(apr_number: str) -> int:
             return 1
         
         # Create the orchestrator
-        orchestrator = APROrchestrator(agents_client, model_deployment_name)
+        orchestrator = APROrchestrator(
+            agents_client, model_deployment_name,
+            stream_callback=print_stream_event if stream else None,
+            reuse_agents=not fresh_agents,
+            metric_agents=metric_agents,
+            use_stage_cache=use_cache,
+            time_budget=time_budget,
+            hedge_percentile=hedge_percentile,
+            model_deployments=resolve_model_deployments(model_deployment_name, model_routes),
+            shard_threshold=shard_threshold
+        )
         
         try:
             # Deploy agents
             orchestrator.create_agents()
             
             # Run analysis
-            final_report = orchestrator.analyze_apr(apr_number)
+            if len(apr_numbers) == 1:
+                reports = {apr_numbers[0]: orchestrator.analyze_apr(apr_numbers[0], publish=publish, resume=resume)}
+            else:
+                reports = orchestrator.analyze_aprs(apr_numbers, jobs=jobs, publish=publish, resume=resume)
             
             # Display results
-            print(final_report)
+            for apr_number, final_report in reports.items():
+                if len(reports) > 1:
+                    print(f"\n📄 APR {apr_number}\n" + "=" * 50)
+                print(final_report)
+            
+            if any(report.startswith(("❌", "⚠️ PARTIAL")) for report in reports.values()):
+                return 1
             
         except KeyboardInterrupt:
             print("\n👋 Analysis interrupted by user")
@@ -110,6 +184,20 @@ def analyze_apr(apr_number: str) -> int:
     return 0
 
 
+def analyze_apr(apr_number: str, **options) -> int:
+    """
+    Analyze a single APR and return exit code.
+    
+    Args:
+        apr_number: APR number to analyze
+        **options: Options of analyze_aprs
+        
+    Returns:
+        int: 0 for success, 1 for error
+    """
+    return analyze_aprs([apr_number], **options)
+
+
 def main():
     """Main entry point for CLI tool."""
     parser = argparse.ArgumentParser(
@@ -120,12 +208,120 @@ Examples:
   %(prog)s 123          # Analyze APR 123
   %(prog)s APR-456      # Analyze APR 456
   %(prog)s 789          # Analyze APR 789
+  %(prog)s 123 --stream # Analyze APR 123, streaming agent output live
+  %(prog)s --apr 110 119 121 --jobs 3  # Analyze three APRs, all at once
+  %(prog)s 110-115 --jobs 2            # Analyze APRs 110 to 115, two at a time
+  %(prog)s 123 --trace json            # Analyze APR 123, writing spans to .apr_runs/traces.jsonl
+  %(prog)s 110-130 --jobs 4 --hedge    # Batch run, hedging metric runs slower than their p90
+  %(prog)s 123 --model metrics=gpt-4o-mini  # Metric agents on a smaller deployment
         """
     )
     
     parser.add_argument(
-        'apr_number',
-        help='APR number to analyze (with or without APR- prefix)'
+        'apr_numbers',
+        nargs='*',
+        help='APR numbers or ranges to analyze (with or without APR- prefix, e.g. 121 or 110-115)'
+    )
+    
+    parser.add_argument(
+        '--apr',
+        nargs='+',
+        default=[],
+        help='Additional APR numbers or ranges to analyze'
+    )
+    
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='Maximum number of APRs analyzed concurrently (default: %(default)s)'
+    )
+    
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Stream agent responses and tool calls to the console as they are generated'
+    )
+    
+    parser.add_argument(
+        '--fresh-agents',
+        action='store_true',
+        help='Create new agents for this run and delete them afterwards instead of reusing deployed agents'
+    )
+    
+    parser.add_argument(
+        '--metrics',
+        nargs='+',
+        choices=list(METRIC_AGENT_FACTORIES),
+        default=list(DEFAULT_METRIC_AGENTS),
+        help='Metric agents to run concurrently (default: %(default)s)'
+    )
+    
+    parser.add_argument(
+        '--publish',
+        action='store_true',
+        help='Publish the final report to Confluence'
+    )
+    
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Resume a failed or interrupted run, skipping stages whose checkpoints are still valid'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Re-run every agent stage instead of serving outputs cached on unchanged inputs'
+    )
+    
+    parser.add_argument(
+        '--time-budget',
+        type=float,
+        metavar='SECONDS',
+        help='Stop each APR analysis after this many seconds, cancelling running agents and SQL statements '
+             'and printing a partial report of the completed stages'
+    )
+    
+    parser.add_argument(
+        '--hedge',
+        nargs='?',
+        type=float,
+        const=DEFAULT_HEDGE_PERCENTILE,
+        metavar='PERCENTILE',
+        help='Start a duplicate run of a metric agent that is slower than this percentile of its past runs '
+             '(default percentile: %(const)s), keep the first to finish and cancel the other'
+    )
+    
+    parser.add_argument(
+        '--model',
+        nargs='+',
+        default=[],
+        metavar='AGENT=DEPLOYMENT',
+        help='Run an agent type (pav, ppa, sup, dup, jira_linker, coordinator, or metrics for all metric agents) '
+             'on another model deployment than MODEL_DEPLOYMENT_NAME, e.g. metrics=gpt-4o-mini; '
+             'overrides MODEL_DEPLOYMENT_NAME_<AGENT>'
+    )
+    
+    parser.add_argument(
+        '--shard-threshold',
+        type=int,
+        default=SHARD_ROW_THRESHOLD,
+        metavar='ROWS',
+        help='Split metric results with more rows than this by definitiontag group into parallel agent runs '
+             'and merge their patterns; 0 disables sharding (default: %(default)s)'
+    )
+    
+    parser.add_argument(
+        '--trace',
+        choices=TRACE_EXPORTERS,
+        help='Trace stages, agent runs, tool calls and SQL statements with OpenTelemetry and export the spans'
+    )
+    
+    parser.add_argument(
+        '--trace-file',
+        default=DEFAULT_TRACE_FILE,
+        help='Output file of --trace json (default: %(default)s)'
     )
     
     parser.add_argument(
@@ -141,9 +337,30 @@ Examples:
         
     args = parser.parse_args()
     
-    # Format and analyze APR
-    formatted_apr = format_apr_number(args.apr_number)
-    exit_code = analyze_apr(formatted_apr)
+    # Format and analyze APRs
+    try:
+        apr_numbers = parse_apr_numbers(args.apr_numbers + args.apr)
+    except ValueError as e:
+        parser.error(str(e))
+    if not apr_numbers:
+        parser.error("at least one APR number is required")
+    try:
+        model_routes = parse_deployment_routes(args.model)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    if args.trace:
+        try:
+            configure_tracing(args.trace, args.trace_file)
+        except RuntimeError as e:
+            parser.error(str(e))
+    
+    exit_code = analyze_aprs(
+        apr_numbers, jobs=args.jobs, stream=args.stream, fresh_agents=args.fresh_agents,
+        metric_agents=args.metrics, publish=args.publish, resume=args.resume,
+        use_cache=not args.no_cache, time_budget=args.time_budget, hedge_percentile=args.hedge,
+        model_routes=model_routes, shard_threshold=args.shard_threshold or None
+    )
     
     return exit_code
 
@@ -5,4 +5,4 @@ This package contains the orchestration logic for coordinating
 agents and managing the APR analysis workflow.
 """
 
-__all__ = ['orchestrator', 'policies']
\ No newline at end of file
+__all__ = ['orchestrator', 'accounting', 'agent_registry', 'checkpoints', 'hedging', 'metric_rows', 'pipeline', 'policies', 'prefetch', 'sharding', 'stage_cache', 'streaming', 'structured_output', 'telemetry', 'tool_cache', 'tool_executor']
\ No newline at end of file
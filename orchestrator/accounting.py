@@ -0,0 +1,252 @@
+"""
+Stage Accounting
+
+This module contains the per-stage ledger of what an APR analysis costs:
+prompt and completion tokens (from run.usage), model steps (from the run
+steps), model time versus tool time, tool call counts and retries. It is the
+baseline to measure every optimization of the pipeline against.
+
+The stage being accounted is held in a context variable, so tool calls made by
+the SDK, the tool executor or the orchestrator itself are charged to the stage
+that caused them without passing the ledger around. The agent run waiting on
+them is held the same way, so concurrent runs of one stage (hedges, shards)
+each subtract only their own tool time from their model time.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from orchestrator.checkpoints import DEFAULT_RUN_DIR
+
+
+@dataclass
+class StageAccount:
+    """Costs of one stage of one APR analysis."""
+    stage: str
+    source: str = "run"
+    agent_runs: int = 0
+    retries: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    model_steps: int = 0
+    model_seconds: float = 0.0
+    tool_seconds: float = 0.0
+    tool_calls: Dict[str, int] = field(default_factory=dict)
+    cached_tool_calls: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record_tool(self, name: str, seconds: float, cached: bool):
+        """Charge a tool call to the stage."""
+        with self._lock:
+            self.tool_calls[name] = self.tool_calls.get(name, 0) + 1
+            self.tool_seconds += seconds
+            self.cached_tool_calls += int(cached)
+
+    def record_run(self, run: Any, seconds: float, tool_seconds: float, steps: Optional[list] = None):
+        """
+        Charge an agent run to the stage.
+
+        Args:
+            run: Finished ThreadRun
+            seconds: Wall-clock time of the run
+            tool_seconds: Time spent executing tools during the run; the rest is model time
+            steps: Run steps of the run, if they could be listed
+        """
+        usage = getattr(run, 'usage', None)
+        if usage is None and steps:
+            # Some runs only report usage per step
+            usage_parts = [step.usage for step in steps if getattr(step, 'usage', None)]
+            prompt = sum(part.prompt_tokens for part in usage_parts)
+            completion = sum(part.completion_tokens for part in usage_parts)
+        else:
+            prompt = getattr(usage, 'prompt_tokens', 0) or 0
+            completion = getattr(usage, 'completion_tokens', 0) or 0
+        with self._lock:
+            self.agent_runs += 1
+            self.prompt_tokens += prompt
+            self.completion_tokens += completion
+            self.total_tokens += prompt + completion
+            self.model_steps += len(steps or [])
+            self.model_seconds += max(0.0, seconds - tool_seconds)
+
+    def record_retry(self):
+        """Count a retried attempt of the stage."""
+        with self._lock:
+            self.retries += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable summary of the stage."""
+        with self._lock:
+            return {
+                'stage': self.stage,
+                'source': self.source,
+                'agent_runs': self.agent_runs,
+                'retries': self.retries,
+                'prompt_tokens': self.prompt_tokens,
+                'completion_tokens': self.completion_tokens,
+                'total_tokens': self.total_tokens,
+                'model_steps': self.model_steps,
+                'model_seconds': round(self.model_seconds, 3),
+                'tool_seconds': round(self.tool_seconds, 3),
+                'tool_calls': dict(sorted(self.tool_calls.items())),
+                'cached_tool_calls': self.cached_tool_calls,
+            }
+
+
+@dataclass
+class RunTools:
+    """Tool calls made on behalf of one agent run."""
+    intervals: List[Tuple[float, float]] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, seconds: float):
+        """Record a tool call that just finished after the given time."""
+        ended = time.monotonic()
+        with self._lock:
+            self.intervals.append((ended - seconds, ended))
+
+    @property
+    def seconds(self) -> float:
+        """Time the run waited on tools (concurrent calls of one model step count once)."""
+        with self._lock:
+            intervals = sorted(self.intervals)
+        total, reached = 0.0, None
+        for start, end in intervals:
+            if reached is None or start > reached:
+                total += end - start
+                reached = end
+            elif end > reached:
+                total += end - reached
+                reached = end
+        return total
+
+
+_current_stage: ContextVar[Optional[StageAccount]] = ContextVar("stage_account", default=None)
+_current_run: ContextVar[Optional[RunTools]] = ContextVar("run_tools", default=None)
+
+
+def current_stage() -> Optional[StageAccount]:
+    """Get the account of the stage running in this context, if any."""
+    return _current_stage.get()
+
+
+def current_run() -> Optional[RunTools]:
+    """Get the tool calls of the agent run in this context, if any."""
+    return _current_run.get()
+
+
+@contextmanager
+def run_scope() -> Iterator[RunTools]:
+    """Collect the tool calls made inside the block (one agent run), including work submitted from it."""
+    tools = RunTools()
+    token = _current_run.set(tools)
+    try:
+        yield tools
+    finally:
+        _current_run.reset(token)
+
+
+def record_tool(name: str, seconds: float, cached: bool = False):
+    """Charge a tool call to the stage and agent run in this context (no-op outside them)."""
+    account = _current_stage.get()
+    if account is not None:
+        account.record_tool(name, seconds, cached)
+    run = _current_run.get()
+    if run is not None:
+        run.record(seconds)
+
+
+def record_retry():
+    """Count a retry for the stage running in this context (no-op outside a stage)."""
+    account = _current_stage.get()
+    if account is not None:
+        account.record_retry()
+
+
+class Accounting:
+    """Stage accounts of every APR analyzed by an orchestrator."""
+
+    def __init__(self, run_dir: str = DEFAULT_RUN_DIR):
+        """
+        Initialize the ledger.
+
+        Args:
+            run_dir: Directory the JSON summaries are written to (next to the checkpoints)
+        """
+        self.run_dir = Path(run_dir)
+        self._accounts: Dict[str, Dict[str, StageAccount]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, apr_number: str, name: str) -> Iterator[StageAccount]:
+        """
+        Account everything done inside the block to a stage.
+
+        Args:
+            apr_number: APR number
+            name: Stage name
+
+        Yields:
+            StageAccount: The stage's account
+        """
+        with self._lock:
+            account = self._accounts.setdefault(apr_number, {}).setdefault(name, StageAccount(name))
+        token = _current_stage.set(account)
+        try:
+            yield account
+        finally:
+            _current_stage.reset(token)
+
+    def clear(self, apr_number: str):
+        """Drop the accounts of an APR (start of a new analysis)."""
+        with self._lock:
+            self._accounts.pop(apr_number, None)
+
+    def summary(self, apr_number: str) -> Dict[str, Any]:
+        """
+        Get the JSON summary of an APR analysis.
+
+        Returns:
+            Dict[str, Any]: Per-stage accounts and their totals
+        """
+        with self._lock:
+            stages = [account.to_dict() for account in self._accounts.get(apr_number, {}).values()]
+        totals = {
+            key: round(sum(stage[key] for stage in stages), 3)
+            for key in ('agent_runs', 'retries', 'prompt_tokens', 'completion_tokens', 'total_tokens',
+                        'model_steps', 'model_seconds', 'tool_seconds', 'cached_tool_calls')
+        }
+        totals['tool_calls'] = sum(sum(stage['tool_calls'].values()) for stage in stages)
+        return {'apr_number': apr_number, 'stages': stages, 'totals': totals}
+
+    def save(self, apr_number: str) -> Path:
+        """Write the JSON summary of an APR to run_dir/apr-<number>/accounting.json."""
+        path = self.run_dir / f"apr-{apr_number}" / "accounting.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(apr_number), f, indent=2)
+        return path
+
+    def report(self, apr_number: str) -> str:
+        """Render the per-stage accounts for the console."""
+        summary = self.summary(apr_number)
+        lines = ["📊 Stage accounting:"]
+        for stage in summary['stages'] + [dict(summary['totals'], stage='total', source='run')]:
+            if stage['source'] != 'run':
+                lines.append(f"   {stage['stage']}: served from {stage['source']}")
+                continue
+            tool_calls = stage['tool_calls'] if isinstance(stage['tool_calls'], int) else sum(stage['tool_calls'].values())
+            lines.append(
+                f"   {stage['stage']}: {stage['agent_runs']} runs, {stage['retries']} retries, "
+                f"{stage['total_tokens']:,} tokens ({stage['prompt_tokens']:,} prompt / "
+                f"{stage['completion_tokens']:,} completion), model {stage['model_seconds']:.1f}s, "
+                f"tools {stage['tool_seconds']:.1f}s ({tool_calls} calls, {stage['cached_tool_calls']} cached)"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,91 @@
+"""
+Persistent Agent Registry
+
+This module contains the registry that lets the orchestrator reuse agents
+deployed by earlier runs instead of creating and deleting all five agents on
+every invocation. Each agent's configuration (name, instructions, model, tool
+schemas and sampling settings) is hashed and the hash is stored in the
+deployed agent's metadata; an agent with a matching hash is reused as-is, a
+stale one is updated in place and a missing one is created. Deployments are
+keyed on agent name and model, so runs routing an agent to different models
+(e.g. a benchmark next to a regular analysis) each keep their own agent
+instead of overwriting each other's.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Tuple
+
+from agent import Agent
+
+CONFIG_HASH_KEY = "config_hash"
+
+
+def config_hash(params: Dict[str, Any]) -> str:
+    """
+    Hash the create parameters of an agent.
+
+    Tool definitions are sorted by name because Agent keeps its functions in a
+    set, whose order differs between processes.
+
+    Args:
+        params: Parameters from Agent.to_create_params()
+
+    Returns:
+        str: Stable hex digest of the configuration
+    """
+    canonical = {key: value for key, value in params.items() if key != 'tools'}
+    tools = [tool.as_dict() if hasattr(tool, 'as_dict') else tool for tool in params.get('tools', [])]
+    canonical['tools'] = sorted(tools, key=lambda tool: json.dumps(tool, sort_keys=True))
+    digest = hashlib.sha256(json.dumps(canonical, sort_keys=True, default=str).encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+class AgentRegistry:
+    """Finds, updates or creates deployed agents matching local Agent configurations."""
+
+    def __init__(self, agents_client):
+        """
+        Initialize the registry.
+
+        Args:
+            agents_client: Azure AI agents client
+        """
+        self.agents_client = agents_client
+        self._deployed: Dict[Tuple[str, str], List[Any]] = {}
+
+    def refresh(self):
+        """List the deployed agents once, grouped by name and model."""
+        self._deployed = {}
+        for deployed in self.agents_client.list_agents():
+            self._deployed.setdefault((deployed.name, deployed.model), []).append(deployed)
+
+    def ensure(self, agent: Agent) -> Tuple[Any, str]:
+        """
+        Get a deployed agent for a configuration, deploying it only if needed.
+
+        Args:
+            agent: Local agent configuration
+
+        Returns:
+            Tuple[Any, str]: Deployed agent and the action taken ("reused", "updated" or "created")
+        """
+        params = agent.to_create_params()
+        digest = config_hash(params)
+        # Agent metadata values must be strings
+        params['metadata'] = {**{key: str(value) for key, value in agent.metadata.items()}, CONFIG_HASH_KEY: digest}
+
+        key = (agent.name, agent.model)
+        candidates = self._deployed.get(key, [])
+        for deployed in candidates:
+            if (deployed.metadata or {}).get(CONFIG_HASH_KEY) == digest:
+                return deployed, "reused"
+
+        if candidates:
+            deployed = self.agents_client.update_agent(candidates[0].id, **params)
+            self._deployed[key] = [deployed] + candidates[1:]
+            return deployed, "updated"
+
+        deployed = self.agents_client.create_agent(**params)
+        self._deployed[key] = [deployed]
+        return deployed, "created"
@@ -0,0 +1,95 @@
+"""
+Stage Checkpoints
+
+This module contains the local store that persists every stage output of an
+APR analysis, so that a run that failed late (e.g. in the coordinator after
+all metric agents and the linker succeeded) can be resumed without redoing
+the completed stages.
+
+Outputs are written to a run directory (.apr_runs/ by default) keyed by APR
+number, stage name and a fingerprint of the stage's inputs: the agent
+configuration and the outputs of the stages it depends on. A changed input
+therefore never resumes from a stale checkpoint.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+DEFAULT_RUN_DIR = ".apr_runs"
+
+
+def _jsonable(value: Any) -> Any:
+    if is_dataclass(value):
+        return asdict(value)
+    return str(value)
+
+
+def fingerprint(*parts: Any) -> str:
+    """
+    Hash stage inputs into a short, stable key.
+
+    Args:
+        *parts: JSON-serializable values or dataclasses
+
+    Returns:
+        str: Hex digest of the inputs
+    """
+    payload = json.dumps(parts, sort_keys=True, default=_jsonable)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class CheckpointStore:
+    """Stores stage outputs as JSON files under run_dir/apr-<number>/."""
+
+    def __init__(self, run_dir: str = DEFAULT_RUN_DIR):
+        """
+        Initialize the store.
+
+        Args:
+            run_dir: Directory holding the checkpoints of all APRs
+        """
+        self.run_dir = Path(run_dir)
+
+    def _path(self, apr_number: str, stage: str, key: str) -> Path:
+        return self.run_dir / f"apr-{apr_number}" / f"{stage}-{key}.json"
+
+    def load(self, apr_number: str, stage: str, key: str) -> Optional[Any]:
+        """
+        Load a stage output.
+
+        Args:
+            apr_number: APR number
+            stage: Stage name
+            key: Input fingerprint of the stage
+
+        Returns:
+            Optional[Any]: Stored output, or None if there is no (readable) checkpoint
+        """
+        path = self._path(apr_number, stage, key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)['output']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, apr_number: str, stage: str, key: str, output: Any):
+        """
+        Store a stage output; the file is replaced atomically so an interrupted
+        write never leaves a truncated checkpoint behind.
+
+        Args:
+            apr_number: APR number
+            stage: Stage name
+            key: Input fingerprint of the stage
+            output: JSON-serializable stage output
+        """
+        path = self._path(apr_number, stage, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'apr_number': apr_number, 'stage': stage, 'output': output}, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, path)
@@ -0,0 +1,161 @@
+"""
+Hedged Agent Runs
+
+This module contains the hedging of straggling metric agent runs. Agent run
+latency has a long tail: now and then one metric agent takes several times
+its usual time and holds up the linker and coordinator. With hedging enabled,
+a run that is still going after a percentile of its agent's past latencies
+gets a duplicate run on a fresh thread; whichever finishes first is used and
+the other is cancelled.
+
+Latencies of successful runs are kept per agent type in the run directory, so
+scheduled batch runs hedge against the history of earlier runs.
+"""
+
+import json
+import math
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, TypeVar
+
+from apis.deadline import Deadline, current_deadline, deadline_scope
+from orchestrator.checkpoints import DEFAULT_RUN_DIR
+from orchestrator.pipeline import submit_in_context
+from orchestrator.telemetry import set_attributes
+
+T = TypeVar('T')
+
+DEFAULT_HEDGE_PERCENTILE = 90.0
+# Latencies kept per agent type, and needed before a percentile is trusted
+LATENCY_WINDOW = 50
+MIN_LATENCY_SAMPLES = 5
+
+
+class LatencyHistory:
+    """Recent run latencies per agent type, persisted as JSON under the run directory."""
+
+    def __init__(self, run_dir: str = DEFAULT_RUN_DIR, window: int = LATENCY_WINDOW):
+        """
+        Initialize the history.
+
+        Args:
+            run_dir: Directory holding latencies.json (next to the checkpoints)
+            window: Number of most recent latencies kept per agent type
+        """
+        self.path = Path(run_dir) / "latencies.json"
+        self.window = window
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self._latencies: Dict[str, List[float]] = json.load(f)
+        except (OSError, ValueError):
+            self._latencies = {}
+
+    def record(self, agent_type: str, seconds: float):
+        """Add the latency of a successful run and persist the history."""
+        with self._lock:
+            latencies = self._latencies.setdefault(agent_type, [])
+            latencies.append(round(seconds, 3))
+            del latencies[:-self.window]
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, 'w', encoding='utf-8') as f:
+                    json.dump(self._latencies, f, indent=2)
+            except OSError as e:
+                print(f"⚠️ Could not save run latencies: {e}")
+
+    def percentile(self, agent_type: str, percentile: float) -> Optional[float]:
+        """
+        Get a latency percentile of an agent type (nearest-rank).
+
+        Args:
+            agent_type: Type of agent
+            percentile: Percentile between 0 and 100
+
+        Returns:
+            Optional[float]: Latency in seconds, or None with fewer than MIN_LATENCY_SAMPLES runs recorded
+        """
+        with self._lock:
+            latencies = sorted(self._latencies.get(agent_type, []))
+        if len(latencies) < MIN_LATENCY_SAMPLES:
+            return None
+        rank = max(1, math.ceil(percentile / 100 * len(latencies)))
+        return latencies[rank - 1]
+
+
+class Hedger:
+    """Runs an attempt and, once it straggles past its latency percentile, a duplicate; the first to finish wins."""
+
+    def __init__(self, percentile: float = DEFAULT_HEDGE_PERCENTILE, history: Optional[LatencyHistory] = None):
+        """
+        Initialize the hedger.
+
+        Args:
+            percentile: Latency percentile of the agent type after which a duplicate run starts
+            history: Latency history to hedge against (default: the one in the run directory)
+        """
+        self.percentile = percentile
+        self.history = history or LatencyHistory()
+        self._pool = ThreadPoolExecutor(thread_name_prefix="hedge")
+
+    def _timed(self, agent_type: str, attempt: Callable[[], T]) -> T:
+        started = time.monotonic()
+        result = attempt()
+        self.history.record(agent_type, time.monotonic() - started)
+        return result
+
+    def run(self, agent_type: str, attempt: Callable[[], T]) -> T:
+        """
+        Run an attempt, hedging it with a duplicate if it outlasts the latency percentile.
+
+        Each copy runs under its own child of the current deadline, so cancelling
+        the loser only stops its run, and the analysis deadline still stops both.
+
+        Args:
+            agent_type: Type of agent, whose latency history sets the hedge delay
+            attempt: Runs the agent once on a new thread and returns its reply
+
+        Returns:
+            T: Result of the first copy to succeed
+
+        Raises:
+            Exception: The error of the last copy to fail if neither succeeded
+        """
+        hedge_after = self.history.percentile(agent_type, self.percentile)
+        if hedge_after is None:
+            # Not enough history for a meaningful threshold yet
+            return self._timed(agent_type, attempt)
+
+        parent = current_deadline()
+
+        def copy(deadline: Deadline) -> T:
+            with deadline_scope(deadline):
+                return self._timed(agent_type, attempt)
+
+        deadlines = [parent.child()]
+        pending = {submit_in_context(self._pool, copy, deadlines[0]): 0}
+        done, _ = wait(pending, timeout=parent.clamp(hedge_after))
+        if not done and not parent.expired:
+            print(f"🐢 {agent_type.upper()} run is slower than its p{self.percentile:g} of {hedge_after:.0f}s, "
+                  f"starting a hedged run")
+            deadlines.append(parent.child())
+            pending[submit_in_context(self._pool, copy, deadlines[1])] = 1
+        set_attributes(hedge_after_s=hedge_after, hedged=len(deadlines) > 1)
+
+        error = None
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                if future.exception() is None:
+                    for loser in pending.values():
+                        deadlines[loser].cancel()
+                    if pending:
+                        print(f"✅ {agent_type.upper()} {'hedged' if index else 'original'} run finished first, "
+                              f"cancelling the other")
+                    set_attributes(hedge_winner='hedge' if index else 'original')
+                    return future.result()
+                error = future.exception()
+        raise error
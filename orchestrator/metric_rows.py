@@ -0,0 +1,105 @@
+"""
+Metric Rows
+
+This module contains the orchestrator's own look at the rows a metric agent
+would analyze. The metric queries run before the agent (through the run's tool
+cache, so the agent's own call is free): a theme without significant rows
+gets a canned empty result instead of a minutes-long agent run, and a theme
+with only a handful of rows has them inlined into the prompt, saving the
+agent the fetch round trip.
+"""
+
+import json
+import math
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+# Themes with at most this many rows get them inlined into the agent prompt
+TINY_ROW_THRESHOLD = 20
+
+
+@dataclass
+class MetricRows:
+    """Rows returned by a metric query (a Databricks statement result)."""
+    metric: str
+    columns: List[str]
+    rows: List[List[Any]]
+    total_row_count: int
+
+    @property
+    def empty(self) -> bool:
+        """Whether the query found no significant rows."""
+        return self.total_row_count == 0
+
+    @property
+    def complete(self) -> bool:
+        """Whether every row is in the inline result (large results may be chunked)."""
+        return len(self.rows) >= self.total_row_count
+
+    @property
+    def tiny(self) -> bool:
+        """Whether the rows are few enough to inline into the agent prompt."""
+        return self.complete and 0 < self.total_row_count <= TINY_ROW_THRESHOLD
+
+    def to_prompt_block(self, shard: Optional[str] = None) -> str:
+        """
+        Render the rows as a compact table for the agent prompt.
+
+        Args:
+            shard: Position of the rows among the shards of a larger result (e.g. "2 of 4"), if sharded
+
+        Returns:
+            str: Prompt block
+        """
+        def cell(value: Any) -> str:
+            if value is None:
+                return ""
+            try:
+                number = float(value)
+            except (TypeError, ValueError):
+                return str(value)
+            if not math.isfinite(number):
+                # "NAN" or "Inf" is a country or tag, not a number
+                return str(value)
+            return str(int(number)) if number.is_integer() else f"{number:.6g}"
+
+        tool = f"get_{self.metric.lower()}_metrics_for_apr"
+        if shard:
+            header = (f"{self.metric.upper()} METRIC ROWS, SHARD {shard} ({self.total_row_count} rows; the other "
+                      f"shards are analyzed in parallel runs, so analyze only these rows and do not call {tool}):")
+        else:
+            header = (f"{self.metric.upper()} METRIC ROWS ({self.total_row_count} rows, already fetched with {tool}; "
+                      f"do not call it again):")
+        lines = [header, " | ".join(self.columns)]
+        lines += [" | ".join(cell(value) for value in row) for row in self.rows]
+        return "\n".join(lines)
+
+
+def parse_statement_result(text: str, metric: str) -> Optional[MetricRows]:
+    """
+    Parse the result of a metric query.
+
+    Args:
+        text: Result of a get_*_metrics_for_apr tool (the statement execution response)
+        metric: Metric the rows belong to
+
+    Returns:
+        Optional[MetricRows]: The rows, or None if the query failed or its result
+            cannot be read (the agent then runs as usual)
+    """
+    try:
+        document = json.loads(text)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(document, dict) or 'error' in document:
+        return None
+    if (document.get('status') or {}).get('state') != 'SUCCEEDED':
+        return None
+
+    manifest = document.get('manifest') or {}
+    columns = [column.get('name', '') for column in (manifest.get('schema') or {}).get('columns', [])]
+    rows = (document.get('result') or {}).get('data_array') or []
+    total_row_count = manifest.get('total_row_count')
+    if not isinstance(total_row_count, int):
+        total_row_count = len(rows)
+    return MetricRows(metric, columns, rows, total_row_count)
@@ -7,18 +7,86 @@ analysis execution, and result synthesis.
 """
 
 import time
-from typing import Dict, List
-from azure.ai.agents.models import MessageRole
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from azure.ai.agents.models import (
+    FunctionTool, ListSortOrder, MessageRole, RunStatus, SubmitToolOutputsAction, ThreadMessageOptions, ThreadRun,
+    TruncationObject, TruncationStrategy
+)
 
-from agents import create_pav_agent, create_ppa_agent, create_dup_agent, create_coordinator_agent, create_jira_linker_agent
+from agents import (
+    create_pav_agent, create_ppa_agent, create_sup_agent, create_dup_agent,
+    create_coordinator_agent, create_jira_linker_agent, describe_routes, resolve_model_deployments
+)
 from agent_tools import (
     get_jira_ticket_description, get_pull_request_body, get_pull_request_title,
     get_control_plan_metrics_from_pr_comment, get_jira_ticket_title, 
     get_jira_ticket_release_notes, get_jira_ticket_xlsx_attachment, 
     get_jira_ticket_attachments, get_PRs_from_apr, get_feature_rankings,
     get_pav_metrics_for_apr, get_ppa_metrics_for_apr, 
-    get_dup_metrics_for_apr, create_confluence_page
+    get_sup_metrics_for_apr, get_dup_metrics_for_apr, create_confluence_page
 )
+from apis.deadline import Deadline, current_deadline, deadline_scope
+from linking import TicketIndex, SimilarityRanker, extract_patterns, merge_candidates
+from orchestrator.accounting import Accounting, current_run, current_stage, run_scope
+from orchestrator.agent_registry import AgentRegistry, config_hash
+from orchestrator.checkpoints import CheckpointStore, fingerprint
+from orchestrator.hedging import Hedger
+from orchestrator.metric_rows import MetricRows, parse_statement_result
+from orchestrator.pipeline import Pipeline, PipelineResult, Stage, StageSkipped, submit_in_context
+from orchestrator.policies import EmptyResponseError, RetryPolicy, RunFailedError
+from orchestrator.prefetch import AprContext, prefetch_apr_context
+from orchestrator.sharding import SHARD_ROW_THRESHOLD, merge_shard_patterns, shard_rows
+from orchestrator.stage_cache import StageCache, result_data
+from orchestrator.streaming import StageEventHandler, StreamCallback, StreamWatchdog
+from orchestrator.structured_output import (
+    Pattern, StructuredOutputError, apply_links, format_findings, metric_output, parse_links,
+    parse_metric_output
+)
+from orchestrator.telemetry import record_run, set_attributes, span
+from orchestrator.tool_cache import ToolCallCache, is_error_result
+from orchestrator.tool_executor import ToolExecutor
+
+# Run status polling: start fast so short runs return quickly, back off towards the cap on long ones
+RUN_POLL_INITIAL = 0.5
+RUN_POLL_BACKOFF = 1.5
+RUN_POLL_MAX = 5.0
+ACTIVE_RUN_STATUSES = (RunStatus.QUEUED, RunStatus.IN_PROGRESS, RunStatus.REQUIRES_ACTION)
+
+# Threads are created per run; the cap bounds the history a run sends to the model
+MAX_THREAD_MESSAGES = 10
+
+METRIC_AGENT_FACTORIES = {
+    'pav': create_pav_agent,
+    'ppa': create_ppa_agent,
+    'sup': create_sup_agent,
+    'dup': create_dup_agent,
+}
+DEFAULT_METRIC_AGENTS = ('pav', 'ppa', 'dup')
+
+# Metric rows each metric agent analyzes (part of its stage cache fingerprint)
+METRIC_TOOLS = {
+    'pav': get_pav_metrics_for_apr,
+    'ppa': get_ppa_metrics_for_apr,
+    'sup': get_sup_metrics_for_apr,
+    'dup': get_dup_metrics_for_apr,
+}
+
+# Wall-clock budget per metric stage (all attempts); it is the stage's deadline, so the
+# retry policy does not start an attempt it cannot wait for, and the linker and
+# coordinator start with whatever metric stages finished within it
+METRIC_STAGE_TIMEOUT = 900
+
+
+def _is_failed_output(output: Any) -> bool:
+    """Whether a stage returned a failure placeholder instead of a result (never checkpointed)."""
+    if isinstance(output, AprContext):
+        return not output.ok
+    if not isinstance(output, str):
+        return False
+    # Tool failures such as "Error creating Confluence page: ..." from the publish stage
+    return is_error_result(output) or output.startswith(('❌', '⚠️')) or output == "No linkages found"
 
 
 class APROrchestrator:
@@ -29,42 +97,295 @@ class APROrchestrator:
     to perform comprehensive APR analysis with metric collection and synthesis.
     """
     
-    def __init__(self, agents_client, model_deployment_name: str):
+    def __init__(self, agents_client, model_deployment_name: str, stream_callback: Optional[StreamCallback] = None,
+                 reuse_agents: bool = True, metric_agents: Sequence[str] = DEFAULT_METRIC_AGENTS,
+                 use_stage_cache: bool = True, retry_policy: Optional[RetryPolicy] = None,
+                 time_budget: Optional[float] = None, hedge_percentile: Optional[float] = None,
+                 model_deployments: Optional[Dict[str, str]] = None,
+                 shard_threshold: Optional[int] = SHARD_ROW_THRESHOLD):
         """
         Initialize the orchestrator.
         
         Args:
             agents_client: Azure AI agents client
-            model_deployment_name: Name of the model deployment
+            model_deployment_name: Name of the model deployment of agents not routed elsewhere
+            stream_callback: If set, agent runs are streamed and their text deltas and
+                tool calls are forwarded to this callback
+            reuse_agents: Reuse agents deployed by earlier runs (matched by configuration
+                hash) and keep them after cleanup, instead of creating and deleting them per run
+            metric_agents: Metric agents to run (any of pav, ppa, sup, dup); they run concurrently
+            use_stage_cache: Serve agent stage outputs cached by earlier runs on unchanged inputs
+            retry_policy: Retry policy of the agent stages (default: 3 attempts with
+                exponential backoff within 30 minutes)
+            time_budget: Seconds an APR analysis may take in total; on expiry in-flight
+                runs and statements are cancelled and a partial report is returned
+            hedge_percentile: If set, a metric run still going after this percentile of its
+                agent's past latencies gets a duplicate run; the first to finish is used and
+                the other cancelled (polled runs only)
+            model_deployments: Model deployment per agent type (or "metrics" for all metric
+                agents), e.g. a smaller deployment for the metric agents and the linker
+            shard_threshold: Metric results with more rows than this are split into shards
+                analyzed by parallel agent runs and merged; None disables sharding
         """
         self.agents_client = agents_client
         self.model_deployment_name = model_deployment_name
+        self.model_deployments = resolve_model_deployments(model_deployment_name, model_deployments, environ={})
+        self.stream_callback = stream_callback
+        self.reuse_agents = reuse_agents
         self.agents = {}
-        self.threads = {}
+        self.threads: Dict[str, str] = {}  # open thread id → agent type
+        self.truncation_strategy = TruncationObject(
+            type=TruncationStrategy.LAST_MESSAGES, last_messages=MAX_THREAD_MESSAGES
+        )
+        self.tool_cache = ToolCallCache()
+        self.checkpoints = CheckpointStore()
+        self.stage_cache = StageCache(enabled=use_stage_cache)
+        self.accounting = Accounting()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.time_budget = time_budget
+        self.hedger = Hedger(hedge_percentile) if hedge_percentile is not None else None
+        self.shard_threshold = shard_threshold
+        
+        self.metric_agents = list(metric_agents)
         
         # Initialize agent instances using the creation functions
         self.agent_instances = {
-            'pav': create_pav_agent(model_deployment_name),
-            'ppa': create_ppa_agent(model_deployment_name),
-            'dup': create_dup_agent(model_deployment_name),
-            'jira_linker': create_jira_linker_agent(model_deployment_name),
-            'coordinator': create_coordinator_agent(model_deployment_name)
+            agent_type: METRIC_AGENT_FACTORIES[agent_type](self.model_deployments[agent_type])
+            for agent_type in self.metric_agents
         }
+        self.agent_instances['jira_linker'] = create_jira_linker_agent(self.model_deployments['jira_linker'])
+        self.agent_instances['coordinator'] = create_coordinator_agent(
+            self.model_deployments['coordinator'], self.metric_agents
+        )
         
         # Enable auto function calls on initialization
         self._enable_auto_function_calls()
     
     def _enable_auto_function_calls(self):
-        """Enable auto function calls for all agent tools."""
+        """
+        Enable auto function calls for all agent tools, memoized through the run-scoped tool cache.
+        
+        Polled runs execute the tool calls of each model step concurrently through the
+        tool executor; streamed runs leave tool execution to the SDK.
+        """
         all_tools = {
             get_jira_ticket_description, get_pull_request_body, get_pull_request_title,
             get_control_plan_metrics_from_pr_comment, get_jira_ticket_title, 
             get_jira_ticket_release_notes, get_jira_ticket_xlsx_attachment, 
             get_jira_ticket_attachments, get_PRs_from_apr, get_feature_rankings,
             get_pav_metrics_for_apr, get_ppa_metrics_for_apr, 
-            get_dup_metrics_for_apr  # create_confluence_page
+            get_sup_metrics_for_apr, get_dup_metrics_for_apr  # create_confluence_page
         }
-        self.agents_client.enable_auto_function_calls(all_tools)
+        cached_tools = {self.tool_cache.wrap(tool) for tool in all_tools}
+        self.tool_executor = ToolExecutor(cached_tools)
+        self.agents_client.enable_auto_function_calls(FunctionTool(cached_tools))
+    
+    def _process_run(self, thread_id: str, agent_id: str, timeout: float) -> ThreadRun:
+        """
+        Create a run and drive it to completion.
+        
+        The run status is polled with adaptive backoff; the tool calls of a model step
+        are executed concurrently and their outputs submitted together as soon as the
+        run asks for them.
+        
+        Args:
+            thread_id: Thread to run
+            agent_id: Agent to run the thread with
+            timeout: Seconds after which the run is cancelled
+            
+        Returns:
+            ThreadRun: The completed run
+            
+        Raises:
+            DeadlineExceeded: If the analysis deadline passed; the run is cancelled
+        """
+        budget = current_deadline()
+        budget.check("agent run")
+        started = time.monotonic()
+        run = self.agents_client.runs.create(
+            thread_id=thread_id, agent_id=agent_id, truncation_strategy=self.truncation_strategy
+        )
+        expires_at = time.monotonic() + timeout
+        delay = RUN_POLL_INITIAL
+        
+        while run.status in ACTIVE_RUN_STATUSES:
+            remaining = expires_at - time.monotonic()
+            if budget.expired:
+                self.agents_client.runs.cancel(thread_id=thread_id, run_id=run.id)
+                budget.check(f"run {run.id}")
+            if remaining <= 0:
+                self.agents_client.runs.cancel(thread_id=thread_id, run_id=run.id)
+                raise TimeoutError(f"run {run.id} did not finish within {timeout}s")
+            budget.sleep(min(delay, remaining))
+            delay = min(delay * RUN_POLL_BACKOFF, RUN_POLL_MAX)
+            run = self.agents_client.runs.get(thread_id=thread_id, run_id=run.id)
+            
+            if run.status == RunStatus.REQUIRES_ACTION and isinstance(run.required_action, SubmitToolOutputsAction):
+                tool_calls = run.required_action.submit_tool_outputs.tool_calls
+                if not tool_calls:
+                    self.agents_client.runs.cancel(thread_id=thread_id, run_id=run.id)
+                    raise RuntimeError(f"run {run.id} requested an action without tool calls")
+                tool_outputs = self.tool_executor.execute(tool_calls)
+                run = self.agents_client.runs.submit_tool_outputs(
+                    thread_id=thread_id, run_id=run.id, tool_outputs=tool_outputs
+                )
+                # The model continues right after the tool outputs arrive
+                delay = RUN_POLL_INITIAL
+        
+        self._account_run(thread_id, run, started)
+        if run.status != RunStatus.COMPLETED:
+            raise RunFailedError.from_run(run)
+        return run
+    
+    def _stream_run(self, agent_type: str, thread_id: str, agent_id: str, timeout: float) -> Optional[str]:
+        """
+        Run an agent in streaming mode and return its reply.
+        
+        Returns on the run's completion event rather than polling for it. Tool calls
+        are executed by the SDK through the functions registered for auto function calls.
+        
+        Args:
+            agent_type: Type of agent (pav, ppa, dup, jira_linker, coordinator)
+            thread_id: Thread to run
+            agent_id: Agent to run the thread with
+            timeout: Seconds after which the run is cancelled
+            
+        Returns:
+            Optional[str]: Agent reply, or None if the run produced no agent message
+        """
+        handler = StageEventHandler(agent_type, self.stream_callback)
+        budget = current_deadline()
+        budget.check("agent run")
+        
+        stream = self.agents_client.runs.stream(
+            thread_id=thread_id, agent_id=agent_id, truncation_strategy=self.truncation_strategy, event_handler=handler
+        )
+        # The watchdog cancels the run on time even when the stream stalls between events
+        cancel_run = lambda run_id: self.agents_client.runs.cancel(thread_id=thread_id, run_id=run_id)
+        with StreamWatchdog(handler, cancel_run, timeout, budget) as watchdog, stream as events:
+            for _ in events:
+                if handler.done or watchdog.fired:
+                    break
+        if watchdog.fired == "deadline":
+            budget.check("streamed run")
+        if watchdog.fired == "timeout":
+            raise TimeoutError(f"streamed run did not finish within {timeout}s")
+        
+        if handler.time_to_first_token is not None:
+            print(f"⏱️ {agent_type.upper()} time to first token {handler.time_to_first_token:.1f}s, "
+                  f"total {time.monotonic() - handler.started:.1f}s")
+        set_attributes(time_to_first_token_s=handler.time_to_first_token)
+        if handler.run is not None:
+            self._account_run(thread_id, handler.run, handler.started)
+        if handler.run is not None and handler.run.status != RunStatus.COMPLETED:
+            raise RunFailedError.from_run(handler.run)
+        return handler.reply
+    
+    def _account_run(self, thread_id: str, run: ThreadRun, started: float):
+        """
+        Record a finished run's token usage, model steps and model time.
+        
+        Model time is the run's wall time minus the time it waited on its own tool
+        calls (collected by the run scope of _run_agent), not those of concurrent runs.
+        
+        Args:
+            thread_id: Thread of the run
+            run: Finished run
+            started: Monotonic time the run was started
+        """
+        record_run(run)
+        account = current_stage()
+        if account is None:
+            return
+        try:
+            steps = list(self.agents_client.run_steps.list(thread_id=thread_id, run_id=run.id))
+        except Exception:
+            # Step listing only refines the accounting, it must never fail a run
+            steps = None
+        tools = current_run()
+        account.record_run(run, time.monotonic() - started, tools.seconds if tools else 0.0, steps)
+    
+    def _latest_reply(self, thread_id: str, run_id: str) -> Optional[str]:
+        """Get the text of the newest agent message a run produced, or None."""
+        messages = self.agents_client.messages.list(
+            thread_id=thread_id, run_id=run_id, order=ListSortOrder.DESCENDING, limit=1
+        )
+        message = next(iter(messages), None)
+        if message and message.role == MessageRole.AGENT and message.content:
+            return message.content[0].text.value
+        return None
+    
+    def _run_agent(self, agent_type: str, content: str, default_timeout: int = 600) -> Optional[str]:
+        """
+        Run an agent on a new thread holding only the given message and return its reply.
+        
+        The thread is deleted afterwards, so retries and later APRs never inherit
+        earlier conversations.
+        
+        Args:
+            agent_type: Type of agent (pav, ppa, dup, jira_linker, coordinator)
+            content: User message content
+            default_timeout: Run timeout if the agent metadata does not set one
+            
+        Returns:
+            Optional[str]: Agent reply, or None if the run produced no agent message
+        """
+        with span(f"agent_run {agent_type}", agent_type=agent_type, agent_id=self.agents[agent_type].id,
+                  model=self.agent_instances[agent_type].model, prompt_chars=len(content),
+                  streamed=bool(self.stream_callback)):
+            thread = self.agents_client.threads.create(messages=[ThreadMessageOptions(role="user", content=content)])
+            self.threads[thread.id] = agent_type
+            set_attributes(thread_id=thread.id)
+            try:
+                timeout = self.agent_instances[agent_type].metadata.get("timeout", default_timeout)
+                # Tool calls made for this run are timed apart from those of concurrent runs in the stage
+                with run_scope():
+                    if self.stream_callback:
+                        return self._stream_run(agent_type, thread.id, self.agents[agent_type].id, timeout)
+                    run = self._process_run(thread.id, self.agents[agent_type].id, timeout)
+                return self._latest_reply(thread.id, run.id)
+            finally:
+                self._delete_thread(thread.id)
+    
+    def _run_agent_with_retries(self, agent_type: str, content: str, default_timeout: int = 600,
+                                retries: Optional[int] = None) -> str:
+        """
+        Run an agent under the retry policy; an empty reply counts as a retryable failure.
+        
+        With hedging enabled, each attempt of a metric agent is hedged against its latency history.
+        
+        Args:
+            agent_type: Type of agent (pav, ppa, dup, jira_linker, coordinator)
+            content: User message content
+            default_timeout: Run timeout if the agent metadata does not set one
+            retries: Number of retry attempts (default: the orchestrator's retry policy)
+            
+        Returns:
+            str: Agent reply
+            
+        Raises:
+            Exception: The last error once it is fatal or retries are exhausted
+        """
+        policy = self.retry_policy if retries is None else replace(self.retry_policy, max_attempts=retries + 1)
+        hedged = self.hedger is not None and agent_type in self.metric_agents and not self.stream_callback
+        
+        def run_once() -> str:
+            reply = self._run_agent(agent_type, content, default_timeout)
+            if not reply:
+                raise EmptyResponseError(f"no response from {agent_type.upper()} agent")
+            return reply
+        
+        def attempt() -> str:
+            return self.hedger.run(agent_type, run_once) if hedged else run_once()
+        return policy.call(attempt, label=f"{agent_type.upper()} agent")
+    
+    def _delete_thread(self, thread_id: str):
+        """Delete a finished thread; failures are only reported, the thread holds no state we need."""
+        self.threads.pop(thread_id, None)
+        try:
+            self.agents_client.threads.delete(thread_id)
+        except Exception as e:
+            print(f"⚠️ Could not delete thread {thread_id}: {e}")
     
     def create_agents(self) -> bool:
         """
@@ -76,310 +397,612 @@ class APROrchestrator:
         print("🔧 Creating specialized agents...")
         
         try:
-            # Create each agent using the agent instances
-            for agent_type, agent_instance in self.agent_instances.items():
-                self.agents[agent_type] = self.agents_client.create_agent(**agent_instance.to_create_params())
-                print(f"✅ Created {agent_instance.name}")
-            
-            # Create threads for each agent
-            for agent_type in self.agents.keys():
-                self.threads[agent_type] = self.agents_client.threads.create()
+            if self.reuse_agents:
+                # Only agents whose configuration changed since the last run are redeployed
+                registry = AgentRegistry(self.agents_client)
+                registry.refresh()
+                for agent_type, agent_instance in self.agent_instances.items():
+                    self.agents[agent_type], action = registry.ensure(agent_instance)
+                    print(f"✅ {action.capitalize()} {agent_instance.name}")
+            else:
+                # Create each agent using the agent instances
+                for agent_type, agent_instance in self.agent_instances.items():
+                    self.agents[agent_type] = self.agents_client.create_agent(**agent_instance.to_create_params())
+                    print(f"✅ Created {agent_instance.name}")
             
-            print(f"✅ Created {len(self.agents)} agents successfully")
+            print(f"✅ Deployed {len(self.agents)} agents successfully")
+            if len({agent.model for agent in self.agent_instances.values()}) > 1:
+                print(f"🧭 Model routing: {describe_routes(self.model_deployments, self.agent_instances)}")
             return True
             
         except Exception as e:
             print(f"❌ Error creating agents: {e}")
             return False
     
-    def run_metric_analysis(self, apr_number: str, agent_type: str, retries: int = 2) -> str:
+    def run_metric_analysis(self, apr_number: str, agent_type: str, retries: Optional[int] = None) -> str:
         """
-        Run analysis for a specific metric agent with retry logic.
+        Run analysis for a specific metric agent under the retry policy.
+        
+        The metric query runs first: without significant rows the agent is skipped
+        and an empty structured result returned; a handful of rows is inlined into
+        the prompt, and results above the shard threshold are split across
+        parallel runs.
         
         Args:
             apr_number: APR number to analyze
             agent_type: Type of agent (pav, ppa, dup)
-            retries: Number of retry attempts
+            retries: Number of retry attempts (default: the orchestrator's retry policy)
             
         Returns:
             str: Analysis result
         """
-        agent = self.agents[agent_type]
-        thread = self.threads[agent_type]
+        rows = self._metric_rows(apr_number, agent_type)
+        if rows is not None and rows.empty:
+            print(f"⏭️ {agent_type.upper()}: no significant rows for APR {apr_number}, skipping the agent")
+            set_attributes(short_circuit="no_rows")
+            account = current_stage()
+            if account is not None:
+                account.source = "empty metric query"
+            return metric_output(agent_type)
         
-        for attempt in range(retries + 1):
+        prompts, shards = self._metric_prompts(apr_number, rows)
+        if shards:
+            return self._run_sharded_metric_analysis(apr_number, agent_type, prompts, shards, retries)
+        prompt = prompts[0]
+        if rows is not None and rows.tiny:
+            print(f"🔄 Running {agent_type.upper()} analysis for APR {apr_number} "
+                  f"on {rows.total_row_count} inlined rows...")
+            set_attributes(inlined_rows=rows.total_row_count)
+        else:
+            print(f"🔄 Running {agent_type.upper()} analysis for APR {apr_number}...")
+        try:
+            result = self._run_agent_with_retries(agent_type, prompt, default_timeout=360, retries=retries)
+        except Exception as e:
+            error_msg = f"❌ {agent_type.upper()} agent execution failed: {e}"
+            print(error_msg)
+            return error_msg
+        print(f"✅ {agent_type.upper()} analysis completed")
+        return result
+    
+    def _metric_prompts(self, apr_number: str,
+                        rows: Optional[MetricRows]) -> Tuple[List[str], Optional[List[MetricRows]]]:
+        """
+        Render the messages a metric stage sends its agent.
+        
+        A handful of rows is inlined into the prompt; results above the shard
+        threshold get one prompt per shard.
+        
+        Args:
+            apr_number: APR number to analyze
+            rows: Result of the metric query, or None if it could not be run up front
+            
+        Returns:
+            Tuple[List[str], Optional[List[MetricRows]]]: Prompts, and the shards they
+                carry if the rows were split (None for a single run)
+        """
+        # Fixed request first and the APR after it, like the linker and coordinator messages
+        prompt = f"Please analyze the APR below as per your instructions.\n\nAPR {apr_number}"
+        if rows is not None and self.shard_threshold and rows.complete and rows.total_row_count > self.shard_threshold:
+            shards = shard_rows(rows)
+            if len(shards) > 1:
+                return [
+                    f"{prompt}\n\n{shard.to_prompt_block(f'{number} of {len(shards)}')}"
+                    for number, shard in enumerate(shards, 1)
+                ], shards
+        if rows is not None and rows.tiny:
+            # Few rows: hand them over directly instead of a fetch round trip
+            prompt += f"\n\n{rows.to_prompt_block()}"
+        return [prompt], None
+    
+    def _run_sharded_metric_analysis(self, apr_number: str, agent_type: str, prompts: List[str],
+                                     shards: List[MetricRows], retries: Optional[int] = None) -> str:
+        """
+        Analyze the shards of a large metric result in parallel runs and merge their patterns.
+        
+        Args:
+            apr_number: APR number to analyze
+            agent_type: Type of agent (pav, ppa, dup)
+            prompts: Prompt of each shard, carrying its rows
+            shards: Partitioned metric rows
+            retries: Number of retry attempts per shard (default: the orchestrator's retry policy)
+            
+        Returns:
+            str: Merged structured result; shards that failed are left out
+        """
+        total_rows = sum(shard.total_row_count for shard in shards)
+        print(f"🔀 Running {agent_type.upper()} analysis for APR {apr_number} on {total_rows} rows "
+              f"in {len(shards)} parallel shards...")
+        set_attributes(shards=len(shards), shard_rows=",".join(str(shard.total_row_count) for shard in shards))
+        with ThreadPoolExecutor(max_workers=len(shards), thread_name_prefix=f"{agent_type}-shard") as executor:
+            futures = [
+                submit_in_context(executor, self._run_agent_with_retries, agent_type, prompt, 360, retries)
+                for prompt in prompts
+            ]
+        
+        shard_patterns, failures = [], []
+        for number, future in enumerate(futures, 1):
             try:
-                if attempt > 0:
-                    print(f"🔄 Retry {attempt}: Running {agent_type.upper()} analysis for APR {apr_number}...")
-                else:
-                    print(f"🔄 Running {agent_type.upper()} analysis for APR {apr_number}...")
-                
-                # Send message to the specific agent
-                message = self.agents_client.messages.create(
-                    thread_id=thread.id,
-                    role="user",
-                    content=f"Please analyze APR {apr_number} as per your instructions."
-                )
-                
-                # Use the timeout from agent metadata
-                timeout = self.agent_instances[agent_type].metadata.get("timeout", 360)
-                run = self.agents_client.runs.create_and_process(
-                    thread_id=thread.id,
-                    agent_id=agent.id,
-                    timeout=timeout
-                )
-                
-                # Get the response
-                messages = list(self.agents_client.messages.list(thread_id=thread.id))
-                
-                if messages and messages[0].role == MessageRole.AGENT:
-                    result = messages[0].content[0].text.value
-                    print(f"✅ {agent_type.upper()} analysis completed")
-                    return result
-                else:
-                    if attempt < retries:
-                        print(f"⚠️ No response from {agent_type.upper()} agent, retrying...")
-                        time.sleep(5)  # Brief pause before retry
-                        continue
-                    else:
-                        error_msg = f"❌ {agent_type.upper()} agent failed to provide analysis after {retries + 1} attempts"
-                        print(error_msg)
-                        return error_msg
-                        
+                shard_patterns.append(parse_metric_output(future.result(), agent_type))
             except Exception as e:
-                if attempt < retries:
-                    print(f"⚠️ {agent_type.upper()} agent error: {e}, retrying...")
-                    time.sleep(5)  # Brief pause before retry
-                    continue
-                else:
-                    error_msg = f"❌ {agent_type.upper()} agent execution failed after {retries + 1} attempts: {e}"
-                    print(error_msg)
-                    return error_msg
+                failures.append(f"shard {number}: {e}")
+        if not shard_patterns:
+            error_msg = f"❌ {agent_type.upper()} agent execution failed in every shard: {'; '.join(failures)}"
+            print(error_msg)
+            return error_msg
+        if failures:
+            print(f"⚠️ {agent_type.upper()}: {len(failures)} of {len(shards)} shards failed, their rows are "
+                  f"missing from the merged patterns ({'; '.join(failures)})")
+        patterns = merge_shard_patterns(agent_type, shard_patterns)
+        print(f"✅ {agent_type.upper()} analysis completed ({len(patterns)} patterns merged from "
+              f"{len(shard_patterns)} shards)")
+        return metric_output(agent_type, patterns)
     
-    def run_jira_linking_analysis(self, apr_number: str, metric_results: Dict[str, str], retries: int = 2) -> str:
+    def _metric_rows(self, apr_number: str, agent_type: str) -> Optional[MetricRows]:
+        """
+        Run a metric agent's query up front, through the tool cache the agent shares.
+        
+        Returns:
+            Optional[MetricRows]: The rows, or None if they could not be fetched (the agent then runs as usual)
+        """
+        try:
+            apr = int(apr_number)
+        except ValueError:
+            return None
+        return parse_statement_result(self.tool_cache.call(METRIC_TOOLS[agent_type], apr), agent_type)
+    
+    def prefetch_context(self, apr_number: str) -> AprContext:
+        """
+        Run the prefetch stage: PR list, PR titles and MPOI tickets, fetched concurrently.
+        
+        Args:
+            apr_number: APR number to analyze
+            
+        Returns:
+            AprContext: Prefetched PRs and tickets (agents fetch them themselves if this failed)
+        """
+        print(f"📥 Prefetching PRs and JIRA tickets for APR {apr_number}...")
+        context = prefetch_apr_context(apr_number, cache=self.tool_cache)
+        if context.ok:
+            print(f"✅ Prefetched {len(context.pr_titles)} PRs and {len(context.tickets)} JIRA tickets")
+        else:
+            print(f"⚠️ Could not prefetch APR context: {context.error} - agents will fetch tickets themselves")
+        return context
+    
+    def _parse_structured(self, metric_results: Dict[str, str]) -> Tuple[Dict[str, List[Pattern]], Dict[str, str]]:
+        """
+        Parse the metric agents' structured outputs.
+        
+        Returns:
+            Tuple[Dict[str, List[Pattern]], Dict[str, str]]: Validated patterns per agent type,
+                and the raw text of agents whose output is not structured (or missing)
+        """
+        structured, raw = {}, {}
+        for agent_type, result in metric_results.items():
+            try:
+                structured[agent_type] = parse_metric_output(result, agent_type)
+            except StructuredOutputError:
+                raw[agent_type] = result
+        return structured, raw
+    
+    def _pattern_lines(self, metric_results: Dict[str, str]) -> List[str]:
+        """Get every reported pattern as one line, prefixed with its id when structured."""
+        structured, raw = self._parse_structured(metric_results)
+        lines = [f"{p.id}: {p.to_text()}" for patterns in structured.values() for p in patterns]
+        return lines + [p for result in raw.values() for p in extract_patterns(result)]
+    
+    def _candidate_block(self, ticket_index: TicketIndex, metric_results: Dict[str, str]) -> str:
+        """Render the per-pattern candidate tickets for the linker and coordinator prompts."""
+        if not ticket_index.tickets:
+            return ""
+        patterns = self._pattern_lines(metric_results)
+        if not patterns:
+            return ""
+        candidates = merge_candidates(
+            ticket_index.candidates_for_patterns(patterns),
+            SimilarityRanker(ticket_index)
+        )
+        return ticket_index.format_candidates(candidates)
+    
+    def run_jira_linking_analysis(self, apr_number: str, metric_results: Dict[str, str],
+                                  context: str = "", retries: Optional[int] = None) -> str:
         """
         Run JIRA linking analysis to match patterns to tickets.
         
         Args:
             apr_number: APR number to analyze
-            metric_results: Dictionary of metric agent results (pav, ppa, dup)
-            retries: Number of retry attempts
+            metric_results: Dictionary of metric agent results (e.g. pav, ppa, dup)
+            context: Prefetched APR context and candidate tickets per pattern
+            retries: Number of retry attempts (default: the orchestrator's retry policy)
             
         Returns:
             str: JIRA linkage mappings
         """
-        agent = self.agents['jira_linker']
-        thread = self.threads['jira_linker']
-        
-        # Compile all patterns from metric agents
-        all_patterns = f"""APR {apr_number} Metric Patterns:
+        # Compile all patterns from metric agents (one line per validated pattern where structured)
+        structured, raw = self._parse_structured(metric_results)
+        blocks = []
+        for agent_type in metric_results:
+            if agent_type in structured:
+                lines = [f"- {p.id}: {p.to_text()}" for p in structured[agent_type]] or ["- No significant patterns found"]
+                blocks.append(f"{agent_type.upper()} PATTERNS:\n" + "\n".join(lines))
+            else:
+                blocks.append(f"{agent_type.upper()} PATTERNS:\n{raw[agent_type]}")
+        sections = "\n\n".join(blocks)
+        # Fixed request first and per-run data after it, so the message extends the cached prompt prefix
+        all_patterns = f"""Please find JIRA tickets that match these patterns.
 
-PAV PATTERNS:
-{metric_results['pav']}
+APR {apr_number} Metric Patterns:
 
-PPA PATTERNS:
-{metric_results['ppa']}
-
-DUP PATTERNS:
-{metric_results['dup']}
-
-Please find JIRA tickets that match these patterns."""
+{sections}"""
+        if context:
+            all_patterns += f"\n\n{context}"
         
-        for attempt in range(retries + 1):
-            try:
-                if attempt > 0:
-                    print(f"🔄 Retry {attempt}: Running JIRA linking analysis...")
-                
-                # Send patterns to JIRA linker
-                self.agents_client.messages.create(
-                    thread_id=thread.id,
-                    role="user",
-                    content=all_patterns
-                )
-                
-                # Use timeout from agent metadata
-                timeout = self.agent_instances['jira_linker'].metadata.get("timeout", 600)
-                
-                run = self.agents_client.runs.create_and_process(
-                    thread_id=thread.id,
-                    agent_id=agent.id,
-                    timeout=timeout
-                )
-                
-                # Give JIRA linker more time - it needs to call many functions
-                if attempt == 0:
-                    max_wait_time = 90  # 90 seconds first attempt
-                    poll_interval = 5
-                else:
-                    max_wait_time = 180  # 3 minutes on retry
-                    poll_interval = 5
-                max_polls = max_wait_time // poll_interval
-                
-                agent_response = None
-                for poll_attempt in range(max_polls):
-                    messages = list(self.agents_client.messages.list(thread_id=thread.id))
-                    
-                    # Find the LAST AGENT message (most recent)
-                    for msg in reversed(messages):
-                        if msg.role == MessageRole.AGENT:
-                            agent_response = msg
-                            break
-                    
-                    if agent_response and agent_response.content:
-                        break
-                    
-                    time.sleep(poll_interval)
-                
-                if agent_response and agent_response.content:
-                    result = agent_response.content[0].text.value
-                    print(f"✅ JIRA linking analysis completed")
-                    return result
-                else:
-                    if attempt < retries:
-                        print(f"⚠️ No response from JIRA linker, retrying...")
-                        time.sleep(5)
-                        continue
-                    else:
-                        error_msg = f"⚠️ JIRA linker failed after {retries + 1} attempts - proceeding without linkages"
-                        print(error_msg)
-                        return "No linkages found"
-                        
-            except Exception as e:
-                if attempt < retries:
-                    print(f"⚠️ JIRA linker error: {e}, retrying...")
-                    time.sleep(5)
-                    continue
-                else:
-                    error_msg = f"⚠️ JIRA linker execution failed after {retries + 1} attempts: {e}"
-                    print(error_msg)
-                    return "No linkages found"
-    
-    def create_final_report(self, apr_number: str, pav_result: str, ppa_result: str, 
-                           dup_result: str, jira_linkages: str = "", retries: int = 2) -> str:
+        try:
+            result = self._run_agent_with_retries('jira_linker', all_patterns, retries=retries)
+        except Exception as e:
+            print(f"⚠️ JIRA linker execution failed: {e} - proceeding without linkages")
+            return "No linkages found"
+        print(f"✅ JIRA linking analysis completed")
+        return result
+    
+    def create_final_report(self, apr_number: str, metric_results: Dict[str, str],
+                           jira_linkages: str = "", context: str = "", retries: Optional[int] = None) -> str:
         """
         Use coordinator agent to create final comprehensive report.
         
         Args:
             apr_number: APR number being analyzed
-            pav_result: PAV analysis result
-            ppa_result: PPA analysis result
-            dup_result: DUP analysis result
+            metric_results: Dictionary of metric agent results (e.g. pav, ppa, dup)
             jira_linkages: JIRA ticket linkage mappings from linker agent
-            retries: Number of retry attempts
+            context: Prefetched APR context and candidate tickets per pattern
+            retries: Number of retry attempts (default: the orchestrator's retry policy)
             
         Returns:
             str: Final comprehensive report
         """
-        coordinator = self.agents['coordinator']
-        thread = self.threads['coordinator']
+        print("🔄 Creating comprehensive final report...")
         
-        for attempt in range(retries + 1):
-            try:
-                if attempt > 0:
-                    print(f"🔄 Retry {attempt}: Creating comprehensive final report...")
-                else:
-                    print("🔄 Creating comprehensive final report...")
-                
-                # Provide data to coordinator without redundant instructions
-                prompt = f"""Please analyze and synthesize the results for APR {apr_number}.
-
-Here are the metric analysis findings from the specialized agents:
-
-PAV AGENT ANALYSIS:
-{pav_result}
-
-PPA AGENT ANALYSIS:
-{ppa_result}
-
-DUP AGENT ANALYSIS:
-{dup_result}
+        # Structured findings replace the agents' prose; unparseable outputs are passed through
+        structured, raw = self._parse_structured(metric_results)
+        try:
+            apply_links(structured, parse_links(jira_linkages))
+            linked = True
+        except StructuredOutputError:
+            linked = False
+        blocks = [format_findings(structured, with_links=linked)] if structured else []
+        blocks += [f"{agent_type.upper()} AGENT ANALYSIS:\n{result}" for agent_type, result in raw.items()]
+        if not linked or raw:
+            blocks.append(f"JIRA TICKET LINKAGES:\n{jira_linkages}")
+        sections = "\n\n".join(blocks)
+        prompt = f"""Please analyze and synthesize the metric analysis findings from the specialized agents below and create your comprehensive analysis following your instructions. Use the JIRA linkages provided below to populate the Jira id column in your release notes.
 
-JIRA TICKET LINKAGES:
-{jira_linkages}
+APR {apr_number} findings:
 
-Please create your comprehensive analysis following your instructions. Use the JIRA linkages provided above to populate the Jira id column in your release notes."""
-                
-                # Send to coordinator
-                self.agents_client.messages.create(
-                    thread_id=thread.id,
-                    role="user",
-                    content=prompt
-                )
-                
-                # Process final report with extended timeout for JIRA analysis
-                print("⏳ Coordinator analyzing patterns and linking JIRA tickets...")
-                timeout = self.agent_instances['coordinator'].metadata.get("timeout", 600)
-                run = self.agents_client.runs.create_and_process(
-                    thread_id=thread.id,
-                    agent_id=coordinator.id,
-                    timeout=timeout
-                )
-                
-                # Get final report
-                messages = list(self.agents_client.messages.list(thread_id=thread.id))
-                if messages and messages[0].role == MessageRole.AGENT:
-                    final_report = messages[0].content[0].text.value
-                    print("✅ Comprehensive report completed")
-                    return final_report
-                else:
-                    if attempt < retries:
-                        print(f"⚠️ No coordinator response, retrying...")
-                        time.sleep(5)
-                        continue
-                    else:
-                        print(f"❌ No coordinator response after {retries + 1} attempts")
-                        return "❌ Failed to generate comprehensive report"
-                        
-            except Exception as e:
-                if attempt < retries:
-                    print(f"⚠️ Coordinator error: {e}, retrying...")
-                    time.sleep(5)
-                    continue
-                else:
-                    error_msg = f"❌ Coordinator execution failed after {retries + 1} attempts: {e}"
-                    print(error_msg)
-                    return error_msg
+{sections}"""
+        if context:
+            prompt += f"\n\n{context}"
+        
+        # Process final report with extended timeout for JIRA analysis
+        print("⏳ Coordinator analyzing patterns and linking JIRA tickets...")
+        try:
+            final_report = self._run_agent_with_retries('coordinator', prompt, retries=retries)
+        except Exception as e:
+            error_msg = f"❌ Coordinator execution failed: {e}"
+            print(error_msg)
+            return error_msg
+        print("✅ Comprehensive report completed")
+        return final_report
     
-    def analyze_apr(self, apr_number: str) -> str:
+    def _stage_context(self, apr_context: AprContext, metric_results: Dict[str, str]) -> str:
+        """Build the prefetched context and per-pattern candidates shared by the linker and coordinator."""
+        if not apr_context.ok:
+            return apr_context.to_prompt_block()
+        # Index the prefetched tickets so both prompts carry only per-pattern candidates
+        candidates = self._candidate_block(apr_context.ticket_index(), metric_results)
+        return "\n\n".join(filter(None, [apr_context.to_prompt_block(include_tickets=not candidates), candidates]))
+    
+    def _stage_publish(self, apr_number: str, report: str) -> str:
+        """Publish the final report to Confluence, unless the coordinator returned a failure placeholder."""
+        if _is_failed_output(report):
+            raise StageSkipped("the coordinator produced no report to publish")
+        return create_confluence_page(f"APR {apr_number} Release Notes", report)
+    
+    def _metric_results(self, inputs: Dict[str, Any]) -> Dict[str, str]:
+        """Collect the metric stage outputs, marking stages that failed or timed out."""
+        return {
+            agent_type: inputs.get(agent_type, f"⚠️ {agent_type.upper()} analysis unavailable (stage failed or timed out)")
+            for agent_type in self.metric_agents
+        }
+    
+    def _stage_tool_inputs(self, apr_number: str, stage_name: str) -> Optional[List[Any]]:
+        """
+        Fetch the tool results a stage consumes, for its checkpoint and stage cache keys.
+        
+        Calls go through the run's tool cache, so the stage's own calls for the same
+        data are free. The prefetch consumes the PR list; linker and coordinator
+        data arrives via upstream stages.
+        Results are reduced to their columns and rows, without the statement ids,
+        status and timings that differ between executions. Metric stages also
+        include the prompts they send, which depend on the shard threshold and on
+        how inlined rows are rendered.
+        
+        Returns:
+            Optional[List[Any]]: Tool data, or None if any call failed (the stage is then not cached)
+        """
+        if stage_name != 'prefetch' and stage_name not in METRIC_TOOLS:
+            return []
+        try:
+            apr = int(apr_number)
+        except ValueError:
+            return None
+        if stage_name == 'prefetch':
+            result = self.tool_cache.call(get_PRs_from_apr, apr)
+            return None if is_error_result(result) else [result_data(result)]
+        results = [
+            self.tool_cache.call(METRIC_TOOLS[stage_name], apr),
+            self.tool_cache.call(get_PRs_from_apr, apr),
+            self.tool_cache.call(get_feature_rankings),
+        ]
+        if any(is_error_result(result) for result in results):
+            return None
+        prompts, _ = self._metric_prompts(apr_number, self._metric_rows(apr_number, stage_name))
+        return [result_data(result) for result in results] + [prompts]
+    
+    def _checkpointed(self, apr_number: str, stage: Stage, resume: bool):
+        """
+        Wrap a stage function so its output is checkpointed and cached.
+        
+        The key covers the stage's agent configuration, the outputs of its upstream
+        stages and the tool results it consumes (the PR list for the prefetch, the
+        query results and prompts of metric stages), so a stage only resumes if its
+        inputs are unchanged. Agent stages whose tool results could be fetched are
+        also looked up in the stage cache under the same key.
+        """
+        func = stage.func
+        agent = self.agent_instances.get(stage.name)
+        config = config_hash(agent.to_create_params()) if agent else None
+        encode, decode = (asdict, AprContext.from_dict) if stage.name == 'prefetch' else (None, None)
+        
+        def run(inputs: Dict[str, Any]) -> Any:
+            with span(f"stage {stage.name}", apr_number=apr_number, stage=stage.name) as current, \
+                    self.accounting.stage(apr_number, stage.name):
+                output = checkpointed(inputs)
+                current.set_attribute("failed", _is_failed_output(output))
+                return output
+        
+        def checkpointed(inputs: Dict[str, Any]) -> Any:
+            tool_inputs = self._stage_tool_inputs(apr_number, stage.name)
+            key = fingerprint(stage.name, config, inputs, tool_inputs)
+            if resume:
+                saved = self.checkpoints.load(apr_number, stage.name, key)
+                if saved is not None:
+                    print(f"⏭️ Resuming {stage.name} from checkpoint")
+                    set_attributes(resumed=True)
+                    current_stage().source = "checkpoint"
+                    return decode(saved) if decode else saved
+            
+            cache_key = None
+            if agent and tool_inputs is not None:
+                cache_key = key
+                cached = self.stage_cache.get(apr_number, stage.name, cache_key)
+                set_attributes(stage_cache_hit=cached is not None)
+                if cached is not None:
+                    print(f"📦 {stage.name} output served from stage cache")
+                    current_stage().source = "cache"
+                    return cached
+            
+            output = func(inputs)
+            if not _is_failed_output(output):
+                self.checkpoints.save(apr_number, stage.name, key, encode(output) if encode else output)
+                if cache_key:
+                    self.stage_cache.put(apr_number, stage.name, cache_key, output)
+            return output
+        return run
+    
+    def build_pipeline(self, apr_number: str, publish: bool = False, resume: bool = False,
+                       deadline: Optional[Deadline] = None) -> Pipeline:
+        """
+        Build the stage DAG for one APR.
+        
+        The prefetch and all metric stages run concurrently; the linker and the
+        coordinator wait for them to settle and work with whatever succeeded.
+        
+        Args:
+            apr_number: APR number to analyze
+            publish: Add a stage publishing the final report to Confluence
+            resume: Restore stages completed by an earlier run from their checkpoints
+            deadline: Time budget of the analysis
+            
+        Returns:
+            Pipeline: Stages of the analysis
+        """
+        metrics = tuple(self.metric_agents)
+        stages = [Stage('prefetch', lambda inputs: self.prefetch_context(apr_number))]
+        for agent_type in metrics:
+            stages.append(Stage(
+                agent_type,
+                lambda inputs, agent_type=agent_type: self.run_metric_analysis(apr_number, agent_type),
+                timeout=METRIC_STAGE_TIMEOUT
+            ))
+        stages.append(Stage(
+            'context',
+            lambda inputs: self._stage_context(inputs['prefetch'], self._metric_results(inputs)),
+            requires=('prefetch',), uses=metrics
+        ))
+        stages.append(Stage(
+            'jira_linker',
+            lambda inputs: self.run_jira_linking_analysis(
+                apr_number, self._metric_results(inputs), inputs.get('context', "")
+            ),
+            uses=metrics + ('context',)
+        ))
+        stages.append(Stage(
+            'coordinator',
+            lambda inputs: self.create_final_report(
+                apr_number, self._metric_results(inputs),
+                inputs.get('jira_linker', "No linkages found"), inputs.get('context', "")
+            ),
+            uses=metrics + ('context', 'jira_linker')
+        ))
+        if publish:
+            stages.append(Stage(
+                'publish',
+                lambda inputs: self._stage_publish(apr_number, inputs['coordinator']),
+                requires=('coordinator',)
+            ))
+        
+        # Every stage output is persisted so a failed or interrupted run can resume
+        for stage in stages:
+            stage.func = self._checkpointed(apr_number, stage, resume)
+        return Pipeline(stages, deadline=deadline)
+    
+    def analyze_apr(self, apr_number: str, publish: bool = False, resume: bool = False,
+                    shared_cache: bool = False, cancel_with: Optional[Deadline] = None) -> str:
         """
         Run complete APR analysis across all metrics.
         
         Args:
             apr_number: APR number to analyze
+            publish: Publish the final report to Confluence
+            resume: Skip stages completed by an earlier run of this APR
+            shared_cache: The tool cache is shared with other analyses (batch mode);
+                do not clear it or report its statistics here
+            cancel_with: Deadline of a batch of analyses; cancelling it cancels this analysis
             
         Returns:
-            str: Final comprehensive report
+            str: Final comprehensive report, or a partial report of the completed
+                stages if the time budget ran out or the analysis was interrupted
         """
         print(f"\n🚀 Starting comprehensive APR {apr_number} analysis...")
         print("=" * 60)
         
-        # Run all metric analyses (focusing on PAV, PPA, DUP only)
-        results = {}
-        metric_agents = ['pav', 'ppa', 'dup']
+        # Tool results are memoized for the duration of this run only
+        self.accounting.clear(apr_number)
+        if not shared_cache:
+            self.tool_cache.clear()
+            self.stage_cache.clear_stats()
         
-        for agent_type in metric_agents:
-            results[agent_type] = self.run_metric_analysis(apr_number, agent_type)
-        
-        # Run JIRA linking analysis
-        print("🔗 Running JIRA ticket linking analysis...")
-        jira_linkages = self.run_jira_linking_analysis(apr_number, results)
-        
-        # Create final comprehensive report with linkages
-        final_report = self.create_final_report(
-            apr_number, 
-            results['pav'], 
-            results['ppa'],
-            results['dup'],
-            jira_linkages
-        )
+        # Prefetch and metric agents run concurrently, then linker, coordinator (and publish)
+        deadline = Deadline(self.time_budget, parent=cancel_with)
+        with deadline_scope(deadline), \
+                span("analyze_apr", apr_number=apr_number, metric_agents=",".join(self.metric_agents)) as current:
+            outcome = self.build_pipeline(apr_number, publish, resume, deadline).run()
+            current.set_attribute("failed_stages", ",".join(outcome.errors))
         
         print("=" * 60)
+        print(outcome.summary())
+        print(self.accounting.report(apr_number))
+        print(f"📊 Accounting summary written to {self.accounting.save(apr_number)}")
+        if not shared_cache:
+            print(self.tool_cache.report())
+            print(self.stage_cache.report())
+        if 'publish' in outcome.results:
+            print(outcome.results['publish'])
         print(f"🎉 APR {apr_number} analysis complete!")
-        return final_report
+        
+        report = outcome.results.get('coordinator')
+        if report is not None and not _is_failed_output(report):
+            return report
+        if deadline.expired:
+            reason = "was interrupted" if deadline.cancelled else f"ran out of its {deadline.seconds:g}s time budget"
+            return self._partial_report(apr_number, outcome, reason)
+        if report is not None:
+            return report
+        return f"❌ Failed to generate comprehensive report: {outcome.errors.get('coordinator')}"
+    
+    def _partial_report(self, apr_number: str, outcome: PipelineResult, reason: str) -> str:
+        """
+        Assemble the best report available when the coordinator did not finish in time.
+        
+        Args:
+            apr_number: APR number analyzed
+            outcome: Results of the stages that completed
+            reason: Why the analysis stopped early
+            
+        Returns:
+            str: Validated findings of the completed metric stages, with the linker's
+                tickets if it finished, marked as partial
+        """
+        metric_results = {
+            agent_type: outcome.results[agent_type] for agent_type in self.metric_agents
+            if agent_type in outcome.results and not _is_failed_output(outcome.results[agent_type])
+        }
+        structured, raw = self._parse_structured(metric_results)
+        linkages = outcome.results.get('jira_linker')
+        if linkages and _is_failed_output(linkages):
+            linkages = None
+        linked = False
+        if linkages:
+            try:
+                apply_links(structured, parse_links(linkages))
+                linked = True
+            except StructuredOutputError:
+                pass
+        
+        blocks = [f"⚠️ PARTIAL REPORT for APR {apr_number}: the analysis {reason} before the coordinator finished. "
+                  "Below are the metric agents' validated findings, not a synthesized report."]
+        missing = [agent_type.upper() for agent_type in self.metric_agents if agent_type not in metric_results]
+        if missing:
+            blocks.append(f"Missing metric analyses: {', '.join(missing)}")
+        if structured:
+            blocks.append(format_findings(structured, with_links=linked))
+        blocks += [f"{agent_type.upper()} AGENT ANALYSIS:\n{result}" for agent_type, result in raw.items()]
+        if linkages and not linked:
+            blocks.append(f"JIRA TICKET LINKAGES:\n{linkages}")
+        return "\n\n".join(blocks)
+    
+    def analyze_aprs(self, apr_numbers: Sequence[str], jobs: int = 1, publish: bool = False,
+                     resume: bool = False) -> Dict[str, str]:
+        """
+        Analyze several APRs with the deployed agents, at most `jobs` at a time.
+        
+        All analyses share this orchestrator's agents, client and tool cache, so
+        tool results common to several APRs (e.g. feature rankings) are fetched once.
+        The analyses run on pool threads, which never see Ctrl-C: the first one
+        cancels their deadlines and waits for their partial reports, a second one aborts.
+        
+        Args:
+            apr_numbers: APR numbers to analyze
+            jobs: Maximum number of APRs analyzed concurrently
+            publish: Publish each final report to Confluence
+            resume: Skip stages completed by earlier runs
+            
+        Returns:
+            Dict[str, str]: Final report per APR, in input order
+        """
+        self.tool_cache.clear()
+        self.stage_cache.clear_stats()
+        # Each analysis sets its own time budget when it starts, under this cancellable parent
+        batch = Deadline()
+        with ThreadPoolExecutor(max_workers=max(1, jobs), thread_name_prefix="apr") as executor:
+            futures = {
+                apr_number: executor.submit(self.analyze_apr, apr_number, publish, resume, True, batch)
+                for apr_number in apr_numbers
+            }
+            reports = {}
+            for apr_number, future in futures.items():
+                while apr_number not in reports:
+                    try:
+                        reports[apr_number] = future.result()
+                    except KeyboardInterrupt:
+                        if batch.cancelled:
+                            raise
+                        print("\n🛑 Interrupted - cancelling running analyses (press Ctrl-C again to abort)")
+                        batch.cancel()
+                    except Exception as e:
+                        reports[apr_number] = f"❌ APR {apr_number} analysis failed: {e}"
+        print(self.tool_cache.report())
+        print(self.stage_cache.report())
+        return reports
     
     def cleanup(self):
-        """Clean up all deployed agents."""
+        """Clean up open threads and all deployed agents (reused agents are kept for the next run)."""
+        for thread_id in list(self.threads):
+            self._delete_thread(thread_id)
+        
         print("\n🧹 Cleaning up agents...")
+        if self.reuse_agents:
+            print(f"♻️ Keeping {len(self.agents)} agents deployed for reuse")
+            return
         for agent_type, agent in self.agents.items():
             try:
                 self.agents_client.delete_agent(agent.id)
@@ -0,0 +1,210 @@
+"""
+Stage Pipeline
+
+This module contains a small DAG executor for the APR analysis stages. Each
+stage declares the stages it needs; stages whose inputs are settled run
+concurrently on a thread pool, so independent work (the metric agents, the
+prefetch) overlaps and adding another metric stage does not lengthen the
+wall-clock time of an analysis.
+
+Inputs come in two kinds:
+    requires: the stage cannot run without them and is skipped if one fails
+    uses:     the stage waits for them to settle but runs with whatever
+              succeeded (partial progress, e.g. the coordinator starting with
+              the metric stages that finished before their deadline)
+"""
+
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from apis.deadline import Deadline, DeadlineExceeded, deadline_scope
+
+# How often a waiting pipeline checks its deadline, and how long stages get to cancel
+# their runs and return once it has passed before they are abandoned
+DEADLINE_CHECK_INTERVAL = 1.0
+CANCEL_GRACE = 15.0
+
+
+def submit_in_context(executor: Executor, func: Callable, *args, **kwargs) -> Future:
+    """
+    Submit work to a thread pool in a copy of the caller's context.
+
+    Pool threads do not inherit context variables, so without this the
+    submitted work would lose the caller's tracing span, stage account and deadline.
+    """
+    return executor.submit(contextvars.copy_context().run, func, *args, **kwargs)
+
+
+class StageSkipped(Exception):
+    """Raised for a stage that did not run because a required input failed."""
+
+
+@dataclass
+class Stage:
+    """
+    One node of the pipeline.
+
+    The stage function receives a dict holding the results of every required
+    and used input that succeeded.
+    """
+    name: str
+    func: Callable[[Dict[str, Any]], Any]
+    requires: Tuple[str, ...] = ()
+    uses: Tuple[str, ...] = ()
+    timeout: Optional[float] = None
+
+    @property
+    def inputs(self) -> Tuple[str, ...]:
+        """All stages this stage waits for."""
+        return self.requires + self.uses
+
+
+@dataclass
+class PipelineResult:
+    """Outcome of a pipeline run."""
+    results: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, Exception] = field(default_factory=dict)
+    durations: Dict[str, float] = field(default_factory=dict)
+
+    def summary(self) -> str:
+        """Render per-stage status and duration for the console."""
+        lines = ["⏱️ Stage timings:"]
+        for name, duration in self.durations.items():
+            status = f"❌ {self.errors[name]}" if name in self.errors else "✅"
+            lines.append(f"   {name}: {duration:.1f}s {status}")
+        return "\n".join(lines)
+
+
+class Pipeline:
+    """Runs stages in dependency order, concurrently where the DAG allows."""
+
+    def __init__(self, stages: List[Stage], max_workers: Optional[int] = None, deadline: Optional[Deadline] = None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            stages: Stages to run; inputs must name other stages of the pipeline
+            max_workers: Maximum number of stages running at once (default: all)
+            deadline: Time budget of the whole run; once it passes (or is cancelled
+                with Ctrl-C) no further stage starts and running stages are abandoned
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        self.max_workers = max_workers or len(stages)
+        self.deadline = deadline or Deadline()
+        for stage in stages:
+            unknown = [name for name in stage.inputs if name not in self.stages]
+            if unknown:
+                raise ValueError(f"stage {stage.name} depends on unknown stages: {', '.join(unknown)}")
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        visiting, visited = set(), set()
+
+        def visit(name: str):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"stage dependency cycle through {name}")
+            visiting.add(name)
+            for upstream in self.stages[name].inputs:
+                visit(upstream)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    def _call(self, stage: Stage, inputs: Dict[str, Any], deadline: Deadline) -> Any:
+        # The stage's runs and statements see its own deadline, so a timed out stage can be cancelled alone
+        # (retries happen inside the stage, through the orchestrator's RetryPolicy)
+        with deadline_scope(deadline):
+            return stage.func(inputs)
+
+    def run(self) -> PipelineResult:
+        """
+        Run every stage.
+
+        Each stage runs under a deadline ending at its timeout (and no later than
+        the pipeline's), which its agent runs, retry policy and statements observe.
+        A stage that exceeds its timeout is recorded as failed and its dependents
+        proceed without it; its deadline is cancelled so its in-flight agent runs
+        and statements are cancelled too, and the pipeline does not wait for it. The
+        first Ctrl-C cancels the deadline so stages wind down cooperatively, a
+        second one aborts.
+
+        Returns:
+            PipelineResult: Results, errors and durations per stage
+        """
+        outcome = PipelineResult()
+        pending = dict(self.stages)
+        running: Dict[Future, Tuple[Stage, float, Deadline]] = {}
+        expired_at: Optional[float] = None
+
+        def settled(name: str) -> bool:
+            return name in outcome.results or name in outcome.errors
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stage")
+        try:
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    if not all(settled(upstream) for upstream in stage.inputs):
+                        continue
+                    del pending[name]
+                    failed = [upstream for upstream in stage.requires if upstream in outcome.errors]
+                    if self.deadline.expired:
+                        outcome.errors[name] = StageSkipped("deadline exceeded before the stage could start")
+                        outcome.durations[name] = 0.0
+                        continue
+                    if failed:
+                        outcome.errors[name] = StageSkipped(f"required stage {', '.join(failed)} failed")
+                        outcome.durations[name] = 0.0
+                        continue
+                    inputs = {upstream: outcome.results[upstream] for upstream in stage.inputs if upstream in outcome.results}
+                    # A stage's timeout is its own deadline, so retries inside it stop in time
+                    deadline = Deadline(stage.timeout, parent=self.deadline)
+                    future = submit_in_context(executor, self._call, stage, inputs, deadline)
+                    running[future] = (stage, time.monotonic(), deadline)
+
+                if not running:
+                    continue
+
+                now = time.monotonic()
+                deadlines = [started + stage.timeout - now for stage, started, _ in running.values() if stage.timeout]
+                # Wake up periodically so an expired or cancelled deadline is noticed
+                deadlines.append(DEADLINE_CHECK_INTERVAL)
+                try:
+                    wait(running, timeout=max(0.0, min(deadlines)), return_when=FIRST_COMPLETED)
+                except KeyboardInterrupt:
+                    if self.deadline.cancelled:
+                        raise
+                    print("\n🛑 Interrupted - cancelling running stages (press Ctrl-C again to abort)")
+                    self.deadline.cancel()
+
+                now = time.monotonic()
+                if expired_at is None and self.deadline.expired:
+                    expired_at = now
+                for future in list(running):
+                    stage, started, deadline = running[future]
+                    if future.done():
+                        error = future.exception()
+                        if error is None:
+                            outcome.results[stage.name] = future.result()
+                        else:
+                            outcome.errors[stage.name] = error
+                    elif stage.timeout and now - started >= stage.timeout:
+                        outcome.errors[stage.name] = TimeoutError(f"stage timed out after {stage.timeout:g}s")
+                        deadline.cancel()
+                    elif expired_at is not None and now - expired_at >= CANCEL_GRACE:
+                        # The stage did not wind down after the deadline; stop waiting for it
+                        outcome.errors[stage.name] = DeadlineExceeded("stage abandoned at the deadline")
+                    else:
+                        continue
+                    outcome.durations[stage.name] = now - started
+                    del running[future]
+        finally:
+            # Do not block on abandoned stages; their deadlines are cancelled and they wind down on their own
+            executor.shutdown(wait=False)
+        return outcome
@@ -0,0 +1,210 @@
+"""
+Retry Policies
+
+This module contains the retry policy shared by the agent stages. Errors are
+classified before anything is resent: rate limits (429), server errors (5xx),
+timeouts, dropped connections and empty agent replies are retried with
+exponential backoff and jitter, waiting at least as long as the server's
+Retry-After asks; authentication errors and bad requests fail immediately
+instead of burning more full LLM runs. Retrying also stops at the policy's
+total deadline, or earlier at the deadline of the current stage or analysis.
+"""
+
+import random
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Optional
+
+import requests
+from azure.core.exceptions import ServiceRequestError, ServiceResponseError
+
+from apis.deadline import DeadlineExceeded, current_deadline
+from orchestrator.accounting import record_retry
+from orchestrator.telemetry import set_attributes
+
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+# Run error codes reported in run.last_error that are worth another run
+RETRYABLE_RUN_ERROR_CODES = {'rate_limit_exceeded', 'server_error'}
+
+# Rate limit messages carry the wait in their text, e.g. "Please try again in 20 seconds."
+_RETRY_IN_RE = re.compile(r'(?:try again|retry) (?:in|after) (\d+(?:\.\d+)?) ?s', re.IGNORECASE)
+
+
+class EmptyResponseError(RuntimeError):
+    """Raised when an agent run completed without producing a reply."""
+
+
+class RunFailedError(RuntimeError):
+    """Raised when an agent run ends in a status other than completed."""
+
+    def __init__(self, run_id: str, status: str, code: Optional[str] = None, message: str = ""):
+        """
+        Initialize the error.
+
+        Args:
+            run_id: Failed run
+            status: Final status of the run (failed, cancelled, expired)
+            code: Error code from run.last_error, if any
+            message: Error message from run.last_error, if any
+        """
+        super().__init__(f"run {run_id} ended with status {status}" + (f": {code} - {message}" if code else ""))
+        self.run_id = run_id
+        self.status = status
+        self.code = code
+        self.message = message
+
+    @classmethod
+    def from_run(cls, run: Any) -> "RunFailedError":
+        """Build the error from a finished run."""
+        last_error = getattr(run, 'last_error', None)
+        return cls(run.id, run.status, getattr(last_error, 'code', None), getattr(last_error, 'message', "") or "")
+
+
+@dataclass(frozen=True)
+class ErrorClass:
+    """Classification of a failed attempt."""
+    retryable: bool
+    reason: str
+    retry_after: Optional[float] = None
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status if isinstance(status, int) else None
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """
+    Get the wait a server asked for before the next attempt.
+
+    Reads the retry-after-ms and Retry-After response headers (seconds or an
+    HTTP date), falling back to a wait stated in the error message.
+
+    Args:
+        error: Failed attempt
+
+    Returns:
+        Optional[float]: Seconds to wait, or None if the server did not say
+    """
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    for header in ('retry-after-ms', 'x-ms-retry-after-ms'):
+        try:
+            return max(0.0, float(headers[header]) / 1000)
+        except (KeyError, TypeError, ValueError):
+            pass
+    value = headers.get('Retry-After') if hasattr(headers, 'get') else None
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+    match = _RETRY_IN_RE.search(str(error))
+    return float(match.group(1)) if match else None
+
+
+def classify_error(error: Exception) -> ErrorClass:
+    """
+    Decide whether a failed attempt is worth retrying.
+
+    Args:
+        error: Failed attempt
+
+    Returns:
+        ErrorClass: Whether to retry, why, and the server's requested wait
+    """
+    if isinstance(error, DeadlineExceeded):
+        return ErrorClass(False, "deadline exceeded")
+    if isinstance(error, EmptyResponseError):
+        return ErrorClass(True, "empty response")
+    if isinstance(error, RunFailedError):
+        if error.status == 'expired' or error.code in RETRYABLE_RUN_ERROR_CODES:
+            return ErrorClass(True, error.code or error.status, retry_after(error))
+        if error.code:
+            return ErrorClass(False, error.code)
+        return ErrorClass(True, f"run {error.status}")
+
+    status = _status_code(error)
+    if status is not None:
+        if status in RETRYABLE_STATUS_CODES or status >= 500:
+            return ErrorClass(True, f"HTTP {status}", retry_after(error))
+        return ErrorClass(False, f"HTTP {status}")
+
+    if isinstance(error, (TimeoutError, ConnectionError, ServiceRequestError, ServiceResponseError,
+                          requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return ErrorClass(True, type(error).__name__)
+    if isinstance(error, (ValueError, TypeError, KeyError, AttributeError)):
+        # A malformed request or a bug; resending the same prompt cannot fix it
+        return ErrorClass(False, type(error).__name__)
+    return ErrorClass(True, type(error).__name__)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter, bounded by attempts and a total deadline."""
+    max_attempts: int = 3
+    base_delay: float = 2.0
+    max_delay: float = 60.0
+    deadline: Optional[float] = 1800.0
+
+    def delay(self, attempt: int, requested: Optional[float] = None) -> float:
+        """
+        Get the wait before the next attempt.
+
+        Args:
+            attempt: Number of the attempt that just failed (1-based)
+            requested: Wait the server asked for (Retry-After), a lower bound
+
+        Returns:
+            float: Seconds to wait
+        """
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        return max(backoff, requested) if requested is not None else backoff
+
+    def call(self, func: Callable, *args, label: str = "call", **kwargs) -> Any:
+        """
+        Call a function, retrying retryable failures.
+
+        Args:
+            func: Function to call
+            *args: Positional arguments for the function
+            label: Name of the operation in console messages
+            **kwargs: Keyword arguments for the function
+
+        Returns:
+            Any: Result of the first successful attempt
+
+        Raises:
+            Exception: The last error, once it is fatal, attempts are exhausted or
+                the next wait would pass the deadline
+        """
+        started = time.monotonic()
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                error_class = classify_error(e)
+                if not error_class.retryable:
+                    print(f"❌ {label} failed with a non-retryable error ({error_class.reason}), not retrying")
+                    raise
+                if attempt == self.max_attempts:
+                    raise
+                wait = self.delay(attempt, error_class.retry_after)
+                if self.deadline is not None and time.monotonic() - started + wait > self.deadline:
+                    print(f"❌ {label} failed ({error_class.reason}) and the retry deadline of {self.deadline:g}s is reached")
+                    raise
+                remaining = current_deadline().remaining()
+                if remaining is not None and wait >= remaining:
+                    print(f"❌ {label} failed ({error_class.reason}) and the stage or analysis deadline leaves no time to retry")
+                    raise
+                print(f"⚠️ {label} failed ({error_class.reason}: {e}), retry {attempt}/{self.max_attempts - 1} in {wait:.1f}s...")
+                record_retry()
+                set_attributes(retries=attempt)
+                current_deadline().sleep(wait)
@@ -0,0 +1,146 @@
+"""
+APR Context Prefetch
+
+This module contains the deterministic prefetch stage that gathers an APR's
+pull requests and Jira tickets before any agent runs. The linker and
+coordinator instructions used to have the model walk this fan-out one tool
+call per turn (PR list → every PR title → every MPOI title and description);
+here it runs once, with the HTTP calls issued concurrently, and the result is
+injected into both agents' prompts.
+"""
+
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import agent_tools
+from agent_tools import parse_pr_numbers, extract_mpoi_keys, statement_error
+from linking import TicketIndex
+from orchestrator.pipeline import submit_in_context
+from orchestrator.tool_cache import ToolCallCache
+
+
+@dataclass
+class AprContext:
+    """PRs and Jira tickets of one APR, gathered by the prefetch stage."""
+    apr_number: str
+    pr_titles: Dict[str, str] = field(default_factory=dict)
+    ticket_prs: Dict[str, List[str]] = field(default_factory=dict)
+    tickets: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'AprContext':
+        """Rebuild a context serialized with dataclasses.asdict (e.g. a stage checkpoint)."""
+        return cls(
+            apr_number=data['apr_number'],
+            pr_titles=data.get('pr_titles', {}),
+            ticket_prs=data.get('ticket_prs', {}),
+            tickets={key: tuple(value) for key, value in data.get('tickets', {}).items()},
+            error=data.get('error')
+        )
+
+    @property
+    def ok(self) -> bool:
+        """Whether the PR list could be fetched."""
+        return self.error is None
+
+    def ticket_index(self) -> TicketIndex:
+        """Build the local candidate index over the prefetched tickets."""
+        return TicketIndex.from_texts(self.tickets)
+
+    def to_prompt_block(self, include_tickets: bool = True, description_chars: int = 300) -> str:
+        """
+        Render the context as a compact prompt block.
+
+        Args:
+            include_tickets: Include every ticket's title and description (skip when
+                per-pattern candidate details are sent instead)
+            description_chars: Maximum description length per ticket
+
+        Returns:
+            str: Prompt block; if prefetching failed, a note asking the agent to fetch the context itself
+        """
+        if not self.ok:
+            return (f"APR {self.apr_number} CONTEXT COULD NOT BE PREFETCHED ({self.error}): fetch the PRs and "
+                    f"MPOI tickets yourself with get_PRs_from_apr, get_pull_request_title and get_jira_ticket_title.")
+
+        lines = [f"PREFETCHED APR {self.apr_number} CONTEXT ({len(self.pr_titles)} PRs, {len(self.tickets)} MPOI tickets; "
+                 f"already fetched, do NOT call get_PRs_from_apr, get_pull_request_title or get_jira_ticket_title again):"]
+        lines.append("PULL REQUESTS:")
+        for pr_id, title in self.pr_titles.items():
+            lines.append(f"- PR {pr_id}: {title}")
+        if not self.pr_titles:
+            lines.append("- None (no PRs found, cannot extract MPOI tickets)")
+
+        if include_tickets:
+            lines.append("MPOI TICKETS:")
+            for key, (title, description) in self.tickets.items():
+                description = " ".join((description or "").split())
+                if len(description) > description_chars:
+                    description = description[:description_chars].rstrip() + "…"
+                lines.append(f"- {key} (PR {', '.join(self.ticket_prs.get(key, []))}): {title}\n  {description}")
+            if not self.tickets:
+                lines.append("- None")
+        return "\n".join(lines)
+
+
+def _map(executor: Executor, func: Callable, items: List[Any]) -> List[Any]:
+    """Map func over items on the pool, keeping the caller's tracing context."""
+    futures = [submit_in_context(executor, func, item) for item in items]
+    return [future.result() for future in futures]
+
+
+def prefetch_apr_context(apr_number: str, max_workers: int = 8, cache: Optional[ToolCallCache] = None) -> AprContext:
+    """
+    Gather an APR's PR titles and MPOI tickets with concurrent HTTP calls.
+
+    Args:
+        apr_number: APR number to analyze
+        max_workers: Maximum number of concurrent HTTP requests
+        cache: Run-scoped tool cache; prefetched results are stored in it so that
+            agents asking for the same PRs and tickets later get them for free
+
+    Returns:
+        AprContext: Prefetched context (with error set if the PR list could not be fetched)
+    """
+    tool = cache.wrap if cache else (lambda func: func)
+    get_ticket_title = tool(agent_tools.get_jira_ticket_title)
+    get_ticket_description = tool(agent_tools.get_jira_ticket_description)
+
+    context = AprContext(apr_number)
+    try:
+        response = tool(agent_tools.get_PRs_from_apr)(int(apr_number))
+    except Exception as e:
+        context.error = str(e)
+        return context
+    # A failed query must not pass for an APR without PRs
+    context.error = statement_error(response)
+    if context.error:
+        return context
+    pr_ids = parse_pr_numbers(response)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        titles = _map(executor, tool(agent_tools.get_pull_request_title), pr_ids)
+        context.pr_titles = dict(zip(pr_ids, titles))
+
+        for pr_id, title in context.pr_titles.items():
+            for key in extract_mpoi_keys(title):
+                context.ticket_prs.setdefault(key, []).append(pr_id)
+
+        keys = list(context.ticket_prs)
+        found = agent_tools.get_jira_tickets(keys) if keys else {}
+        if cache:
+            for key, (title, description) in found.items():
+                cache.put(agent_tools.get_jira_ticket_title, title, key)
+                cache.put(agent_tools.get_jira_ticket_description, description, key)
+
+        missing = [key for key in keys if key not in found]
+        if missing:
+            # Bulk search unavailable or incomplete, fetch the rest one ticket at a time
+            missing_titles = _map(executor, get_ticket_title, missing)
+            missing_descriptions = _map(executor, get_ticket_description, missing)
+            found.update(zip(missing, zip(missing_titles, missing_descriptions)))
+        context.tickets = {key: found[key] for key in keys}
+
+    return context
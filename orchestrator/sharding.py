@@ -0,0 +1,152 @@
+"""
+Metric Row Sharding
+
+This module contains the map-reduce split of large metric results. An APR with
+hundreds of significant rows makes one metric agent reason over all of them in
+one context, and its latency grows faster than the row count. Above a row
+threshold the rows are partitioned by definitiontag group (shop, amenity,
+tourism, ...), falling back to exact definitiontags and then to blocks of
+countries for groups that are still too large, and every shard is analyzed by
+its own agent run in parallel.
+
+Patterns can span shards two ways: single-country patterns across several
+definitiontags, and multi-country patterns of a definitiontag whose countries
+were split into blocks. The reduce step merges those per country or
+definitiontag and direction, removes duplicates and renumbers the patterns.
+"""
+
+import math
+from dataclasses import replace
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from orchestrator.metric_rows import MetricRows
+from orchestrator.structured_output import Pattern
+
+# Results with more rows than this are sharded
+SHARD_ROW_THRESHOLD = 150
+# Target rows per shard, and the most shards (parallel runs) per metric stage
+SHARD_ROWS = 80
+MAX_SHARDS = 6
+
+
+def _split_group(rows: List[List], tag_index: int, country_index: int, max_rows: int) -> List[List[List]]:
+    """Split a definitiontag group larger than max_rows by definitiontag, then by country blocks."""
+    if len(rows) <= max_rows:
+        return [rows]
+    units = []
+    by_tag: Dict[str, List[List]] = {}
+    for row in rows:
+        by_tag.setdefault(str(row[tag_index]), []).append(row)
+    for tag_rows in by_tag.values():
+        if len(tag_rows) <= max_rows:
+            units.append(tag_rows)
+            continue
+        # One definitiontag in many countries: keep each country's rows together
+        tag_rows = sorted(tag_rows, key=lambda row: str(row[country_index]))
+        units += [tag_rows[start:start + max_rows] for start in range(0, len(tag_rows), max_rows)]
+    return units
+
+
+def _pack(units: List[List[List]], capacity: int) -> List[List[List]]:
+    """First-fit decreasing bin packing of row units into shards of at most capacity rows."""
+    shards: List[List[List]] = []
+    for unit in sorted(units, key=len, reverse=True):
+        for shard in shards:
+            if len(shard) + len(unit) <= capacity:
+                shard.extend(unit)
+                break
+        else:
+            shards.append(list(unit))
+    return shards
+
+
+def shard_rows(rows: MetricRows, max_rows: int = SHARD_ROWS, max_shards: int = MAX_SHARDS) -> List[MetricRows]:
+    """
+    Partition metric rows into shards for parallel agent runs.
+
+    Args:
+        rows: Complete metric result
+        max_rows: Target number of rows per shard
+        max_shards: Maximum number of shards; shards grow beyond max_rows to stay within it
+
+    Returns:
+        List[MetricRows]: Shards, largest first (a single shard if the rows lack the
+            country and definitiontag columns)
+    """
+    if 'definitiontag' not in rows.columns or 'country' not in rows.columns:
+        return [rows]
+    tag_index, country_index = rows.columns.index('definitiontag'), rows.columns.index('country')
+
+    groups: Dict[str, List[List]] = {}
+    for row in rows.rows:
+        groups.setdefault(str(row[tag_index]).split('=', 1)[0], []).append(row)
+
+    capacity = max(max_rows, math.ceil(len(rows.rows) / max_shards))
+    while True:
+        units = [
+            unit for group in groups.values() for unit in _split_group(group, tag_index, country_index, capacity)
+        ]
+        shards = _pack(units, capacity)
+        if len(shards) <= max_shards:
+            break
+        capacity = math.ceil(capacity * 1.25)
+    return [MetricRows(rows.metric, rows.columns, shard, len(shard)) for shard in shards]
+
+
+def _merge_key(pattern: Pattern) -> Optional[Tuple[str, str, str]]:
+    """Key under which patterns of different shards are merged, or None for patterns that stay apart."""
+    if len(pattern.definitiontags) == 1:
+        # A definitiontag in different shards was split into country blocks
+        return 'definitiontag', pattern.definitiontags[0], pattern.direction
+    if len(pattern.countries) == 1:
+        return 'country', pattern.countries[0], pattern.direction
+    return None
+
+
+def merge_shard_patterns(metric: str, shard_patterns: Sequence[List[Pattern]]) -> List[Pattern]:
+    """
+    Reduce the patterns of all shards into one validated list.
+
+    Patterns of the same definitiontag and direction found in different shards
+    are merged into one multi-country pattern, single-country patterns of the same
+    country and direction into one multi-category pattern; duplicates are dropped
+    and ids are renumbered.
+
+    Args:
+        metric: Metric type (PAV, PPA, SUP, DUP)
+        shard_patterns: Validated patterns of each shard
+
+    Returns:
+        List[Pattern]: Merged patterns with ids METRIC-1, METRIC-2, ...
+    """
+    metric = metric.upper()
+    merged: List[Pattern] = []
+    # Merge key → shard and pattern that first reported the definitiontag or country
+    owners: Dict[Tuple[str, str, str], Tuple[int, Pattern]] = {}
+    for shard, patterns in enumerate(shard_patterns):
+        for pattern in patterns:
+            pattern = replace(pattern, metrics=list(pattern.metrics))
+            key = _merge_key(pattern)
+            if key is not None:
+                owner_shard, owner = owners.setdefault(key, (shard, pattern))
+                if owner_shard != shard:
+                    kind, subject, direction = key
+                    owner.metrics.extend(m for m in pattern.metrics if m not in owner.metrics)
+                    if kind == 'definitiontag':
+                        owner.title = f"{subject} {metric} {direction}s in {len(owner.countries)} countries"
+                    else:
+                        owner.title = f"{subject} {metric} {direction}s across {len(owner.definitiontags)} categories"
+                    if owner.flag_reason != pattern.flag_reason:
+                        owner.flag_reason = 'both'
+                    continue
+            merged.append(pattern)
+
+    patterns, seen = [], set()
+    for pattern in merged:
+        signature = frozenset((m.key, m.value) for m in pattern.metrics)
+        if signature in seen:
+            continue
+        seen.add(signature)
+        pattern.id, pattern.parent_id = f"{metric}-{len(patterns) + 1}", None
+        patterns.append(pattern)
+    return patterns
@@ -0,0 +1,105 @@
+"""
+Stage Output Cache
+
+This module contains the cross-run cache for agent stage outputs. Re-running
+the PAV agent or the coordinator on unchanged data produces an equivalent
+report at full LLM cost; here each agent stage's output is stored under a
+fingerprint of everything it consumes (agent instructions, model deployment
+and tool schemas, the tool results it is given or fetches first, and the
+outputs of its upstream stages), and a rerun with the same fingerprint returns
+the stored output instantly.
+
+Unlike checkpoints, which are only consulted with --resume, the stage cache
+is used by default and disabled with --no-cache.
+
+Tool results enter the fingerprint reduced to their data: a Databricks
+statement result carries a new statement_id, status and timings on every
+execution, and hashing it raw would make every key unique.
+"""
+
+import json
+import os
+from collections import Counter
+from typing import Any, Optional
+
+from orchestrator.checkpoints import DEFAULT_RUN_DIR, CheckpointStore
+
+DEFAULT_CACHE_DIR = os.path.join(DEFAULT_RUN_DIR, "cache")
+
+
+def result_data(result: Any) -> Any:
+    """
+    Reduce a tool result to the data it carries, for stage cache fingerprints.
+
+    Args:
+        result: Tool result (a Databricks statement execution response or any other text)
+
+    Returns:
+        Any: Column names and rows of a statement result; any other result unchanged
+    """
+    try:
+        document = json.loads(result)
+    except (TypeError, ValueError):
+        return result
+    if not isinstance(document, dict) or 'manifest' not in document and 'result' not in document:
+        return result
+    manifest = document.get('manifest') or {}
+    columns = [column.get('name') for column in (manifest.get('schema') or {}).get('columns', [])]
+    return {
+        'columns': columns,
+        'rows': (document.get('result') or {}).get('data_array') or [],
+        'total_row_count': manifest.get('total_row_count'),
+    }
+
+
+class StageCache:
+    """Stage outputs keyed by APR, stage and input fingerprint, persisted across runs."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, enabled: bool = True):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cached outputs
+            enabled: Serve cached outputs; when False outputs are still stored,
+                so a --no-cache run refreshes the cache
+        """
+        self.store = CheckpointStore(cache_dir)
+        self.enabled = enabled
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def get(self, apr_number: str, stage: str, key: str) -> Optional[Any]:
+        """
+        Look up a stage output.
+
+        Args:
+            apr_number: APR number
+            stage: Stage name
+            key: Fingerprint of the stage inputs
+
+        Returns:
+            Optional[Any]: Cached output, or None on a miss or when the cache is disabled
+        """
+        output = self.store.load(apr_number, stage, key) if self.enabled else None
+        (self.misses if output is None else self.hits)[stage] += 1
+        return output
+
+    def put(self, apr_number: str, stage: str, key: str, output: Any):
+        """Store a stage output under its input fingerprint."""
+        self.store.save(apr_number, stage, key, output)
+
+    def clear_stats(self):
+        """Reset hit and miss counts (start of a new run)."""
+        self.hits.clear()
+        self.misses.clear()
+
+    def report(self) -> str:
+        """Render which stages were served from the cache."""
+        if not self.enabled:
+            return "📦 Stage cache: disabled (--no-cache)"
+        total = sum(self.hits.values()) + sum(self.misses.values())
+        if not total:
+            return "📦 Stage cache: no cacheable stages"
+        served = ", ".join(sorted(self.hits)) or "none"
+        return f"📦 Stage cache: {sum(self.hits.values())}/{total} stages served from cache ({served})"
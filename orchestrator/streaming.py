@@ -0,0 +1,161 @@
+"""
+Streaming Agent Runs
+
+This module contains the event handler used when the orchestrator runs agents
+in streaming mode. Instead of blocking until a run has finished and then
+reading the thread, the run's server-sent events are consumed as they arrive:
+text deltas and tool calls are forwarded to a callback (the CLI prints them),
+time to first token is measured, and the stage returns on the run's completion
+event so the next stage starts without any polling delay.
+
+Tool calls requested mid-stream are executed by the agents SDK through the
+functions registered with enable_auto_function_calls. A watchdog thread
+cancels a run that outlives its timeout or deadline, which also ends a stream
+that has stalled without sending events.
+"""
+
+import sys
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from azure.ai.agents.models import (
+    AgentEventHandler, MessageDeltaChunk, MessageRole, MessageStatus, RunStatus, ThreadMessage, ThreadRun
+)
+
+from apis.deadline import Deadline
+
+# Callback signature: (agent_type, event kind, payload)
+# Kinds: "first_token" (seconds), "delta" (text), "tool_calls" (list of names), "message" (full text)
+StreamCallback = Callable[[str, str, Any], None]
+
+TERMINAL_RUN_STATUSES = (RunStatus.COMPLETED, RunStatus.FAILED, RunStatus.CANCELLED, RunStatus.EXPIRED)
+
+# How often the watchdog checks a streamed run's timeout and deadline
+WATCHDOG_INTERVAL = 1.0
+
+
+class StageEventHandler(AgentEventHandler):
+    """Collects one agent run's streamed reply and forwards its progress events."""
+
+    def __init__(self, agent_type: str, callback: Optional[StreamCallback] = None):
+        """
+        Initialize the handler.
+
+        Args:
+            agent_type: Type of agent being run (pav, ppa, dup, jira_linker, coordinator)
+            callback: Receiver for progress events
+        """
+        super().__init__()
+        self.agent_type = agent_type
+        self.callback = callback
+        self.started = time.monotonic()
+        self.first_token_at: Optional[float] = None
+        self.reply: Optional[str] = None
+        self.run: Optional[ThreadRun] = None
+
+    @property
+    def time_to_first_token(self) -> Optional[float]:
+        """Seconds from run start to the first streamed text, if any text arrived."""
+        return None if self.first_token_at is None else self.first_token_at - self.started
+
+    @property
+    def done(self) -> bool:
+        """Whether the run has reached a terminal status."""
+        return self.run is not None and self.run.status in TERMINAL_RUN_STATUSES
+
+    def _emit(self, kind: str, payload: Any):
+        if self.callback:
+            self.callback(self.agent_type, kind, payload)
+
+    def on_message_delta(self, delta: MessageDeltaChunk):
+        if self.first_token_at is None:
+            self.first_token_at = time.monotonic()
+            self._emit("first_token", self.time_to_first_token)
+        if delta.text:
+            self._emit("delta", delta.text)
+
+    def on_thread_message(self, message: ThreadMessage):
+        if message.role == MessageRole.AGENT and message.status == MessageStatus.COMPLETED and message.text_messages:
+            self.reply = message.text_messages[-1].text.value
+            self._emit("message", self.reply)
+
+    def on_thread_run(self, run: ThreadRun):
+        self.run = run
+        if run.status == RunStatus.REQUIRES_ACTION and run.required_action:
+            tool_calls = run.required_action.submit_tool_outputs.tool_calls or []
+            self._emit("tool_calls", [call.function.name for call in tool_calls if call.type == "function"])
+
+
+class StreamWatchdog:
+    """
+    Cancels a streamed run once its timeout or deadline passes.
+
+    Runs beside the stream, so a run is cancelled on time even when no event
+    arrives; the server then ends the stream with the run's cancelled event.
+    """
+
+    def __init__(self, handler: StageEventHandler, cancel_run: Callable[[str], None],
+                 timeout: float, deadline: Deadline):
+        """
+        Initialize the watchdog.
+
+        Args:
+            handler: Handler of the stream, which learns the run id from its first run event
+            cancel_run: Cancels the run with the given id
+            timeout: Seconds after which the run is cancelled
+            deadline: Deadline after which (or on whose cancellation) the run is cancelled
+        """
+        self.handler = handler
+        self.cancel_run = cancel_run
+        self.expires_at = time.monotonic() + timeout
+        self.deadline = deadline
+        self.fired: Optional[str] = None
+        self._finished = threading.Event()
+        self._thread = threading.Thread(target=self._watch, name=f"watchdog-{handler.agent_type}", daemon=True)
+
+    def __enter__(self) -> "StreamWatchdog":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._finished.set()
+        self._thread.join()
+
+    def _next_check(self) -> float:
+        if self.fired:
+            return WATCHDOG_INTERVAL
+        return max(0.0, min(self.deadline.clamp(WATCHDOG_INTERVAL), self.expires_at - time.monotonic()))
+
+    def _watch(self):
+        cancelled_run = None
+        while not self._finished.wait(self._next_check()):
+            if self.fired is None:
+                if self.deadline.expired:
+                    self.fired = "deadline"
+                elif time.monotonic() >= self.expires_at:
+                    self.fired = "timeout"
+                else:
+                    continue
+            # Until the run's first event the id is unknown; keep checking so it is cancelled once it arrives
+            run = self.handler.run
+            if run is not None and run.id != cancelled_run and not self.handler.done:
+                cancelled_run = run.id
+                try:
+                    self.cancel_run(run.id)
+                except Exception as e:
+                    print(f"⚠️ Could not cancel {self.handler.agent_type} run {run.id}: {e}")
+
+
+def print_stream_event(agent_type: str, kind: str, payload: Any):
+    """Stream callback that writes progress to the console."""
+    label = agent_type.upper()
+    if kind == "first_token":
+        print(f"⚡ {label} first token after {payload:.1f}s")
+    elif kind == "delta":
+        sys.stdout.write(payload)
+        sys.stdout.flush()
+    elif kind == "tool_calls":
+        print(f"\n🔧 {label} calling {', '.join(payload)}")
+    elif kind == "message":
+        print()
@@ -0,0 +1,334 @@
+"""
+Structured Agent Outputs
+
+This module contains the parsing, validation and rendering of the JSON the
+metric agents and the JIRA linker emit. Metric agents report their patterns
+as:
+
+    {"metric": "PAV", "patterns": [{
+        "id": "PAV-1", "title": "...", "direction": "regression", "flag_reason": "metric",
+        "metrics": [{"country": "TH", "definitiontag": "shop=convenience", "value": -5193,
+                     "reference_count": 21000, "actual_count": 15807, "count_change_percent": -24.7}]
+    }]}
+
+and the linker as {"links": [{"pattern_id": "PAV-1", "tickets": ["MPOI-7744"], "reason": "..."}]}.
+
+The orchestrator checks the pattern rules the agents are instructed to follow
+(one definitiontag or one country per pattern, no mixed improvement and
+regression signs), deduplicates patterns, and hands the coordinator one
+compact findings block instead of the agents' prose.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from agent_instructions.metric_instructions import POSITIVE_IS_IMPROVEMENT
+from agent_tools import extract_mpoi_keys
+
+FLAG_REASONS = {'metric', 'count', 'both'}
+
+_JSON_BLOCK_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+
+
+class StructuredOutputError(ValueError):
+    """Raised when an agent response does not contain the expected JSON document."""
+
+
+@dataclass(frozen=True)
+class MetricValue:
+    """One metric row cited by a pattern."""
+    country: str
+    definitiontag: str
+    metric: str
+    value: float
+    reference_count: Optional[int] = None
+    actual_count: Optional[int] = None
+    count_change_percent: Optional[float] = None
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        """Identity of the metric row (a row is cited once per pattern)."""
+        return self.country, self.definitiontag, self.metric
+
+    @property
+    def direction(self) -> str:
+        """Whether the change is an improvement or a regression for this metric type."""
+        improving = self.value > 0 if self.metric in POSITIVE_IS_IMPROVEMENT else self.value < 0
+        return "improvement" if improving else "regression"
+
+    def to_text(self) -> str:
+        """Render in the "Country (definitiontag, METRIC, value, ref→actual, change%)" format."""
+        parts = [self.definitiontag, self.metric, f"{self.value:+g}"]
+        if self.reference_count is not None and self.actual_count is not None:
+            parts.append(f"{self.reference_count}→{self.actual_count}")
+        if self.count_change_percent is not None:
+            parts.append(f"{self.count_change_percent:+g}%")
+        return f"{self.country} ({', '.join(parts)})"
+
+
+@dataclass
+class Pattern:
+    """A validated pattern reported by a metric agent, with its linked tickets."""
+    id: str
+    metric: str
+    title: str
+    direction: str
+    flag_reason: str
+    metrics: List[MetricValue]
+    tickets: List[str] = field(default_factory=list)
+    link_reason: str = ""
+    # Id the agent reported, for patterns split from it (PAV-1 for PAV-1a, PAV-1c, PAV-1ab, ...)
+    parent_id: Optional[str] = None
+
+    @property
+    def countries(self) -> List[str]:
+        """Countries cited by the pattern, in order."""
+        return list(dict.fromkeys(m.country for m in self.metrics))
+
+    @property
+    def definitiontags(self) -> List[str]:
+        """Definitiontags cited by the pattern, in order."""
+        return list(dict.fromkeys(m.definitiontag for m in self.metrics))
+
+    def to_text(self) -> str:
+        """Render as a single pattern line."""
+        return f"{self.title}: {', '.join(m.to_text() for m in self.metrics)}"
+
+
+def extract_json(text: str) -> Any:
+    """
+    Extract the JSON document from an agent response.
+
+    Accepts a fenced ```json block, or a bare object making up the whole response.
+
+    Args:
+        text: Agent response
+
+    Returns:
+        Any: Parsed JSON document
+
+    Raises:
+        StructuredOutputError: If the response contains no parseable JSON object
+    """
+    text = (text or "").strip()
+    match = _JSON_BLOCK_RE.search(text)
+    candidate = match.group(1) if match else text
+    try:
+        return json.loads(candidate)
+    except ValueError:
+        pass
+    # Fall back to the outermost braces (e.g. JSON with a stray sentence around it)
+    start, end = text.find('{'), text.rfind('}')
+    if start != -1 and end > start:
+        try:
+            return json.loads(text[start:end + 1])
+        except ValueError:
+            pass
+    raise StructuredOutputError("response contains no JSON object")
+
+
+def _number(value: Any, cast=float) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        value = value.strip().replace('%', '').replace(',', '')
+    try:
+        return cast(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_metric(entry: Any, metric: str) -> Optional[MetricValue]:
+    if not isinstance(entry, dict):
+        return None
+    country = str(entry.get('country') or '').strip().upper()
+    definitiontag = str(entry.get('definitiontag') or '').strip().lower()
+    value = _number(entry.get('value'))
+    if not country or '=' not in definitiontag or value is None:
+        return None
+    return MetricValue(
+        country=country,
+        definitiontag=definitiontag,
+        metric=metric,
+        value=value,
+        reference_count=_number(entry.get('reference_count'), int),
+        actual_count=_number(entry.get('actual_count'), int),
+        count_change_percent=_number(entry.get('count_change_percent'))
+    )
+
+
+def _split(pattern: Pattern, groups: Dict[Any, List[MetricValue]], describe) -> List[Pattern]:
+    if len(groups) < 2:
+        return [pattern]
+    return [
+        Pattern(f"{pattern.id}{chr(ord('a') + i)}", pattern.metric, f"{pattern.title} ({describe(group_key)})",
+                metrics[0].direction, pattern.flag_reason, metrics, parent_id=pattern.parent_id or pattern.id)
+        for i, (group_key, metrics) in enumerate(groups.items())
+    ]
+
+
+def _enforce_rules(pattern: Pattern) -> List[Pattern]:
+    """Split patterns that break the one-definitiontag-or-one-country and sign rules."""
+    patterns = [pattern]
+    if len(pattern.countries) > 1 and len(pattern.definitiontags) > 1:
+        groups: Dict[str, List[MetricValue]] = {}
+        for m in pattern.metrics:
+            groups.setdefault(m.definitiontag, []).append(m)
+        patterns = _split(pattern, groups, lambda tag: tag)
+
+    result = []
+    for p in patterns:
+        groups = {}
+        for m in p.metrics:
+            groups.setdefault(m.direction, []).append(m)
+        for split in _split(p, groups, lambda direction: f"{direction}s"):
+            split.direction = split.metrics[0].direction
+            result.append(split)
+    return result
+
+
+def parse_metric_output(text: str, metric: str) -> List[Pattern]:
+    """
+    Parse, validate and deduplicate a metric agent's structured output.
+
+    Metric rows without a country, a full definitiontag or a numeric value are
+    dropped, patterns are split where they mix definitiontags across countries
+    or mix improvements with regressions, and repeated rows and patterns are
+    removed.
+
+    Args:
+        text: Metric agent response
+        metric: Metric type of the agent (PAV, PPA, SUP, DUP)
+
+    Returns:
+        List[Pattern]: Valid patterns (empty if the agent found none)
+
+    Raises:
+        StructuredOutputError: If the response is not a structured metric report
+    """
+    metric = metric.upper()
+    document = extract_json(text)
+    if not isinstance(document, dict) or not isinstance(document.get('patterns'), list):
+        raise StructuredOutputError("expected an object with a 'patterns' list")
+
+    patterns, seen_patterns, used_ids = [], set(), set()
+    for number, entry in enumerate(document['patterns'], 1):
+        if not isinstance(entry, dict):
+            continue
+        metrics = {}
+        for raw in entry.get('metrics') or []:
+            parsed = _parse_metric(raw, metric)
+            if parsed:
+                metrics.setdefault(parsed.key, parsed)
+        if not metrics:
+            continue
+
+        pattern_id = str(entry.get('id') or f"{metric}-{number}").strip()
+        if pattern_id in used_ids:
+            pattern_id = f"{metric}-{number}"
+        used_ids.add(pattern_id)
+        flag_reason = str(entry.get('flag_reason') or '').strip().lower()
+        pattern = Pattern(
+            id=pattern_id,
+            metric=metric,
+            title=str(entry.get('title') or '').strip() or f"{metric} pattern {number}",
+            direction=str(entry.get('direction') or '').strip().lower(),
+            flag_reason=flag_reason if flag_reason in FLAG_REASONS else 'metric',
+            metrics=list(metrics.values())
+        )
+
+        for valid in _enforce_rules(pattern):
+            signature = frozenset((m.key, m.value) for m in valid.metrics)
+            if signature not in seen_patterns:
+                seen_patterns.add(signature)
+                patterns.append(valid)
+    return patterns
+
+
+def metric_output(metric: str, patterns: Sequence[Pattern] = ()) -> str:
+    """
+    Serialize patterns in the structured format of a metric agent (the inverse of parse_metric_output).
+
+    Args:
+        metric: Metric type (PAV, PPA, SUP, DUP)
+        patterns: Patterns to report; none for an agent that found no patterns
+
+    Returns:
+        str: JSON document
+    """
+    def entry(m: MetricValue) -> Dict[str, Any]:
+        fields = {'country': m.country, 'definitiontag': m.definitiontag, 'value': m.value,
+                  'reference_count': m.reference_count, 'actual_count': m.actual_count,
+                  'count_change_percent': m.count_change_percent}
+        return {key: value for key, value in fields.items() if value is not None}
+
+    return json.dumps({"metric": metric.upper(), "patterns": [
+        {'id': p.id, 'title': p.title, 'direction': p.direction, 'flag_reason': p.flag_reason,
+         'metrics': [entry(m) for m in p.metrics]}
+        for p in patterns
+    ]})
+
+
+def parse_links(text: str) -> Dict[str, Tuple[List[str], str]]:
+    """
+    Parse the JIRA linker's structured output.
+
+    Args:
+        text: Linker response
+
+    Returns:
+        Dict[str, Tuple[List[str], str]]: Pattern id → (MPOI keys, reason); patterns
+            without a valid ticket key are omitted
+
+    Raises:
+        StructuredOutputError: If the response is not a structured link report
+    """
+    document = extract_json(text)
+    if not isinstance(document, dict) or not isinstance(document.get('links'), list):
+        raise StructuredOutputError("expected an object with a 'links' list")
+
+    links = {}
+    for entry in document['links']:
+        if not isinstance(entry, dict) or not entry.get('pattern_id'):
+            continue
+        tickets = entry.get('tickets') or []
+        keys = extract_mpoi_keys(" ".join(map(str, tickets if isinstance(tickets, list) else [tickets])))
+        if keys:
+            pattern_id = str(entry['pattern_id']).strip()
+            previous, reason = links.get(pattern_id, ([], ""))
+            links[pattern_id] = (list(dict.fromkeys(previous + keys)), reason or str(entry.get('reason') or '').strip())
+    return links
+
+
+def apply_links(patterns: Dict[str, List[Pattern]], links: Dict[str, Tuple[List[str], str]]):
+    """Attach linked tickets to their patterns (split patterns inherit their parent's links)."""
+    for metric_patterns in patterns.values():
+        for pattern in metric_patterns:
+            tickets, reason = links.get(pattern.id) or links.get(pattern.parent_id) or ([], "")
+            pattern.tickets, pattern.link_reason = tickets, reason
+
+
+def format_findings(patterns: Dict[str, List[Pattern]], with_links: bool = True) -> str:
+    """
+    Render validated patterns as the compact findings block for the coordinator.
+
+    Args:
+        patterns: Metric type → validated patterns
+        with_links: Include the linked tickets of each pattern
+
+    Returns:
+        str: Findings block
+    """
+    lines = ["STRUCTURED FINDINGS (validated and deduplicated; metrics as Country (definitiontag, METRIC, value, ref→actual, change%)):"]
+    for metric, metric_patterns in patterns.items():
+        lines.append(f"{metric.upper()}:")
+        if not metric_patterns:
+            lines.append("- No significant patterns found")
+        for p in metric_patterns:
+            lines.append(f"- {p.id} | {p.metric} {p.direction} | flagged for: {p.flag_reason} | {p.to_text()}")
+            if with_links:
+                jira = f"{', '.join(p.tickets)} - {p.link_reason}" if p.tickets else "None"
+                lines.append(f"  JIRA: {jira}")
+    return "\n".join(lines)
@@ -0,0 +1,131 @@
+"""
+OpenTelemetry Tracing
+
+This module contains the tracing setup for APR analyses. Spans cover the whole
+analysis, every pipeline stage, every agent run (with token usage) and every
+tool call (with cache hits and result sizes); the Databricks client adds a span
+per SQL statement. Together they show where the minutes of an analysis go.
+
+Tracing is off unless configure_tracing() is called (--trace on the command
+line); until then all spans are no-ops of the OpenTelemetry API.
+"""
+
+import os
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor, ConsoleSpanExporter, SpanExporter, SpanExportResult
+)
+
+from orchestrator.checkpoints import DEFAULT_RUN_DIR
+
+TRACE_EXPORTERS = ('console', 'otlp', 'json')
+DEFAULT_TRACE_FILE = os.path.join(DEFAULT_RUN_DIR, "traces.jsonl")
+SERVICE_NAME = "apr-analysis"
+
+_tracer = trace.get_tracer("apr_analysis")
+
+
+class JsonFileSpanExporter(SpanExporter):
+    """Appends finished spans to a local file, one JSON document per line."""
+
+    def __init__(self, path: str = DEFAULT_TRACE_FILE):
+        """
+        Initialize the exporter.
+
+        Args:
+            path: File the spans are appended to
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        """Append a batch of spans."""
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                for finished in spans:
+                    f.write(finished.to_json(indent=None) + "\n")
+        except OSError:
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+
+def _exporter(kind: str, path: str) -> SpanExporter:
+    if kind == 'console':
+        return ConsoleSpanExporter()
+    if kind == 'json':
+        return JsonFileSpanExporter(path)
+    if kind == 'otlp':
+        try:
+            # Endpoint and headers come from the standard OTEL_EXPORTER_OTLP_* variables
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        except ImportError as e:
+            raise RuntimeError("OTLP export requires the opentelemetry-exporter-otlp-proto-http package") from e
+        return OTLPSpanExporter()
+    raise ValueError(f"unknown trace exporter {kind!r}, expected one of {', '.join(TRACE_EXPORTERS)}")
+
+
+def configure_tracing(kind: str, path: str = DEFAULT_TRACE_FILE):
+    """
+    Install a tracer provider exporting all spans.
+
+    Args:
+        kind: Exporter to use ("console", "otlp" or "json")
+        path: Output file of the json exporter
+
+    Raises:
+        ValueError: If the exporter kind is unknown
+        RuntimeError: If the exporter's package is not installed
+    """
+    provider = TracerProvider(resource=Resource.create({"service.name": SERVICE_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(_exporter(kind, path)))
+    trace.set_tracer_provider(provider)
+
+
+def _attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop unset attributes and stringify values OpenTelemetry cannot store."""
+    return {
+        key: value if isinstance(value, (str, bool, int, float)) else str(value)
+        for key, value in attributes.items() if value is not None
+    }
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[trace.Span]:
+    """
+    Run a block inside a span; exceptions are recorded on the span and re-raised.
+
+    Args:
+        name: Span name
+        **attributes: Span attributes (None values are skipped)
+
+    Yields:
+        trace.Span: The current span
+    """
+    with _tracer.start_as_current_span(name, attributes=_attributes(attributes)) as current:
+        yield current
+
+
+def set_attributes(**attributes: Any):
+    """Add attributes to the current span (None values are skipped)."""
+    trace.get_current_span().set_attributes(_attributes(attributes))
+
+
+def record_run(run: Optional[Any]):
+    """Add an agent run's id, status and token usage to the current span."""
+    if run is None:
+        return
+    usage = getattr(run, 'usage', None)
+    set_attributes(
+        run_id=run.id,
+        run_status=run.status,
+        prompt_tokens=getattr(usage, 'prompt_tokens', None),
+        completion_tokens=getattr(usage, 'completion_tokens', None),
+        total_tokens=getattr(usage, 'total_tokens', None)
+    )
@@ -0,0 +1,149 @@
+"""
+Run-Scoped Tool Call Cache
+
+This module contains the memoization layer wrapped around every agent tool
+registered by the orchestrator. Within one APR run the same tool is called
+with the same arguments many times (get_feature_rankings by every agent,
+get_PRs_from_apr by the linker and the coordinator, get_jira_ticket_title for
+the same MPOI by several agents); the cache turns every repeat into a lookup.
+"""
+
+import functools
+import json
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Tuple
+
+from agent_tools import statement_error, tool_call_key
+from orchestrator.accounting import record_tool
+from orchestrator.telemetry import span
+
+
+def is_error_result(result: Any) -> bool:
+    """
+    Whether a tool result reports a failure (failures are never cached).
+
+    Databricks statement responses count as failed unless their statement
+    succeeded, so FAILED, CANCELED and still PENDING statements are retried.
+    """
+    if not isinstance(result, str):
+        return False
+    text = result.lstrip()
+    if text.startswith(('Error', 'Failed')):
+        return True
+    if text.startswith('{'):
+        try:
+            document = json.loads(text)
+        except ValueError:
+            return False
+        if isinstance(document, dict) and ('statement_id' in document or 'status' in document):
+            return statement_error(text) is not None
+        return isinstance(document, dict) and 'error' in document
+    return False
+
+
+class ToolCallCache:
+    """
+    Thread-safe memoization of tool results keyed on function and arguments.
+
+    Failed calls (error strings or JSON error payloads) are not cached so that a
+    later call can retry them.
+    """
+
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._results: Dict[Tuple[str, Tuple], Any] = {}
+        self._wrappers: Dict[Callable, Callable] = {}
+        self._lock = threading.Lock()
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Call a tool through the cache.
+
+        Args:
+            func: Tool function
+            *args: Positional arguments for the tool
+            **kwargs: Keyword arguments for the tool
+
+        Returns:
+            Any: Cached or freshly computed tool result
+        """
+        key = tool_call_key(func, args, kwargs)
+        started = time.monotonic()
+        with span(f"tool {func.__name__}", tool_name=func.__name__) as current:
+            with self._lock:
+                cached = key in self._results
+                if cached:
+                    self.hits[func.__name__] += 1
+                    result = self._results[key]
+                else:
+                    self.misses[func.__name__] += 1
+
+            if not cached:
+                result = func(*args, **kwargs)
+                if not is_error_result(result):
+                    with self._lock:
+                        self._results[key] = result
+            record_tool(func.__name__, time.monotonic() - started, cached)
+            current.set_attributes({
+                'cache_hit': cached,
+                'result_bytes': len(str(result)),
+                'error': is_error_result(result)
+            })
+            return result
+
+    def put(self, func: Callable, result: Any, *args, **kwargs):
+        """Seed the cache with a result obtained some other way (e.g. a bulk fetch)."""
+        if not is_error_result(result):
+            with self._lock:
+                self._results[tool_call_key(func, args, kwargs)] = result
+
+    def wrap(self, func: Callable) -> Callable:
+        """
+        Get a cached version of a tool function.
+
+        The wrapper keeps the tool's name, docstring and signature, so it can be
+        registered with enable_auto_function_calls in place of the original.
+        """
+        with self._lock:
+            if func not in self._wrappers:
+                @functools.wraps(func)
+                def cached(*args, **kwargs):
+                    return self.call(func, *args, **kwargs)
+                self._wrappers[func] = cached
+            return self._wrappers[func]
+
+    def clear(self):
+        """Drop all cached results and statistics (start of a new run)."""
+        with self._lock:
+            self._results.clear()
+            self.hits.clear()
+            self.misses.clear()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Get hits, misses and hit rate per tool."""
+        with self._lock:
+            names = sorted(set(self.hits) | set(self.misses))
+            return {
+                name: {
+                    'hits': self.hits[name],
+                    'misses': self.misses[name],
+                    'hit_rate': self.hits[name] / (self.hits[name] + self.misses[name])
+                }
+                for name in names
+            }
+
+    def report(self) -> str:
+        """Render per-tool hit rates for the console."""
+        stats = self.stats()
+        if not stats:
+            return "📊 Tool cache: no tool calls"
+        total_hits = sum(s['hits'] for s in stats.values())
+        total_calls = sum(s['hits'] + s['misses'] for s in stats.values())
+        lines = [f"📊 Tool cache: {total_hits}/{total_calls} calls served from cache ({total_hits / total_calls:.0%})"]
+        for name, s in stats.items():
+            lines.append(f"   {name}: {s['hits']} hits, {s['misses']} misses ({s['hit_rate']:.0%})")
+        return "\n".join(lines)
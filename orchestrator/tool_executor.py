@@ -0,0 +1,101 @@
+"""
+Concurrent Tool Executor
+
+This module contains the executor for the tool calls a model step requests.
+The SDK runs the calls of one requires_action step one after another, so a
+linker step asking for the titles of ten PRs takes the sum of ten GitHub round
+trips; here independent calls of a step run on a thread pool and the step
+takes as long as its slowest call. Each backing service has its own
+concurrency limit, so a wide fan-out does not flood JIRA, GitHub or the
+Databricks SQL warehouse.
+"""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List
+
+from orchestrator.pipeline import submit_in_context
+
+# Maximum concurrent calls per backing service
+SERVICE_LIMITS = {
+    'jira': 4,
+    'github': 4,
+    'databricks': 2,
+    'local': 8,
+}
+
+# Backing service of each tool; tools not listed run under the 'local' limit
+TOOL_SERVICES = {
+    'get_jira_ticket_description': 'jira',
+    'get_jira_ticket_title': 'jira',
+    'get_jira_ticket_release_notes': 'jira',
+    'get_jira_ticket_xlsx_attachment': 'jira',
+    'get_jira_ticket_attachments': 'jira',
+    'get_pull_request_body': 'github',
+    'get_pull_request_title': 'github',
+    'get_control_plan_metrics_from_pr_comment': 'github',
+    'get_apr_metrics': 'databricks',
+    'get_PRs_from_apr': 'databricks',
+    'get_apr_metrics_for_given_metric_type': 'databricks',
+    'get_pav_metrics_for_apr': 'databricks',
+    'get_ppa_metrics_for_apr': 'databricks',
+    'get_sup_metrics_for_apr': 'databricks',
+    'get_dup_metrics_for_apr': 'databricks',
+    'get_feature_rankings': 'local',
+}
+
+
+class ToolExecutor:
+    """Executes the function tool calls of one model step concurrently, bounded per service."""
+
+    def __init__(self, functions: Iterable[Callable], max_workers: int = 16,
+                 limits: Dict[str, int] = SERVICE_LIMITS):
+        """
+        Initialize the executor.
+
+        Args:
+            functions: Tool functions the agents may call, looked up by name
+            max_workers: Maximum number of tool calls running at once across all services
+            limits: Maximum concurrent calls per service
+        """
+        self.functions = {func.__name__: func for func in functions}
+        self.max_workers = max_workers
+        self._semaphores = {service: threading.BoundedSemaphore(limit) for service, limit in limits.items()}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool")
+
+    def _semaphore(self, name: str) -> threading.BoundedSemaphore:
+        service = TOOL_SERVICES.get(name, 'local')
+        return self._semaphores.get(service) or self._semaphores['local']
+
+    def _call(self, tool_call: Any) -> str:
+        """Execute one call; failures are returned to the model as a JSON error, like the SDK does."""
+        name = tool_call.function.name
+        try:
+            func = self.functions.get(name)
+            if func is None:
+                raise ValueError(f"Function '{name}' not found")
+            arguments = json.loads(tool_call.function.arguments or "{}")
+            if not isinstance(arguments, dict):
+                raise TypeError("Arguments must be a JSON object.")
+            with self._semaphore(name):
+                return str(func(**arguments))
+        except Exception as e:
+            return json.dumps({"error": f"Error executing function '{name}': {e}"})
+
+    def execute(self, tool_calls: List[Any]) -> List[Dict[str, str]]:
+        """
+        Execute the function tool calls of a model step.
+
+        Args:
+            tool_calls: Tool calls from the run's required action
+
+        Returns:
+            List[Dict[str, str]]: Tool outputs in request order, ready for submit_tool_outputs
+        """
+        calls = [tool_call for tool_call in tool_calls if tool_call.type == "function"]
+        if len(calls) == 1:
+            # Nothing to overlap; skip the pool hand-off
+            return [{"tool_call_id": calls[0].id, "output": self._call(calls[0])}]
+        futures = [(tool_call.id, submit_in_context(self._pool, self._call, tool_call)) for tool_call in calls]
+        return [{"tool_call_id": call_id, "output": future.result()} for call_id, future in futures]
@@ -0,0 +1,30 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from orchestrator.accounting import Accounting, RunTools, record_tool, run_scope
+from orchestrator.pipeline import submit_in_context
+
+
+def test_concurrent_tool_calls_of_a_run_count_once():
+    tools = RunTools([(0.0, 2.0), (1.0, 3.0), (5.0, 6.0)])
+    assert tools.seconds == 4.0
+
+
+def test_concurrent_runs_of_a_stage_keep_their_own_tool_time(tmp_path):
+    def run(seconds):
+        with run_scope() as tools:
+            record_tool("get_pav_metrics_for_apr", seconds)
+            return tools.seconds
+
+    with Accounting(str(tmp_path)).stage("121", "pav") as account, ThreadPoolExecutor(2) as executor:
+        futures = [submit_in_context(executor, run, seconds) for seconds in (1.0, 4.0)]
+        assert [round(future.result(), 3) for future in futures] == [1.0, 4.0]
+    assert account.tool_seconds == 5.0
+
+
+def test_tool_calls_from_submitted_work_are_charged_to_the_run():
+    with run_scope() as tools, ThreadPoolExecutor(2) as executor:
+        started = time.monotonic()
+        for future in [submit_in_context(executor, record_tool, "get_jira_ticket_title", 0.5) for _ in range(2)]:
+            future.result()
+    assert 0.5 <= tools.seconds <= 0.5 + time.monotonic() - started
@@ -0,0 +1,49 @@
+import itertools
+from types import SimpleNamespace
+
+from agent import Agent
+from orchestrator.agent_registry import AgentRegistry
+
+
+class FakeAgentsClient:
+    """Agents client keeping deployed agents in memory."""
+
+    def __init__(self):
+        self.agents = {}
+        self.ids = (f"asst_{number}" for number in itertools.count())
+
+    def list_agents(self):
+        return list(self.agents.values())
+
+    def create_agent(self, **params):
+        deployed = SimpleNamespace(id=next(self.ids), **params)
+        self.agents[deployed.id] = deployed
+        return deployed
+
+    def update_agent(self, agent_id, **params):
+        self.agents[agent_id] = SimpleNamespace(id=agent_id, **params)
+        return self.agents[agent_id]
+
+
+def ensure(client, agent):
+    registry = AgentRegistry(client)
+    registry.refresh()
+    return registry.ensure(agent)
+
+
+def test_unchanged_agent_is_reused_and_changed_one_updated():
+    client = FakeAgentsClient()
+    created, action = ensure(client, Agent(name="PAV_Agent", instructions="v1", model="gpt-4o"))
+    assert action == "created"
+    assert ensure(client, Agent(name="PAV_Agent", instructions="v1", model="gpt-4o")) == (created, "reused")
+    updated, action = ensure(client, Agent(name="PAV_Agent", instructions="v2", model="gpt-4o"))
+    assert action == "updated" and updated.id == created.id
+
+
+def test_each_model_keeps_its_own_agent():
+    client = FakeAgentsClient()
+    first, _ = ensure(client, Agent(name="PAV_Agent", instructions="v1", model="gpt-4o"))
+    second, action = ensure(client, Agent(name="PAV_Agent", instructions="v1", model="gpt-4.1-mini"))
+    assert action == "created" and second.id != first.id
+    assert ensure(client, Agent(name="PAV_Agent", instructions="v1", model="gpt-4o")) == (first, "reused")
+    assert client.agents[first.id].model == "gpt-4o"
@@ -0,0 +1,92 @@
+import json
+import re
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from agent_instructions import build_metric_agent_instructions, get_coordinator_instructions
+from agent_instructions.coordinator_instructions import METRIC_ORDER
+from agent_instructions.sections import TOKEN_ENCODING
+from agents import create_coordinator_agent, create_jira_linker_agent
+from orchestrator.orchestrator import METRIC_AGENT_FACTORIES, APROrchestrator
+
+# Instructions as sent before they were assembled from sections (coordinator covering every metric)
+BEFORE = Path(__file__).parent / "fixtures" / "instructions_before"
+
+BUILDERS = {'coordinator': lambda: get_coordinator_instructions(METRIC_ORDER)}
+for _metric in ('pav', 'ppa', 'sup', 'dup'):
+    BUILDERS[_metric] = lambda metric=_metric: build_metric_agent_instructions(metric)
+
+# Instructions of every deployed agent, as the agent factories build them
+AGENTS = dict(METRIC_AGENT_FACTORIES)
+AGENTS['jira_linker'] = create_jira_linker_agent
+AGENTS['coordinator'] = lambda model: create_coordinator_agent(model, METRIC_ORDER)
+
+# Values that differ between runs and must stay out of the cached prompt prefix
+PER_RUN_PATTERNS = [
+    re.compile(r'\bAPR[ #-]?\d+'),  # an APR number
+    re.compile(r'\{[a-z_]+\}'),  # an unformatted template field
+]
+
+# Two analyses of different APRs, for comparing the messages sent to the agents
+RUNS = [
+    ("121", {'country': 'TH', 'definitiontag': 'shop=bakery', 'value': -10}),
+    ("987", {'country': 'GR', 'definitiontag': 'amenity=cafe', 'value': 25}),
+]
+
+
+@pytest.fixture(scope="module")
+def encoding():
+    # Fail rather than skip, so the size budget is never silently unchecked (tiktoken is in requirements-local.txt)
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(TOKEN_ENCODING)
+    except Exception as e:
+        # The encoding file is downloaded on first use; point TIKTOKEN_CACHE_DIR at a copy on machines without network
+        pytest.fail(f"tiktoken encoding {TOKEN_ENCODING} unavailable, the size budget cannot be checked: {e}")
+
+
+@pytest.mark.parametrize("agent_type", BUILDERS)
+def test_instructions_are_smaller_than_before(agent_type, encoding):
+    before = len(encoding.encode((BEFORE / f"{agent_type}.txt").read_text()))
+    after = len(encoding.encode(BUILDERS[agent_type]()))
+    assert after < before, f"{agent_type} instructions grew from {before} to {after} tokens"
+
+
+@pytest.mark.parametrize("agent_type", AGENTS)
+def test_instructions_hold_no_per_run_values(agent_type):
+    instructions = AGENTS[agent_type]("model").instructions
+    today = date.today()
+    for value in (today.isoformat(), today.strftime('%Y%m%d'), today.strftime('%d %B %Y'), today.strftime('%B %d, %Y')):
+        assert value not in instructions
+    for pattern in PER_RUN_PATTERNS:
+        assert not pattern.search(instructions), f"{agent_type} instructions contain {pattern.search(instructions)[0]!r}"
+
+
+def capture_messages(analyze) -> list:
+    """Run an orchestrator step for each of RUNS without agents, returning the message each run sent."""
+    messages = []
+    orchestrator = APROrchestrator.__new__(APROrchestrator)
+    orchestrator.metric_agents = ('pav',)
+    orchestrator.shard_threshold = None
+    orchestrator._metric_rows = lambda apr_number, agent_type: None
+    orchestrator._run_agent_with_retries = lambda agent_type, content, **kwargs: messages.append(content) or "done"
+    for apr_number, row in RUNS:
+        metric_results = {'pav': json.dumps({'metric': 'PAV', 'patterns': [{'id': 'PAV-1', 'metrics': [row]}]})}
+        analyze(orchestrator, apr_number, metric_results)
+    return messages
+
+
+@pytest.mark.parametrize("analyze", [
+    lambda orchestrator, apr_number, results: orchestrator.run_metric_analysis(apr_number, 'pav'),
+    lambda orchestrator, apr_number, results: orchestrator.run_jira_linking_analysis(apr_number, results, "CONTEXT"),
+    lambda orchestrator, apr_number, results: orchestrator.create_final_report(apr_number, results, "", "CONTEXT"),
+], ids=['metric', 'jira_linker', 'coordinator'])
+def test_messages_put_the_static_request_before_per_run_data(analyze):
+    messages = capture_messages(analyze)
+    requests = [message.split("\n\n", 1)[0] for message in messages]
+    assert requests[0] == requests[1]
+    for (apr_number, row), message, request in zip(RUNS, messages, requests):
+        assert apr_number not in request and row['country'] not in request
+        assert apr_number in message
@@ -0,0 +1,31 @@
+from linking import CountryAliasIndex, SimilarityRanker, TicketIndex, get_country_index, merge_candidates
+
+TICKETS = {
+    'MPOI-1': ("Greece supermarket coverage", "Add missing supermarkets in Greece"),
+    'MPOI-2': ("Spain supermarket coverage", "Add missing supermarkets in Spain"),
+    'MPOI-3': ("Supermarket coverage improvements", "More supermarkets from a new provider"),
+}
+
+
+def test_similarity_candidates_satisfy_the_country_rule():
+    index = TicketIndex.from_texts(TICKETS)
+    pattern = "GR (shop=supermarket, PAV, -228)"
+    merged = merge_candidates(index.candidates_for_patterns([pattern]), SimilarityRanker(index), k=3)
+    assert [key for key, _ in merged[pattern]] == ['MPOI-1']
+
+
+def test_caller_supplied_regions_match_in_any_case():
+    index = CountryAliasIndex(regions={'Far East': frozenset({'JP', 'KR'})})
+    assert index.find_countries("Rollout for the far east") == {'JP', 'KR'}
+
+
+def test_codes_in_all_caps_prose_are_ignored():
+    index = get_country_index()
+    assert index.find_countries("WE CAN FIX THIS IS MD") == set()
+    assert index.find_countries("Release notes\nWE CAN FIX THIS IS MD\nSupermarkets in TH") == {'TH'}
+
+
+def test_codes_in_upper_case_lists_are_matched():
+    index = get_country_index()
+    assert index.find_countries("TH VN GR POI UPDATE") == {'TH', 'VN', 'GR'}
+    assert index.find_countries("Fix TH POI coverage") == {'TH'}
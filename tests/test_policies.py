@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from apis.deadline import Deadline, DeadlineExceeded, deadline_scope
+from orchestrator.policies import EmptyResponseError, RetryPolicy, RunFailedError, classify_error, retry_after
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+@pytest.mark.parametrize("error, retryable", [
+    (DeadlineExceeded("analysis cancelled"), False),
+    (EmptyResponseError("no response"), True),
+    (RunFailedError("run_1", "expired"), True),
+    (RunFailedError("run_1", "failed", "rate_limit_exceeded", "slow down"), True),
+    (RunFailedError("run_1", "failed", "server_error"), True),
+    (RunFailedError("run_1", "failed", "invalid_prompt", "bad"), False),
+    (RunFailedError("run_1", "cancelled"), True),
+    (HTTPError(429), True),
+    (HTTPError(503), True),
+    (HTTPError(401), False),
+    (HTTPError(400), False),
+    (TimeoutError(), True),
+    (requests.exceptions.ConnectionError(), True),
+    (ValueError("bad argument"), False),
+    (KeyError("missing"), False),
+    (RuntimeError("unknown"), True),
+])
+def test_classify_error(error, retryable):
+    assert classify_error(error).retryable is retryable
+
+
+def test_retry_after_reads_headers_and_message():
+    assert classify_error(HTTPError(429, {'Retry-After': '7'})).retry_after == 7.0
+    assert retry_after(HTTPError(429, {'retry-after-ms': '1500'})) == 1.5
+    assert retry_after(RunFailedError("run_1", "failed", "rate_limit_exceeded", "Please try again in 20 seconds.")) == 20.0
+    assert retry_after(HTTPError(503)) is None
+
+
+def test_retryable_errors_are_retried():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise EmptyResponseError("no response")
+        return "report"
+
+    assert RetryPolicy(max_attempts=3, base_delay=0).call(flaky) == "report"
+    assert len(attempts) == 3
+
+
+def test_fatal_errors_are_not_retried():
+    attempts = []
+
+    def fatal():
+        attempts.append(1)
+        raise HTTPError(401)
+
+    with pytest.raises(HTTPError):
+        RetryPolicy(max_attempts=3, base_delay=0).call(fatal)
+    assert len(attempts) == 1
+
+
+def test_retrying_stops_at_the_current_deadline():
+    attempts = []
+
+    def empty():
+        attempts.append(1)
+        raise EmptyResponseError("no response")
+
+    with deadline_scope(Deadline(0)), pytest.raises(EmptyResponseError):
+        RetryPolicy(max_attempts=3, base_delay=0).call(empty)
+    assert len(attempts) == 1
@@ -0,0 +1,67 @@
+from orchestrator.metric_rows import MetricRows
+from orchestrator.sharding import merge_shard_patterns, shard_rows
+from orchestrator.structured_output import MetricValue, Pattern
+
+
+def pattern(pattern_id, *rows, direction="regression", flag_reason="metric"):
+    metrics = [MetricValue(country, tag, "PAV", value) for country, tag, value in rows]
+    return Pattern(pattern_id, "PAV", f"pattern {pattern_id}", direction, flag_reason, metrics)
+
+
+def test_single_country_patterns_are_merged_across_shards():
+    merged = merge_shard_patterns("pav", [
+        [pattern("PAV-1", ("TH", "shop=bakery", -10), ("TH", "shop=butcher", -5))],
+        [pattern("PAV-1", ("TH", "amenity=cafe", -3), ("TH", "amenity=bar", -2), flag_reason="count")],
+    ])
+    assert len(merged) == 1
+    assert merged[0].definitiontags == ["shop=bakery", "shop=butcher", "amenity=cafe", "amenity=bar"]
+    assert merged[0].title == "TH PAV regressions across 4 categories"
+    assert merged[0].flag_reason == "both"
+
+
+def test_directions_are_not_merged():
+    merged = merge_shard_patterns("PAV", [
+        [pattern("PAV-1", ("TH", "shop=bakery", -10), ("TH", "shop=butcher", -5))],
+        [pattern("PAV-1", ("TH", "amenity=cafe", 3), ("TH", "amenity=bar", 2), direction="improvement")],
+    ])
+    assert [p.direction for p in merged] == ["regression", "improvement"]
+
+
+def test_duplicates_are_dropped_and_ids_renumbered():
+    duplicate = pattern("PAV-2", ("TH", "shop=bakery", -10), ("VN", "shop=bakery", -20))
+    merged = merge_shard_patterns("PAV", [
+        [pattern("PAV-1", ("DE", "shop=kiosk", -4)), duplicate],
+        [pattern("PAV-1", ("VN", "shop=bakery", -20), ("TH", "shop=bakery", -10))],
+    ])
+    assert [p.id for p in merged] == ["PAV-1", "PAV-2"]
+    assert all(p.parent_id is None for p in merged)
+
+
+def test_merging_does_not_modify_the_shard_patterns():
+    first = pattern("PAV-1", ("TH", "shop=bakery", -10), ("TH", "shop=butcher", -5))
+    merge_shard_patterns("PAV", [[first], [pattern("PAV-1", ("TH", "amenity=cafe", -3), ("TH", "amenity=bar", -2))]])
+    assert first.id == "PAV-1"
+    assert len(first.metrics) == 2
+
+
+def test_rows_are_sharded_by_definitiontag_group():
+    columns = ["country", "definitiontag", "value"]
+    rows = [[f"C{i}", f"{group}={i % 4}", -i] for group in ("shop", "amenity", "tourism") for i in range(60)]
+    shards = shard_rows(MetricRows("PAV", columns, rows, len(rows)), max_rows=80)
+    assert sorted(len(shard.rows) for shard in shards) == [60, 60, 60]
+    for shard in shards:
+        assert len({row[1].split("=")[0] for row in shard.rows}) == 1
+
+
+def test_rows_without_shard_columns_stay_whole():
+    rows = MetricRows("PAV", ["value"], [[1]] * 200, 200)
+    assert shard_rows(rows) == [rows]
+
+
+def test_definitiontag_split_into_country_blocks_is_merged():
+    merged = merge_shard_patterns("PAV", [
+        [pattern("PAV-1", ("DE", "shop=bakery", -10), ("FR", "shop=bakery", -5))],
+        [pattern("PAV-3", ("TH", "shop=bakery", -7)), pattern("PAV-4", ("VN", "shop=bakery", 2), direction="improvement")],
+    ])
+    assert [(p.id, p.countries) for p in merged] == [("PAV-1", ["DE", "FR", "TH"]), ("PAV-2", ["VN"])]
+    assert merged[0].title == "shop=bakery PAV regressions in 3 countries"
@@ -0,0 +1,72 @@
+import threading
+import time
+
+import pytest
+
+from agent_tools import single_flight
+from apis.deadline import Deadline, DeadlineExceeded, deadline_scope
+
+
+def test_concurrent_identical_calls_share_one_call():
+    calls, release = [], threading.Event()
+
+    @single_flight
+    def fetch(key):
+        calls.append(key)
+        release.wait()
+        return f"result {key}"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(fetch("MPOI-1"))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert calls == ["MPOI-1"]
+    assert results == ["result MPOI-1"] * 3
+
+
+def test_waiter_runs_the_call_itself_when_the_leader_runs_out_of_time():
+    calls, started = [], threading.Event()
+
+    @single_flight
+    def fetch(key):
+        calls.append(key)
+        if len(calls) == 1:
+            started.set()
+            time.sleep(0.2)
+            raise DeadlineExceeded("leader stage timed out")
+        return "fresh result"
+
+    def leader():
+        with pytest.raises(DeadlineExceeded):
+            fetch("MPOI-1")
+
+    thread = threading.Thread(target=leader)
+    thread.start()
+    started.wait()
+    assert fetch("MPOI-1") == "fresh result"
+    thread.join()
+    assert len(calls) == 2
+
+
+def test_waiting_is_bounded_by_the_waiters_deadline():
+    started, release = threading.Event(), threading.Event()
+
+    @single_flight
+    def fetch(key):
+        started.set()
+        release.wait()
+        return "late result"
+
+    thread = threading.Thread(target=fetch, args=("MPOI-1",))
+    thread.start()
+    started.wait()
+    began = time.monotonic()
+    with deadline_scope(Deadline(0.2)), pytest.raises(DeadlineExceeded):
+        fetch("MPOI-1")
+    assert time.monotonic() - began < 1.0
+    release.set()
+    thread.join()
@@ -0,0 +1,55 @@
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from apis.deadline import Deadline, DeadlineExceeded, deadline_scope
+from orchestrator import streaming
+from orchestrator.orchestrator import APROrchestrator
+
+
+class StalledRuns:
+    """Runs client whose stream sends the run's first event and then nothing until the run is cancelled."""
+
+    def __init__(self):
+        self.cancelled = threading.Event()
+
+    @contextmanager
+    def stream(self, thread_id, agent_id, truncation_strategy, event_handler):
+        def events():
+            event_handler.run = SimpleNamespace(id="run-1", status="in_progress")
+            yield "thread.run.created"
+            self.cancelled.wait(10)
+
+        yield events()
+
+    def cancel(self, thread_id, run_id):
+        self.cancelled.set()
+
+
+@pytest.fixture
+def orchestrator(monkeypatch):
+    monkeypatch.setattr(streaming, "WATCHDOG_INTERVAL", 0.05)
+    orchestrator = APROrchestrator.__new__(APROrchestrator)
+    orchestrator.agents_client = SimpleNamespace(runs=StalledRuns())
+    orchestrator.stream_callback = None
+    orchestrator.truncation_strategy = None
+    return orchestrator
+
+
+def test_stalled_stream_is_cancelled_at_its_timeout(orchestrator):
+    started = time.monotonic()
+    with pytest.raises(TimeoutError, match="within 0.2s"):
+        orchestrator._stream_run("pav", "thread-1", "agent-1", timeout=0.2)
+    assert orchestrator.agents_client.runs.cancelled.is_set()
+    assert time.monotonic() - started < 2
+
+
+def test_stalled_stream_is_cancelled_with_its_deadline(orchestrator):
+    deadline = Deadline()
+    threading.Timer(0.2, deadline.cancel).start()
+    with deadline_scope(deadline), pytest.raises(DeadlineExceeded):
+        orchestrator._stream_run("pav", "thread-1", "agent-1", timeout=60)
+    assert orchestrator.agents_client.runs.cancelled.is_set()
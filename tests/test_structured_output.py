@@ -0,0 +1,116 @@
+import json
+
+import pytest
+
+from orchestrator.structured_output import (
+    StructuredOutputError, apply_links, extract_json, metric_output, parse_links, parse_metric_output
+)
+
+
+def row(country, definitiontag, value, **counts):
+    return {'country': country, 'definitiontag': definitiontag, 'value': value, **counts}
+
+
+def report(*patterns, metric="PAV"):
+    return json.dumps({'metric': metric, 'patterns': [
+        {'id': pattern_id, 'title': f"pattern {pattern_id}", 'direction': 'regression', 'flag_reason': 'metric',
+         'metrics': rows}
+        for pattern_id, rows in patterns
+    ]})
+
+
+def test_extract_json_accepts_fenced_and_bare_documents():
+    assert extract_json('Findings:\n```json\n{"links": []}\n```') == {'links': []}
+    assert extract_json('{"links": []}') == {'links': []}
+    assert extract_json('Here you go: {"links": []} - done') == {'links': []}
+
+
+def test_extract_json_without_object_raises():
+    with pytest.raises(StructuredOutputError):
+        extract_json("No patterns found.")
+
+
+def test_invalid_rows_are_dropped():
+    patterns = parse_metric_output(report(('PAV-1', [
+        row('th', 'Shop=Convenience', '-5,193'),
+        row('TH', 'shop', -10),
+        row('', 'shop=bakery', -10),
+        row('TH', 'shop=bakery', 'n/a'),
+    ])), 'pav')
+    assert len(patterns) == 1
+    [value] = patterns[0].metrics
+    assert (value.country, value.definitiontag, value.metric, value.value) == ('TH', 'shop=convenience', 'PAV', -5193)
+
+
+def test_pattern_without_valid_rows_is_dropped():
+    assert parse_metric_output(report(('PAV-1', [row('TH', 'shop', -10)])), 'PAV') == []
+
+
+def test_multi_country_multi_tag_pattern_is_split_per_tag():
+    patterns = parse_metric_output(report(('PAV-1', [
+        row('TH', 'shop=bakery', -10), row('VN', 'shop=bakery', -20), row('TH', 'amenity=cafe', -5),
+    ])), 'PAV')
+    assert [p.id for p in patterns] == ['PAV-1a', 'PAV-1b']
+    assert [p.definitiontags for p in patterns] == [['shop=bakery'], ['amenity=cafe']]
+    assert all(p.parent_id == 'PAV-1' for p in patterns)
+
+
+def test_mixed_signs_are_split_by_direction():
+    patterns = parse_metric_output(report(('PAV-1', [row('TH', 'shop=bakery', -10), row('VN', 'shop=bakery', 20)])),
+                                   'PAV')
+    assert [(p.id, p.direction) for p in patterns] == [('PAV-1a', 'regression'), ('PAV-1b', 'improvement')]
+
+
+def test_direction_follows_metric_type():
+    [dup] = parse_metric_output(report(('DUP-1', [row('TH', 'shop=bakery', 10)]), metric='DUP'), 'DUP')
+    assert dup.direction == 'regression'
+
+
+def test_duplicate_rows_and_patterns_are_removed():
+    rows = [row('TH', 'shop=bakery', -10), row('TH', 'shop=bakery', -10)]
+    patterns = parse_metric_output(report(('PAV-1', rows), ('PAV-1', rows)), 'PAV')
+    assert len(patterns) == 1
+    assert len(patterns[0].metrics) == 1
+
+
+def test_metric_output_round_trips():
+    patterns = parse_metric_output(report(('PAV-1', [row('TH', 'shop=bakery', -10, reference_count=100,
+                                                          actual_count=90, count_change_percent=-10)])), 'PAV')
+    assert parse_metric_output(metric_output('PAV', patterns), 'PAV') == patterns
+    assert json.loads(metric_output('SUP')) == {'metric': 'SUP', 'patterns': []}
+
+
+def test_parse_links_keeps_valid_ticket_keys():
+    links = parse_links(json.dumps({'links': [
+        {'pattern_id': 'PAV-1', 'tickets': ['mpoi-7744', 'MPOI-7744'], 'reason': 'bakery fix'},
+        {'pattern_id': 'PAV-1', 'tickets': 'MPOI-12', 'reason': ''},
+        {'pattern_id': 'PAV-2', 'tickets': ['unknown']},
+        {'tickets': ['MPOI-1']},
+    ]}))
+    assert links == {'PAV-1': (['MPOI-7744', 'MPOI-12'], 'bakery fix')}
+
+
+def test_split_patterns_inherit_parent_links():
+    patterns = parse_metric_output(report(('PAV-1', [
+        row('TH', 'shop=bakery', -10), row('VN', 'shop=bakery', -20),
+        row('TH', 'amenity=cafe', -5), row('TH', 'tourism=hotel', -5),
+    ])), 'PAV')
+    assert [p.id for p in patterns] == ['PAV-1a', 'PAV-1b', 'PAV-1c']
+    apply_links({'PAV': patterns}, {'PAV-1': (['MPOI-1'], 'shared cause')})
+    assert all(p.tickets == ['MPOI-1'] and p.link_reason == 'shared cause' for p in patterns)
+
+
+def test_twice_split_patterns_inherit_parent_links():
+    patterns = parse_metric_output(report(('PAV-1', [
+        row('TH', 'shop=bakery', -10), row('VN', 'shop=bakery', 20), row('TH', 'amenity=cafe', -5),
+    ])), 'PAV')
+    assert [p.id for p in patterns] == ['PAV-1aa', 'PAV-1ab', 'PAV-1b']
+    apply_links({'PAV': patterns}, {'PAV-1': (['MPOI-1'], 'shared cause')})
+    assert all(p.tickets == ['MPOI-1'] for p in patterns)
+
+
+def test_own_links_take_precedence_over_parent_links():
+    patterns = parse_metric_output(report(('PAV-1', [row('TH', 'shop=bakery', -10), row('VN', 'shop=bakery', 20)])),
+                                   'PAV')
+    apply_links({'PAV': patterns}, {'PAV-1': (['MPOI-1'], 'parent'), 'PAV-1b': (['MPOI-2'], 'own')})
+    assert [(p.tickets, p.link_reason) for p in patterns] == [(['MPOI-1'], 'parent'), (['MPOI-2'], 'own')]
@@ -0,0 +1,38 @@
+import json
+
+import pytest
+
+from orchestrator.tool_cache import ToolCallCache, is_error_result
+
+
+def statement(state: str, **extra) -> str:
+    return json.dumps({'statement_id': 's-1', 'status': {'state': state, **extra}, 'result': {'data_array': []}})
+
+
+@pytest.mark.parametrize("result", [
+    "Error fetching PR 12: 404",
+    "Failed to reach Jira",
+    json.dumps({'error': 'timeout'}),
+    statement('FAILED', error={'message': 'table not found'}),
+    statement('CANCELED'),
+    statement('PENDING'),
+])
+def test_failures_are_errors(result):
+    assert is_error_result(result)
+
+
+@pytest.mark.parametrize("result", [statement('SUCCEEDED'), "MPOI-1: Update TH shops", json.dumps(['a'])])
+def test_successes_are_not_errors(result):
+    assert not is_error_result(result)
+
+
+def test_failed_statements_are_not_cached():
+    responses = [statement('PENDING'), statement('SUCCEEDED')]
+
+    def get_pav_metrics_for_apr(aprNumber):
+        return responses.pop(0)
+
+    cache = ToolCallCache()
+    assert json.loads(cache.call(get_pav_metrics_for_apr, 121))['status']['state'] == 'PENDING'
+    assert json.loads(cache.call(get_pav_metrics_for_apr, 121))['status']['state'] == 'SUCCEEDED'
+    assert json.loads(cache.call(get_pav_metrics_for_apr, 121))['status']['state'] == 'SUCCEEDED'